@@ -0,0 +1,171 @@
+"""
+Acervo persistente de soluções entre execuções: para cada cenário (identificado por uma impressão digital das
+posições, das matrizes de distância, avião e trem e dos parâmetros de custo e do fitness), guarda as melhores
+rotas distintas já encontradas com o respectivo fitness.
+- Apenas melhorias entram no acervo: com as ROTAS_POR_CENARIO_ACERVO vagas ocupadas, uma rota só entra se for
+  melhor que a pior guardada (que então sai);
+- Os cenários usados há mais tempo são descartados quando o acervo passa de MAX_CENARIOS_ACERVO cenários;
+- Uma nova execução sobre um cenário conhecido pode semear parte da população inicial com as rotas guardadas;
+O acervo é um arquivo JSON, gravado em um arquivo temporário e renomeado sobre o anterior (os.replace).
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from cenario import Cenario
+from parametros import (
+    CUSTO_AVIAO,
+    CUSTO_CAMINHAO,
+    CUSTO_CARRO_ELETRICO,
+    CUSTO_TREM,
+    LIM_CARRO_ELETRICO,
+    MAX_CENARIOS_ACERVO,
+    PROPORCAO_ACERVO,
+    ROTAS_POR_CENARIO_ACERVO,
+    VELOC_AVIAO,
+    VELOC_CAMINHAO,
+    VELOC_CARRO_ELETRICO,
+    VELOC_TREM,
+)
+
+VERSAO_ACERVO = 1
+
+# Parâmetros de custo que entram no fitness multimodal: alterá-los muda a impressão digital do cenário
+PARAMETROS_CUSTO = {
+    "lim_carro_eletrico": LIM_CARRO_ELETRICO,
+    "velocidades": [VELOC_AVIAO, VELOC_TREM, VELOC_CARRO_ELETRICO, VELOC_CAMINHAO],
+    "custos": [CUSTO_AVIAO, CUSTO_TREM, CUSTO_CARRO_ELETRICO, CUSTO_CAMINHAO],
+}
+
+
+
+def impressao_digital(
+    posicoes: Sequence[Tuple[float, float]],
+    matriz_distancias=None,
+    matriz_aviao=None,
+    matriz_trem=None,
+    objetivo: Dict[str, Any] | None = None) -> str:
+    """
+    Impressão digital (SHA-256) de um cenário: posições, matrizes (as ausentes são ignoradas) e a descrição do objetivo
+    (parâmetros do fitness). Dois cenários com a mesma impressão digital dão o mesmo fitness para qualquer rota.
+    """
+    resumo = hashlib.sha256()
+    resumo.update(np.asarray(posicoes, dtype=np.float64).tobytes())
+    for nome, matriz, tipo in (("distancias", matriz_distancias, np.float64), ("aviao", matriz_aviao, np.int8), ("trem", matriz_trem, np.int8)):
+        if matriz is not None:
+            resumo.update(nome.encode())
+            resumo.update(np.asarray(matriz, dtype=tipo).tobytes())
+    resumo.update(json.dumps(objetivo or {}, sort_keys=True).encode())
+    return resumo.hexdigest()
+
+
+
+def impressao_digital_cenario(cenario: Cenario, peso_tempo: float, somente_distancia: bool = False) -> str:
+    """
+    Impressão digital de um cenário multimodal com o peso do tempo no fitness e os parâmetros de custo (PARAMETROS_CUSTO).
+    """
+    return impressao_digital(
+        list(cenario.cidades.values()),
+        cenario.matriz_distancias,
+        cenario.matriz_aviao,
+        cenario.matriz_trem,
+        {"peso_tempo": peso_tempo, "somente_distancia": somente_distancia, "parametros_custo": PARAMETROS_CUSTO})
+
+
+
+def forma_canonica(rota: Sequence[int], simetrica: bool = False) -> Tuple[int, ...]:
+    """
+    Representação única de uma rota fechada: rotação que começa na cidade 0; em cenários simétricos,
+    o menor (lexicograficamente) entre os dois sentidos de percurso.
+    """
+    rota = list(rota)
+    inicio = rota.index(0)
+    canonica = tuple(rota[inicio:] + rota[:inicio])
+    if simetrica:
+        invertida = (canonica[0],) + canonica[:0:-1]
+        canonica = min(canonica, invertida)
+    return canonica
+
+
+
+class AcervoSolucoes:
+    """
+    Acervo de soluções gravado em um arquivo JSON (criado na primeira gravação, se não existir).
+    """
+
+    def __init__(self, caminho: str, rotas_por_cenario: int = ROTAS_POR_CENARIO_ACERVO, max_cenarios: int = MAX_CENARIOS_ACERVO):
+        self.caminho = caminho
+        self.rotas_por_cenario = rotas_por_cenario
+        self.max_cenarios = max_cenarios
+        self.cenarios: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as arquivo:
+                conteudo = json.load(arquivo)
+            if conteudo.get("versao") != VERSAO_ACERVO:
+                raise ValueError(f"Versão de acervo não suportada: {conteudo.get('versao')!r} (esperada {VERSAO_ACERVO})")
+            self.cenarios = conteudo["cenarios"]
+
+    def rotas(self, impressao: str) -> List[Tuple[List[int], float]]:
+        """
+        Rotas guardadas do cenário com o respectivo fitness, da melhor para a pior (lista vazia se o cenário é desconhecido).
+        Marca o cenário como usado agora.
+        """
+        entrada = self.cenarios.get(impressao)
+        if entrada is None:
+            return []
+        entrada["usado_em"] = time.time()
+        return [(solucao["rota"], solucao["fitness"]) for solucao in entrada["solucoes"]]
+
+    def registrar(self, impressao: str, solucoes: Iterable[Tuple[Sequence[int], float]], simetrica: bool = False) -> int:
+        """
+        Acrescenta as soluções (rota, fitness) que melhoram o acervo do cenário, ignorando rotas já guardadas.
+        Retorna o número de rotas que entraram no acervo.
+        """
+        entrada = self.cenarios.setdefault(impressao, {"usado_em": 0.0, "solucoes": []})
+        guardadas = entrada["solucoes"]
+        conhecidas = {forma_canonica(solucao["rota"], simetrica) for solucao in guardadas}
+        agora = time.time()
+        novas = 0
+        for rota, fitness in sorted(solucoes, key=lambda solucao: solucao[1]):
+            canonica = forma_canonica(rota, simetrica)
+            if canonica in conhecidas:
+                continue
+            if len(guardadas) >= self.rotas_por_cenario and fitness >= guardadas[-1]["fitness"]:
+                break
+            guardadas.append({"rota": list(canonica), "fitness": fitness, "registrada_em": agora})
+            guardadas.sort(key=lambda solucao: solucao["fitness"])
+            if len(guardadas) > self.rotas_por_cenario:
+                conhecidas.discard(forma_canonica(guardadas.pop()["rota"], simetrica))
+            conhecidas.add(canonica)
+            novas += 1
+        entrada["usado_em"] = agora
+        self._descartar_antigos()
+        return novas
+
+    def salvar(self) -> None:
+        """
+        Grava o acervo em caminho.tmp e substitui o arquivo anterior de uma só vez.
+        """
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"versao": VERSAO_ACERVO, "cenarios": self.cenarios}, arquivo)
+        os.replace(temporario, self.caminho)
+
+    def _descartar_antigos(self) -> None:
+        excesso = len(self.cenarios) - self.max_cenarios
+        if excesso > 0:
+            for impressao in sorted(self.cenarios, key=lambda chave: self.cenarios[chave]["usado_em"])[:excesso]:
+                del self.cenarios[impressao]
+
+
+
+def rotas_iniciais_acervo(acervo: AcervoSolucoes, impressao: str, tam_populacao: int, proporcao: float = PROPORCAO_ACERVO) -> List[List[int]]:
+    """
+    Rotas do acervo para semear a população inicial: as melhores guardadas do cenário,
+    no máximo proporcao da população (as demais vêm do método de população inicial escolhido).
+    """
+    return [rota for rota, _ in acervo.rotas(impressao)[:int(tam_populacao * proporcao)]]
@@ -1,6 +1,10 @@
 import random
-from typing import List, Tuple
+from array import array
+from typing import List, Sequence, Tuple
 
+import numpy as np
+
+from custos import TabelasArestas, delta_inversao, delta_troca
 from parametros import (
     CUSTO_AVIAO,
     CUSTO_CAMINHAO,
@@ -8,7 +12,7 @@ from parametros import (
     CUSTO_TREM,
     LIM_CARRO_ELETRICO,
     PESO_TEMPO,
-    PROB_MUTACAO,
+    TIPO_GENOMA,
     TIPO_TRANSPORTE_AVIAO,
     TIPO_TRANSPORTE_CAMINHAO,
     TIPO_TRANSPORTE_CARRO_ELETRICO,
@@ -20,11 +24,21 @@ from parametros import (
 )
 
 
-def populacao_inicial_aleatoria(cidades: List[str], tamanho_populacao: int) -> List[List[str]]:
+def criar_individuo(cidades) -> array:
     """
-    Gera uma população inicial aleatória de rotas para um conjunto dado de cidades e tamanho de população.
+    Cria um indivíduo (rota) no formato compacto do genoma: permutação de índices inteiros de cidades.
+    As letras das cidades são usadas apenas para exibição (ver utils.trajeto_para_letras).
     """
-    return [random.sample(cidades, len(cidades)) for _ in range(tamanho_populacao)]
+    return array(TIPO_GENOMA, cidades)
+
+
+
+def populacao_inicial_aleatoria(num_cidades: int, tamanho_populacao: int) -> List[array]:
+    """
+    Gera uma população inicial aleatória de rotas para um número dado de cidades e tamanho de população.
+    """
+    cidades = range(num_cidades)
+    return [criar_individuo(random.sample(cidades, num_cidades)) for _ in range(tamanho_populacao)]
 
 
 
@@ -38,7 +52,7 @@ def calcular_limites_estimados(matriz_distancias: List[List[float]]) -> Tuple[in
     4 - custo_max: considerando todos os trechos feitos de avião;
     """
     num_cidades = len(matriz_distancias)
-    distancia_total_entre_cidades = sum(sum(linha) for linha in matriz_distancias) / 2    
+    distancia_total_entre_cidades = float(np.sum(matriz_distancias)) / 2
     dist_media_entre_cidades = distancia_total_entre_cidades / (num_cidades * (num_cidades - 1) / 2)
     dist_media_rota = dist_media_entre_cidades * num_cidades
     
@@ -54,12 +68,12 @@ def calcular_fitness_prioridade_tempo(
     matriz_distancias: List[List[float]],
     matriz_aviao: List[List[int]],
     matriz_trem: List[List[int]],
-    individuo: List[str],
+    individuo: array,
     tempo_min,
     tempo_max,
     custo_min,
     custo_max,
-    peso_tempo: float = PESO_TEMPO) -> Tuple[List[str], float, List[int]]:
+    peso_tempo: float = PESO_TEMPO) -> Tuple[array, float, List[int]]:
     """
     Calcula o fitness de cada indivíduo na população, preferindo primeiro os veículos mais rápidos:
     1 - Mede o tempo total (buscando o menor tempo por transportes mais rápidos);
@@ -72,10 +86,8 @@ def calcular_fitness_prioridade_tempo(
     lista_transportes: List[int] = []
     for i in range(len(individuo)):
 
-        cidade_atual = individuo[i]
-        cidade_proxima = individuo[(i + 1) % len(individuo)]
-        indice_atual = ord(cidade_atual) - ord('A')
-        indice_proxima = ord(cidade_proxima) - ord('A')
+        indice_atual = individuo[i]
+        indice_proxima = individuo[(i + 1) % len(individuo)]
         distancia = int(matriz_distancias[indice_atual][indice_proxima])
 
         if matriz_aviao[indice_atual][indice_proxima] == 1:
@@ -101,12 +113,107 @@ def calcular_fitness_prioridade_tempo(
 
 
 
+def calcular_fitness_tabelas(
+    tabelas: TabelasArestas,
+    individuo: array,
+    tempo_min,
+    tempo_max,
+    custo_min,
+    custo_max,
+    peso_tempo: float = PESO_TEMPO) -> Tuple[array, float, List[int]]:
+    """
+    Calcula o mesmo fitness de calcular_fitness_prioridade_tempo, mas somando as tabelas
+    pré-calculadas por aresta (ver custos.construir_tabelas_arestas) em vez de decidir o
+    transporte de cada trecho a cada avaliação.
+    """
+    tempo, custo, transporte = tabelas.tempo, tabelas.custo, tabelas.transporte
+    tempo_total: int = 0
+    custo_total: int = 0
+    lista_transportes: List[int] = []
+    indice_atual = individuo[0]
+    for indice_proxima in individuo[1:] + individuo[:1]:
+        tempo_total += tempo[indice_atual][indice_proxima]
+        custo_total += custo[indice_atual][indice_proxima]
+        lista_transportes.append(transporte[indice_atual][indice_proxima])
+        indice_atual = indice_proxima
+
+    tempo_norm = (tempo_total - tempo_min) / (tempo_max - tempo_min)
+    custo_norm = (custo_total - custo_min) / (custo_max - custo_min)
+    return individuo, tempo_norm * peso_tempo + custo_norm * (1 - peso_tempo), lista_transportes
+
+
+
+def populacao_para_matriz(populacao: Sequence[array]) -> np.ndarray:
+    """
+    Converte a população (lista de indivíduos) em uma matriz 2-D (indivíduos x posições) sem copiar gene a gene.
+    """
+    return np.frombuffer(b"".join(individuo.tobytes() for individuo in populacao), dtype=TIPO_GENOMA).reshape(len(populacao), -1)
+
+
+
+def calcular_totais_populacao(tabelas: TabelasArestas, populacao: np.ndarray) -> np.ndarray:
+    """
+    Calcula de uma só vez o tempo e o custo totais de toda a população, representada por uma matriz 2-D (indivíduos x posições):
+    1 - Monta as arestas de cada rota (np.roll fornece a cidade seguinte, incluindo o retorno à origem);
+    2 - Soma tempo e custo por indexação avançada nas tabelas pré-calculadas;
+    Retorna uma matriz de inteiros (indivíduos x 2) com [tempo, custo] de cada indivíduo, na ordem das linhas.
+    """
+    proximas = np.roll(populacao, -1, axis=1)
+    return np.column_stack((tabelas.tempo_np[populacao, proximas].sum(axis=1), tabelas.custo_np[populacao, proximas].sum(axis=1)))
+
+
+
+def normalizar_fitness(
+    totais: np.ndarray,
+    tempo_min,
+    tempo_max,
+    custo_min,
+    custo_max,
+    peso_tempo: float = PESO_TEMPO) -> np.ndarray:
+    """
+    Normaliza e pondera [tempo, custo] totais (matriz indivíduos x 2) como em calcular_fitness_prioridade_tempo
+    (que segue como implementação de referência). Os totais são inteiros e exatos; o arredondamento acontece
+    apenas aqui, uma vez por indivíduo.
+    Retorna um vetor com o fitness de cada indivíduo, na ordem das linhas.
+    """
+    tempo_norm = (totais[:, 0] - tempo_min) / (tempo_max - tempo_min)
+    custo_norm = (totais[:, 1] - custo_min) / (custo_max - custo_min)
+    return tempo_norm * peso_tempo + custo_norm * (1 - peso_tempo)
+
+
+
+def calcular_fitness_populacao(
+    tabelas: TabelasArestas,
+    populacao: np.ndarray,
+    tempo_min,
+    tempo_max,
+    custo_min,
+    custo_max,
+    peso_tempo: float = PESO_TEMPO) -> np.ndarray:
+    """
+    Calcula de uma só vez o fitness de toda a população, representada por uma matriz 2-D (indivíduos x posições):
+    soma os totais por aresta (calcular_totais_populacao) e os normaliza (normalizar_fitness).
+    Retorna um vetor com o fitness de cada indivíduo, na ordem das linhas.
+    """
+    return normalizar_fitness(calcular_totais_populacao(tabelas, populacao), tempo_min, tempo_max, custo_min, custo_max, peso_tempo)
+
+
+
+def obter_transportes(tabelas: TabelasArestas, individuo: array) -> List[int]:
+    """
+    Retorna a lista de transportes utilizados em cada trecho da rota do indivíduo.
+    """
+    transporte = tabelas.transporte
+    return [transporte[i][j] for i, j in zip(individuo, individuo[1:] + individuo[:1])]
+
+
+
 def selecao_por_torneio(
-    candidatos: List[Tuple[List[str], float, List[int]]],
-    k: int = 3) -> List[str] | None:
+    candidatos: Sequence[Tuple],
+    k: int = 3) -> array | None:
     """
     Realiza a seleção por torneio para escolher indivíduos da população a ser cruzada.
-    - candidatos: lista possíveis de indivíduos (rotas)"
+    - candidatos: lista possíveis de indivíduos (tuplas iniciadas por rota e fitness)"
     - k: pressão seletiva (número de aspirantes por torneio)
     """
     if len(candidatos) == 0:
@@ -117,122 +224,144 @@ def selecao_por_torneio(
 
 
 
-def edge_recombination_crossover(p1: List[str], p2: List[str]) -> Tuple[List[str], List[str]]:
+def tabela_adjacencias_erx(p1: Sequence[int], p2: Sequence[int]) -> List[List[int]]:
+    """
+    Constrói a tabela de adjacências do ERX: união das arestas (não orientadas) dos dois pais, indexada pela cidade.
+    Cada cidade tem no máximo 4 vizinhos (2 de cada pai), sem repetições.
+    """
+    adj: List[List[int]] = [[] for _ in range(len(p1))]
+    for pai in (p1, p2):
+        anterior = pai[-1]
+        for cidade in pai:
+            vizinhos = adj[anterior]
+            if cidade not in vizinhos:
+                vizinhos.append(cidade)
+                adj[cidade].append(anterior)
+            anterior = cidade
+    return adj
+
+
+
+def _filho_erx(adj: List[List[int]], graus: List[int], ordem: Sequence[int], inicio: int) -> array:
+    """
+    Gera um filho do ERX a partir da tabela de adjacências (somente leitura, compartilhada entre os filhos):
+    - graus: cópia própria do número de vizinhos ainda não visitados de cada cidade;
+    - visitado: mapa de bits das cidades já incluídas no filho;
+    - ordem: permutação aleatória percorrida por um cursor que só avança, para escolher uma cidade
+      não visitada em O(1) amortizado quando a cidade atual não tem vizinhos livres;
+    """
+    n = len(adj)
+    visitado = bytearray(n)
+    filho = array(TIPO_GENOMA)
+    cursor = 0
+    atual = inicio
+    for _ in range(n):
+        filho.append(atual)
+        visitado[atual] = 1
+
+        # Remove o nó atual das listas dos vizinhos (decrementa o grau) e escolhe o vizinho de menor grau
+        melhor: List[int] = []
+        len_melhor = 5
+        for v in adj[atual]:
+            if not visitado[v]:
+                grau = graus[v] - 1
+                graus[v] = grau
+                if grau < len_melhor:
+                    melhor = [v]
+                    len_melhor = grau
+                elif grau == len_melhor:
+                    melhor.append(v)
+
+        if melhor:
+            atual = melhor[0] if len(melhor) == 1 else random.choice(melhor)
+        else:
+            # Seleção aleatória entre os nós restantes
+            while cursor < n and visitado[ordem[cursor]]:
+                cursor += 1
+            if cursor == n:
+                break
+            atual = ordem[cursor]
+    return filho
+
+
+
+def edge_recombination_crossover(p1: array, p2: array) -> Tuple[array, array]:
     """
     Implementa o cruzamento por recombinação de arestas (Edge Recombination Crossover - ERX) entre dois pais (p1 e p2).
     Este algoritmo preserva as adjacências dos nós (cidades) dos pais ao gerar os filhos, resultando em um melhor desempenho
     para problemas de roteamento, como o Problema do Caixeiro Viajante (TSP).
+    A tabela de adjacências é construída uma única vez e compartilhada pelos dois filhos; cada filho é gerado em O(n).
     Retorna dois filhos resultantes do cruzamento
     """
-    # Função auxiliar para construir a tabela de adjacências
-    def definir_adjacencias(pai: List[str]) -> dict:
-        adj = {}
-        n = len(pai)
-        for i, v in enumerate(pai):
-            if v not in adj: adj[v] = set()
-            left = pai[(i-1) % n]
-            right = pai[(i+1) % n]
-            adj[v].add(left)
-            adj[v].add(right)
-        return adj
-
-    # Função principal do algoritmo
-    def erx(p1, p2):
-        
-        # Combina as adjacências de ambos os pais
-        adj = {}
-        for p in (p1, p2):
-            for k, v in definir_adjacencias(p).items():
-                adj.setdefault(k, set()).update(v)
-
-        # Inicia a construção do filho a partir de um dos nós aleatoriamente
-        atual = random.choice(p1)
-        filho = []
-        while len(filho) < len(p1):            
-            
-            # Remove o nó atual de todas as listas de adjacência
-            filho.append(atual)
-            for s in adj.values():
-                s.discard(atual)
-
-            # Escolhendo o próximo nó com base na menor lista de adjacência
-            if adj[atual]:
-                candidatos = list(adj[atual])
-                melhor = []
-                len_melhor = None
-                for c in candidatos:
-                    l = len(adj.get(c, ()))
-                    if len_melhor is None or l < len_melhor:
-                        melhor = [c]
-                        len_melhor = l
-                    elif l == len_melhor:
-                        melhor.append(c)
-                atual = random.choice(melhor)
-            else:
-                # Seleção aleatória entre os nós restantes
-                remaining = [x for x in p1 if x not in filho]
-                if not remaining:
-                    break
-                atual = random.choice(remaining)
-        return filho
-
-    # Chamada principal da função ERX para gerar dois filhos
-    return erx(p1, p2), erx(p2, p1)
-
-
-
-def mutacao_swap(individuo: List[str]) -> List[str]:
+    adj = tabela_adjacencias_erx(p1, p2)
+    graus = [len(vizinhos) for vizinhos in adj]
+    ordem = list(range(len(p1)))
+    random.shuffle(ordem)
+    return (
+        _filho_erx(adj, graus[:], ordem, random.choice(p1)),
+        _filho_erx(adj, graus, ordem, random.choice(p2)))
+
+
+
+def mutacao_swap(individuo: array, tabelas: TabelasArestas) -> Tuple[array, int, int]:
     """
     Mutação por troca (Swap Mutation): troca dois genes (cidades) de posição aleatoriamente.
-    """    
-    mutante = individuo.copy()
+    Retorna o mutante e a variação de [tempo, custo] em relação ao indivíduo, calculada em O(1)
+    apenas pelas arestas alteradas (ver custos.delta_troca).
+    """
+    mutante = individuo[:]
     n = len(mutante)
     i, j = random.sample(range(n), 2)
+    delta_tempo, delta_custo = delta_troca(tabelas, individuo, i, j)
     mutante[i], mutante[j] = mutante[j], mutante[i]
-    return mutante
+    return mutante, delta_tempo, delta_custo
 
 
 
-def mutacao_inversao(individuo: List[str]) -> List[str]:
+def mutacao_inversao(individuo: array, tabelas: TabelasArestas) -> Tuple[array, int, int]:
     """
     Mutação por inversão (Inversion Mutation): inverte a ordem de um segmento da rota.
     Esta mutação é eficaz para o TSP pois preserva a maioria das adjacências.
-    """    
-    mutante = individuo.copy()
+    Retorna o mutante e a variação de [tempo, custo] em relação ao indivíduo: O(1) em cenários simétricos;
+    nos assimétricos reavalia apenas o segmento invertido (ver custos.delta_inversao).
+    """
+    mutante = individuo[:]
     n = len(mutante)
     i, j = sorted(random.sample(range(n), 2))
+    delta_tempo, delta_custo = delta_inversao(tabelas, individuo, i, j)
     mutante[i:j+1] = mutante[i:j+1][::-1]
-    return mutante
+    return mutante, delta_tempo, delta_custo
 
 
 
-def mutacao_2opt(individuo: List[str]) -> List[str]:
+def mutacao_2opt(individuo: array, tabelas: TabelasArestas) -> Tuple[array, int, int]:
     """
     Mutação 2-opt: remove duas arestas e reconecta a rota de forma diferente.
     Esta mutação é eficaz para o TSP pois preserva a maioria das adjacências.
-    """    
-    mutante = individuo.copy()
+    Retorna o mutante e a variação de [tempo, custo] em relação ao indivíduo (ver mutacao_inversao).
+    """
+    mutante = individuo[:]
     n = len(mutante)
     i = random.randint(0, n - 2)
     j = random.randint(i + 1, n - 1)
+    delta_tempo, delta_custo = delta_inversao(tabelas, individuo, i, j)
     mutante[i:j+1] = mutante[i:j+1][::-1]
-    return mutante
+    return mutante, delta_tempo, delta_custo
 
 
 
-def aplicar_mutacoes(individuo: List[str]) -> List[str]:
+def aplicar_mutacoes(individuo: array, tabelas: TabelasArestas) -> Tuple[array, int, int]:
     """
-    Aplica um operador de mutação aleatoriamente selecionado
+    Aplica um operador de mutação aleatoriamente selecionado, retornando o mutante e a variação de [tempo, custo].
+    A probabilidade de mutação fica a cargo de quem chama (ver motor_ga.reproduzir): somando a variação aos totais
+    inteiros do indivíduo, o mutante é avaliado sem percorrer a rota.
     """
-    if random.random() > PROB_MUTACAO:
-        return individuo
-    
     match random.randint(1, 3):
         case 1:
-            return mutacao_swap(individuo)
+            return mutacao_swap(individuo, tabelas)
         case 2:
-            return mutacao_inversao(individuo)
+            return mutacao_inversao(individuo, tabelas)
         case 3:
-            return mutacao_2opt(individuo)
+            return mutacao_2opt(individuo, tabelas)
         case _:
-            return individuo    
+            return individuo, 0, 0
@@ -0,0 +1,139 @@
+"""
+Avaliação de fitness em um pool de processos sobre memória compartilhada (multiprocessing.shared_memory).
+As tabelas de tempo e custo por aresta, o buffer da população e as saídas (totais de tempo e custo e transportes)
+são criados uma única vez por execução; a cada geração o processo principal copia a população para o buffer
+e cada processo avalia uma faixa de linhas, escrevendo o resultado direto na saída compartilhada.
+Nada além dos índices da faixa trafega entre os processos; a normalização fica no processo principal.
+"""
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Tuple
+
+import numpy as np
+
+from algoritmos_geneticos import calcular_totais_populacao
+from custos import TabelasArestas
+from parametros import MIN_INDIVIDUOS_POR_PROCESSO, TIPO_GENOMA
+
+# Visões numpy sobre a memória compartilhada, em cada processo do pool
+_memoria_processo: Dict[str, np.ndarray] = {}
+_blocos_processo: list = []
+
+
+
+def _criar_visao(bloco: SharedMemory, formato: Tuple[int, ...], tipo) -> np.ndarray:
+    return np.ndarray(formato, dtype=tipo, buffer=bloco.buf)
+
+
+
+def _anexar_memoria(nomes: Dict[str, str], num_cidades: int, capacidade: int) -> None:
+    """
+    Inicialização de cada processo do pool: anexa os blocos de memória compartilhada e cria as visões numpy.
+    Os blocos pertencem ao processo principal, que os remove em fechar.
+    """
+    formatos = {
+        "tempo": ((num_cidades, num_cidades), np.int64),
+        "custo": ((num_cidades, num_cidades), np.int64),
+        "transporte": ((num_cidades, num_cidades), np.int8),
+        "populacao": ((capacidade, num_cidades), np.dtype(TIPO_GENOMA)),
+        "totais": ((capacidade, 2), np.int64),
+        "transportes": ((capacidade, num_cidades), np.int8),
+    }
+    for chave, nome in nomes.items():
+        bloco = SharedMemory(name=nome)
+        _blocos_processo.append(bloco)
+        _memoria_processo[chave] = _criar_visao(bloco, *formatos[chave])
+
+
+
+def _avaliar_faixa(tarefa: Tuple[int, int]) -> None:
+    """
+    Avalia as linhas [inicio, fim) do buffer da população, escrevendo totais e transportes na saída compartilhada.
+    """
+    inicio, fim = tarefa
+    memoria = _memoria_processo
+    tabelas = TabelasArestas([], [], [], memoria["tempo"], memoria["custo"], memoria["transporte"], False)
+    linhas = memoria["populacao"][inicio:fim]
+    memoria["totais"][inicio:fim] = calcular_totais_populacao(tabelas, linhas)
+    memoria["transportes"][inicio:fim] = memoria["transporte"][linhas, np.roll(linhas, -1, axis=1)]
+
+
+
+class AvaliacaoParalela:
+    """
+    Backend de avaliação em processos com memória compartilhada.
+    - capacidade: número máximo de indivíduos por lote (lotes maiores são avaliados em partes);
+    - processos: tamanho do pool;
+    - Lotes com menos de MIN_INDIVIDUOS_POR_PROCESSO indivíduos por processo são avaliados no próprio processo
+      principal, onde o custo de coordenação do pool superaria o ganho;
+    Deve ser encerrado com fechar() (ou usado em um bloco with) para liberar os processos e a memória compartilhada.
+    """
+
+    def __init__(self, tabelas: TabelasArestas, capacidade: int, processos: int):
+        num_cidades = len(tabelas.tempo_np)
+        self.tabelas = tabelas
+        self.capacidade = capacidade
+        self.processos = processos
+        self._blocos: Dict[str, SharedMemory] = {}
+        self._memoria: Dict[str, np.ndarray] = {}
+        origens = {
+            "tempo": tabelas.tempo_np,
+            "custo": tabelas.custo_np,
+            "transporte": tabelas.transporte_np,
+            "populacao": np.zeros((capacidade, num_cidades), dtype=np.dtype(TIPO_GENOMA)),
+            "totais": np.zeros((capacidade, 2), dtype=np.int64),
+            "transportes": np.zeros((capacidade, num_cidades), dtype=np.int8),
+        }
+        for chave, origem in origens.items():
+            bloco = SharedMemory(create=True, size=max(origem.nbytes, 1))
+            self._blocos[chave] = bloco
+            self._memoria[chave] = _criar_visao(bloco, origem.shape, origem.dtype)
+            self._memoria[chave][...] = origem
+
+        # spawn: o processo principal pode já ter iniciado o pygame/SDL (modo interativo), que não sobrevive a um fork
+        contexto = multiprocessing.get_context("spawn")
+        self._pool = contexto.Pool(
+            processos,
+            initializer=_anexar_memoria,
+            initargs=({chave: bloco.name for chave, bloco in self._blocos.items()}, num_cidades, capacidade))
+
+    def avaliar(self, populacao: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula tempo e custo totais e transportes de uma população em formato de matriz (indivíduos x posições).
+        Retorna (matriz de [tempo, custo] totais, matriz de transportes por trecho), na ordem das linhas;
+        a normalização fica a cargo de quem chama (ver algoritmos_geneticos.normalizar_fitness).
+        """
+        num_individuos = len(populacao)
+        if num_individuos < self.processos * MIN_INDIVIDUOS_POR_PROCESSO:
+            totais = calcular_totais_populacao(self.tabelas, populacao)
+            return totais, self.tabelas.transporte_np[populacao, np.roll(populacao, -1, axis=1)]
+
+        totais = np.empty((num_individuos, 2), dtype=np.int64)
+        transportes = np.empty(populacao.shape, dtype=np.int8)
+        for inicio_lote in range(0, num_individuos, self.capacidade):
+            lote = populacao[inicio_lote:inicio_lote + self.capacidade]
+            tamanho = len(lote)
+            self._memoria["populacao"][:tamanho] = lote
+            limites = np.linspace(0, tamanho, min(self.processos, tamanho) + 1).astype(int)
+            self._pool.map(_avaliar_faixa, [(int(inicio), int(fim)) for inicio, fim in zip(limites[:-1], limites[1:])])
+            totais[inicio_lote:inicio_lote + tamanho] = self._memoria["totais"][:tamanho]
+            transportes[inicio_lote:inicio_lote + tamanho] = self._memoria["transportes"][:tamanho]
+        return totais, transportes
+
+    def fechar(self) -> None:
+        """
+        Encerra o pool e remove os blocos de memória compartilhada.
+        """
+        self._pool.close()
+        self._pool.join()
+        self._memoria.clear()
+        for bloco in self._blocos.values():
+            bloco.close()
+            bloco.unlink()
+        self._blocos.clear()
+
+    def __enter__(self) -> "AvaliacaoParalela":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
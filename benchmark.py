@@ -0,0 +1,296 @@
+"""
+Benchmark de qualidade de solução: executa o algoritmo genético (pela execução em lote, sem interface)
+sobre instâncias da TSPLIB com ótimo conhecido, em várias variantes de configuração e sementes, e mede:
+- gap até o ótimo: (comprimento - ótimo) / ótimo, em %;
+- tempo até o alvo: segundos (desde o início da execução) até a melhor rota ficar a no máximo alvo_gap % do ótimo;
+- gerações por segundo;
+Imprime uma tabela comparativa (Markdown) por instância e variante, grava os resultados em JSON
+e, com --comparar, compara com um resultado anterior e termina com código 1 se houver regressão.
+
+Uso:
+    python benchmark.py [--config benchmark.json] [--instancias instancias/att48.tsp ...] [--variantes base memetico ...]
+                        [--sementes 1 2 3] [--saida resultado_benchmark.json] [--comparar resultado_anterior.json]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from modo_lote import carregar_configuracao_lote, executar_lote
+from motor_ga import EstadoGA
+from parametros import BUSCA_LOCAL_ELITE, CRITERIO_PARADA_AMBOS, POPULACAO_ALEATORIA, POPULACAO_MISTA
+from tsplib import calcular_matriz_tsplib, comprimento_tour, ler_instancia, ler_tour
+
+# Configuração padrão do benchmark. "base" usa as chaves da execução em lote (modo_lote.CONFIGURACAO_PADRAO_LOTE)
+# e cada variante sobrescreve algumas delas. Sem aviões e trens e com somente_distancia, o fitness é
+# proporcional ao comprimento da rota, comparável ao ótimo publicado da instância.
+CONFIGURACAO_PADRAO_BENCHMARK: Dict[str, Any] = {
+    "instancias": [],  # vazio: todas as instancias/*.tsp que têm o respectivo .opt.tour
+    "sementes": [1, 2, 3],
+    "alvo_gap": 2.0,
+    "base": {
+        "perc_aviao": 0,
+        "perc_trem": 0,
+        "peso_tempo": 0.0,
+        "somente_distancia": True,
+        "populacao": 100,
+        "criterio_parada": CRITERIO_PARADA_AMBOS,
+        "max_geracoes": 300,
+        "max_geracoes_sem_melhoria": 100,
+    },
+    "variantes": {
+        "aleatoria": {"populacao_inicial": POPULACAO_ALEATORIA},
+        "heuristica": {"populacao_inicial": POPULACAO_MISTA},
+        "memetico": {"populacao_inicial": POPULACAO_MISTA, "busca_local": BUSCA_LOCAL_ELITE},
+        "memetico_final": {"populacao_inicial": POPULACAO_MISTA, "busca_local": BUSCA_LOCAL_ELITE, "otimizar_final": 2.0},
+    },
+    # Regressão na comparação: gap médio maior em mais de tolerancia_gap pontos percentuais
+    # ou gerações por segundo menores em mais de tolerancia_velocidade (fração)
+    "tolerancia_gap": 0.5,
+    "tolerancia_velocidade": 0.2,
+}
+
+
+
+def carregar_configuracao_benchmark(caminho: str | None) -> Dict[str, Any]:
+    """
+    Parte de CONFIGURACAO_PADRAO_BENCHMARK e aplica o arquivo JSON informado (mesmas chaves).
+    "base" é mesclada chave a chave; "variantes", se informada, substitui as variantes padrão.
+    """
+    configuracao = json.loads(json.dumps(CONFIGURACAO_PADRAO_BENCHMARK))
+    if caminho:
+        with open(caminho, encoding="utf-8") as arquivo:
+            do_arquivo = json.load(arquivo)
+        desconhecidas = set(do_arquivo) - set(CONFIGURACAO_PADRAO_BENCHMARK)
+        if desconhecidas:
+            raise ValueError(f"Chaves desconhecidas no arquivo de configuração: {', '.join(sorted(desconhecidas))}")
+        configuracao["base"].update(do_arquivo.pop("base", {}))
+        configuracao.update(do_arquivo)
+    if not configuracao["instancias"]:
+        configuracao["instancias"] = listar_instancias_com_otimo()
+    if not configuracao["instancias"]:
+        raise ValueError("Nenhuma instância com .opt.tour encontrada")
+    return configuracao
+
+
+
+def listar_instancias_com_otimo(diretorio: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instancias")) -> List[str]:
+    """
+    Instâncias .tsp do diretório que têm ao lado a rota ótima (mesmo nome, extensão .opt.tour).
+    """
+    return sorted(
+        caminho for caminho in glob.glob(os.path.join(diretorio, "*.tsp"))
+        if os.path.exists(caminho[:-len(".tsp")] + ".opt.tour"))
+
+
+
+class _Acompanhamento:
+    """
+    Chamada ao final de cada geração (ou etapa do modelo de ilhas) pela execução em lote:
+    registra o melhor comprimento, o instante em que o alvo foi atingido e a curva de melhoria (tempo, gap).
+    """
+
+    def __init__(self, matriz, otimo: int, alvo_gap: float):
+        self.matriz = matriz
+        self.otimo = otimo
+        self.alvo_gap = alvo_gap
+        self.inicio = time.perf_counter()
+        self.fim_ultima_geracao = self.inicio
+        self.geracoes = 0
+        self.melhor_comprimento: int | None = None
+        self.tempo_alvo: float | None = None
+        self.curva: List[List[float]] = []
+
+    def gap(self, comprimento: int) -> float:
+        return (comprimento - self.otimo) / self.otimo * 100
+
+    def registrar(self, comprimento: int) -> None:
+        agora = time.perf_counter() - self.inicio
+        if self.melhor_comprimento is None or comprimento < self.melhor_comprimento:
+            self.melhor_comprimento = comprimento
+            self.curva.append([round(agora, 4), round(self.gap(comprimento), 4)])
+            if self.tempo_alvo is None and self.gap(comprimento) <= self.alvo_gap:
+                self.tempo_alvo = agora
+
+    def __call__(self, estado: EstadoGA) -> bool:
+        self.fim_ultima_geracao = time.perf_counter()
+        self.geracoes = estado.geracao
+        self.registrar(comprimento_tour(self.matriz, estado.melhores_solucoes[-1][0]))
+        return True
+
+
+
+def executar_benchmark(configuracao: Dict[str, Any], variantes: List[str] | None = None) -> Dict[str, Any]:
+    """
+    Executa cada instância x variante x semente e retorna as execuções individuais e o resumo por instância e variante.
+    """
+    variantes = variantes or list(configuracao["variantes"])
+    execucoes = []
+    for caminho in configuracao["instancias"]:
+        instancia = ler_instancia(caminho)
+        matriz = calcular_matriz_tsplib(instancia)
+        otimo = comprimento_tour(matriz, ler_tour(caminho[:-len(".tsp")] + ".opt.tour"))
+        for variante in variantes:
+            for semente in configuracao["sementes"]:
+                config_lote = carregar_configuracao_lote(None, {
+                    **configuracao["base"], **configuracao["variantes"][variante], "tsplib": caminho, "semente": semente})
+                acompanhamento = _Acompanhamento(matriz, otimo, configuracao["alvo_gap"])
+                resultado = executar_lote(config_lote, acompanhamento)["resultado"]
+                # A otimização final (se houver) pode melhorar a rota depois da última geração
+                acompanhamento.registrar(comprimento_tour(matriz, resultado["melhor_trajeto"]))
+                tempo_total = time.perf_counter() - acompanhamento.inicio
+                tempo_geracoes = acompanhamento.fim_ultima_geracao - acompanhamento.inicio
+                execucao = {
+                    "instancia": instancia.nome,
+                    "variante": variante,
+                    "semente": semente,
+                    "otimo": otimo,
+                    "comprimento": acompanhamento.melhor_comprimento,
+                    "gap": acompanhamento.gap(acompanhamento.melhor_comprimento),
+                    "tempo_alvo": acompanhamento.tempo_alvo,
+                    "tempo_total": tempo_total,
+                    "geracoes": acompanhamento.geracoes,
+                    "geracoes_por_segundo": acompanhamento.geracoes / tempo_geracoes if tempo_geracoes > 0 else 0.0,
+                    "criterio_parada": resultado["criterio_parada"],
+                    "curva": acompanhamento.curva,
+                }
+                execucoes.append(execucao)
+                print(f"{instancia.nome:>12} {variante:>16} semente {semente}: gap {execucao['gap']:6.2f}% "
+                      f"em {tempo_total:6.2f}s ({execucao['geracoes_por_segundo']:.1f} ger/s)", file=sys.stderr)
+    return {
+        "configuracao": configuracao,
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "processadores": os.cpu_count(),
+        },
+        "execucoes": execucoes,
+        "resumo": resumir_execucoes(execucoes),
+    }
+
+
+
+def resumir_execucoes(execucoes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Agrega as execuções por instância e variante (na ordem em que aparecem):
+    melhor e média do gap, taxa de sucesso (alvo atingido), mediana do tempo até o alvo e média de gerações por segundo.
+    """
+    grupos: Dict[tuple, List[Dict[str, Any]]] = {}
+    for execucao in execucoes:
+        grupos.setdefault((execucao["instancia"], execucao["variante"]), []).append(execucao)
+    resumo = []
+    for (instancia, variante), grupo in grupos.items():
+        tempos_alvo = [e["tempo_alvo"] for e in grupo if e["tempo_alvo"] is not None]
+        resumo.append({
+            "instancia": instancia,
+            "variante": variante,
+            "otimo": grupo[0]["otimo"],
+            "melhor_comprimento": min(e["comprimento"] for e in grupo),
+            "melhor_gap": min(e["gap"] for e in grupo),
+            "gap_medio": statistics.mean(e["gap"] for e in grupo),
+            "taxa_sucesso": len(tempos_alvo) / len(grupo),
+            "tempo_alvo_mediano": statistics.median(tempos_alvo) if tempos_alvo else None,
+            "tempo_total_medio": statistics.mean(e["tempo_total"] for e in grupo),
+            "geracoes_por_segundo": statistics.mean(e["geracoes_por_segundo"] for e in grupo),
+        })
+    return resumo
+
+
+
+def tabela_markdown(resumo: List[Dict[str, Any]], alvo_gap: float) -> str:
+    """
+    Tabela comparativa do resumo em Markdown.
+    """
+    linhas = [
+        f"| Instância | Variante | Ótimo | Melhor | Melhor gap (%) | Gap médio (%) | Sucesso (gap <= {alvo_gap:g}%) "
+        "| Tempo até o alvo (s) | Tempo total (s) | Gerações/s |",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in resumo:
+        tempo_alvo = f"{r['tempo_alvo_mediano']:.2f}" if r["tempo_alvo_mediano"] is not None else "-"
+        linhas.append(
+            f"| {r['instancia']} | {r['variante']} | {r['otimo']} | {r['melhor_comprimento']} | {r['melhor_gap']:.2f} "
+            f"| {r['gap_medio']:.2f} | {r['taxa_sucesso']:.0%} | {tempo_alvo} | {r['tempo_total_medio']:.2f} "
+            f"| {r['geracoes_por_segundo']:.1f} |")
+    return "\n".join(linhas)
+
+
+
+def comparar_resultados(atual: Dict[str, Any], anterior: Dict[str, Any], tolerancia_gap: float, tolerancia_velocidade: float) -> List[str]:
+    """
+    Compara o resumo atual com o de um benchmark anterior (mesma instância e variante) e imprime as diferenças.
+    Retorna a lista de regressões: gap médio maior em mais de tolerancia_gap pontos percentuais
+    ou gerações por segundo menores em mais de tolerancia_velocidade (fração do valor anterior).
+    """
+    anteriores = {(r["instancia"], r["variante"]): r for r in anterior["resumo"]}
+    regressoes = []
+    print("\n| Instância | Variante | Gap médio (%) | Δ gap (p.p.) | Gerações/s | Δ gerações/s |")
+    print("|---|---|---:|---:|---:|---:|")
+    for r in atual["resumo"]:
+        chave = (r["instancia"], r["variante"])
+        if chave not in anteriores:
+            continue
+        a = anteriores[chave]
+        delta_gap = r["gap_medio"] - a["gap_medio"]
+        delta_velocidade = (r["geracoes_por_segundo"] / a["geracoes_por_segundo"] - 1) if a["geracoes_por_segundo"] else 0.0
+        print(f"| {r['instancia']} | {r['variante']} | {r['gap_medio']:.2f} | {delta_gap:+.2f} "
+              f"| {r['geracoes_por_segundo']:.1f} | {delta_velocidade:+.1%} |")
+        if delta_gap > tolerancia_gap:
+            regressoes.append(f"{r['instancia']}/{r['variante']}: gap médio {a['gap_medio']:.2f}% -> {r['gap_medio']:.2f}%")
+        if delta_velocidade < -tolerancia_velocidade:
+            regressoes.append(f"{r['instancia']}/{r['variante']}: gerações/s {a['geracoes_por_segundo']:.1f} -> {r['geracoes_por_segundo']:.1f}")
+    return regressoes
+
+
+
+def ler_argumentos() -> argparse.Namespace:
+    """
+    Lê os argumentos de linha de comando do benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de qualidade de solução contra o ótimo de instâncias TSPLIB")
+    parser.add_argument("--config", help="arquivo JSON com as chaves de CONFIGURACAO_PADRAO_BENCHMARK")
+    parser.add_argument("--instancias", nargs="+", help="arquivos .tsp (cada um com o respectivo .opt.tour)")
+    parser.add_argument("--variantes", nargs="+", help="variantes a executar (padrão: todas)")
+    parser.add_argument("--sementes", type=int, nargs="+", help="sementes de cada variante")
+    parser.add_argument("--saida", default="resultado_benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="resultado JSON de um benchmark anterior; termina com código 1 se houver regressão")
+    return parser.parse_args()
+
+
+
+if __name__ == "__main__":
+    argumentos = ler_argumentos()
+    try:
+        configuracao_benchmark = carregar_configuracao_benchmark(argumentos.config)
+        if argumentos.instancias:
+            configuracao_benchmark["instancias"] = argumentos.instancias
+        if argumentos.sementes:
+            configuracao_benchmark["sementes"] = argumentos.sementes
+        for nome in argumentos.variantes or []:
+            if nome not in configuracao_benchmark["variantes"]:
+                raise ValueError(f"Variante desconhecida: {nome} (disponíveis: {', '.join(configuracao_benchmark['variantes'])})")
+    except (OSError, ValueError) as e:
+        print(f"Configuração inválida: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    resultado_benchmark = executar_benchmark(configuracao_benchmark, argumentos.variantes)
+    print(tabela_markdown(resultado_benchmark["resumo"], configuracao_benchmark["alvo_gap"]))
+    with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado_benchmark, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {argumentos.saida}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as arquivo:
+            resultado_anterior = json.load(arquivo)
+        regressoes = comparar_resultados(
+            resultado_benchmark, resultado_anterior,
+            configuracao_benchmark["tolerancia_gap"], configuracao_benchmark["tolerancia_velocidade"])
+        if regressoes:
+            print("\nRegressões:\n- " + "\n- ".join(regressoes))
+            sys.exit(1)
+        print("\nSem regressões em relação a " + argumentos.comparar)
@@ -0,0 +1,229 @@
+"""
+Busca local para o TSP multimodal: 2-opt (modo memético do algoritmo genético), Or-opt e 3-opt de realocação
+de segmentos (com e sem inversão), além de um otimizador que combina os movimentos para qualquer rota.
+Os movimentos candidatos vêm de listas dos k vizinhos mais próximos de cada cidade, com bits "don't look"
+(uma cidade só volta a ser examinada quando uma de suas arestas muda) e primeira melhoria.
+O ganho de cada movimento é calculado sobre o mesmo fitness ponderado de tempo e custo
+(ver custos.delta_inversao e custos.delta_realocacao), e a busca respeita um prazo para não travar a geração.
+"""
+import time
+from array import array
+from collections import deque
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from custos import TabelasArestas, delta_inversao, delta_realocacao
+from parametros import COMPRIMENTO_MAX_OR_OPT, PESO_TEMPO
+
+
+def calcular_vizinhos_proximos(matriz_distancias: Sequence[Sequence[float]], k: int) -> List[List[int]]:
+    """
+    Retorna, para cada cidade, as k cidades mais próximas (em ordem crescente de distância).
+    np.argpartition seleciona os k menores de cada linha em O(n) e apenas eles são ordenados.
+    Usada quando só há a matriz de distâncias; com as posições das cidades, o índice espacial
+    (indice_espacial.GradeEspacial.vizinhos_proximos) evita a matriz n x n.
+    """
+    distancias = np.array(matriz_distancias, dtype=np.float64)
+    n = len(distancias)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+    np.fill_diagonal(distancias, np.inf)
+    candidatos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+    ordem = np.take_along_axis(distancias, candidatos, axis=1).argsort(axis=1)
+    return np.take_along_axis(candidatos, ordem, axis=1).tolist()
+
+
+
+def dois_opt(
+    individuo: array,
+    tabelas: TabelasArestas,
+    vizinhos: List[List[int]],
+    limites: Tuple[int, int, int, int],
+    peso_tempo: float = PESO_TEMPO,
+    prazo: float = float('inf')) -> Tuple[array, float]:
+    """
+    Aplica 2-opt com primeira melhoria até um ótimo local (ou até o prazo, em time.perf_counter()).
+    Para cada cidade a da fila, tenta ligar a a cada vizinho c da sua lista, nas duas formas do movimento:
+    - a e sua sucessora b: inverte o trecho entre b e c (novas arestas a-c e b-sucessora de c);
+    - a e sua antecessora b: inverte o trecho entre a e a antecessora de c (novas arestas a-c e b-antecessora de c);
+    A lista de vizinhos é percorrida enquanto a aresta a-c é mais barata que a aresta removida em a.
+    Retorna o indivíduo melhorado (uma cópia) e a variação total de fitness (<= 0).
+    """
+    tempo_min, tempo_max, custo_min, custo_max = limites
+    fator_tempo = peso_tempo / (tempo_max - tempo_min)
+    fator_custo = (1 - peso_tempo) / (custo_max - custo_min)
+    tempo, custo = tabelas.tempo, tabelas.custo
+
+    rota = list(individuo)
+    n = len(rota)
+    posicao = [0] * n
+    for i, cidade in enumerate(rota):
+        posicao[cidade] = i
+    na_fila = bytearray(b"\x01") * n
+    fila = deque(rota)
+    variacao_total = 0.0
+
+    while fila and time.perf_counter() < prazo:
+        a = fila.popleft()
+        na_fila[a] = 0
+        for sucessor in (True, False):
+            i = posicao[a]
+            if sucessor:
+                b = rota[(i + 1) % n]
+                limite = tempo[a][b] * fator_tempo + custo[a][b] * fator_custo
+            else:
+                b = rota[i - 1]
+                limite = tempo[b][a] * fator_tempo + custo[b][a] * fator_custo
+            melhorou = False
+            for c in vizinhos[a]:
+                if tempo[a][c] * fator_tempo + custo[a][c] * fator_custo >= limite:
+                    break
+                if c == b:
+                    continue
+                j = posicao[c]
+                if sucessor:
+                    inicio, fim = (i + 1, j) if i < j else (j + 1, i)
+                else:
+                    inicio, fim = (i, j - 1) if i < j else (j, i - 1)
+                if inicio >= fim or fim - inicio >= n - 1:
+                    continue
+                delta_tempo, delta_custo = delta_inversao(tabelas, rota, inicio, fim)
+                variacao = delta_tempo * fator_tempo + delta_custo * fator_custo
+                if variacao < -1e-12:
+                    rota[inicio:fim + 1] = rota[inicio:fim + 1][::-1]
+                    for k in range(inicio, fim + 1):
+                        posicao[rota[k]] = k
+                    variacao_total += variacao
+                    for cidade in (rota[inicio - 1], rota[inicio], rota[fim], rota[(fim + 1) % n]):
+                        if not na_fila[cidade]:
+                            na_fila[cidade] = 1
+                            fila.append(cidade)
+                    melhorou = True
+                    break
+            if melhorou:
+                # Primeira melhoria: a volta para a fila (se ainda não estiver) e a próxima cidade é examinada
+                if not na_fila[a]:
+                    na_fila[a] = 1
+                    fila.append(a)
+                break
+    return array(individuo.typecode, rota), variacao_total
+
+
+
+def or_opt(
+    individuo: array,
+    tabelas: TabelasArestas,
+    vizinhos: List[List[int]],
+    limites: Tuple[int, int, int, int],
+    peso_tempo: float = PESO_TEMPO,
+    prazo: float = float('inf'),
+    comprimento_max: int = COMPRIMENTO_MAX_OR_OPT,
+    inverter: bool = True) -> Tuple[array, float]:
+    """
+    Realocação de segmentos com primeira melhoria até um ótimo local (ou até o prazo):
+    - comprimento_max = 3 corresponde ao Or-opt clássico (cadeias de 1 a 3 cidades);
+      valores maiores dão o 3-opt restrito a realocação de segmentos;
+    - inverter: também testa inserir o segmento invertido;
+    Para cada cidade a da fila, os segmentos que começam ou terminam em a são inseridos junto
+    aos vizinhos c de cada extremidade, nas posições em que a extremidade fica ligada a c;
+    a lista de vizinhos é percorrida enquanto a aresta extremidade-c é mais barata que o ganho de retirar o segmento.
+    Retorna o indivíduo melhorado (uma cópia) e a variação total de fitness (<= 0).
+    """
+    tempo_min, tempo_max, custo_min, custo_max = limites
+    fator_tempo = peso_tempo / (tempo_max - tempo_min)
+    fator_custo = (1 - peso_tempo) / (custo_max - custo_min)
+    tempo, custo = tabelas.tempo, tabelas.custo
+
+    rota = list(individuo)
+    n = len(rota)
+    comprimento_max = min(comprimento_max, n - 3)
+    posicao = [0] * n
+    for i, cidade in enumerate(rota):
+        posicao[cidade] = i
+    na_fila = bytearray(b"\x01") * n
+    fila = deque(rota)
+    variacao_total = 0.0
+
+    def peso(a: int, b: int) -> float:
+        return tempo[a][b] * fator_tempo + custo[a][b] * fator_custo
+
+    def melhor_movimento(a: int) -> Tuple[int, int, int, bool] | None:
+        for comprimento in range(1, comprimento_max + 1):
+            for deslocamento in (0, comprimento - 1):
+                i = posicao[a] - deslocamento
+                if i < 0 or i + comprimento > n:
+                    continue
+                j = i + comprimento - 1
+                primeira, ultima = rota[i], rota[j]
+                anterior, seguinte = rota[i - 1], rota[(j + 1) % n]
+                # Ganho de retirar o segmento: a aresta nova no destino precisa ser mais barata que ele
+                ganho = peso(anterior, primeira) + peso(ultima, seguinte) - peso(anterior, seguinte)
+                # Destinos k (inserção entre rota[k] e a seguinte) que ligam uma extremidade do segmento a um vizinho c
+                for extremidade, lado in ((primeira, 0), (ultima, 1)):
+                    for c in vizinhos[extremidade]:
+                        if peso(extremidade, c) >= ganho:
+                            break
+                        for k, invertido in ((posicao[c] - lado, False), (posicao[c] - 1 + lado, True)):
+                            k %= n
+                            if i - 1 <= k <= j or (i == 0 and k == n - 1):
+                                continue
+                            if invertido and (not inverter or comprimento == 1):
+                                continue
+                            delta_tempo, delta_custo = delta_realocacao(tabelas, rota, i, j, k, invertido)
+                            if delta_tempo * fator_tempo + delta_custo * fator_custo < -1e-12:
+                                return i, j, k, invertido
+        return None
+
+    while fila and time.perf_counter() < prazo:
+        a = fila.popleft()
+        na_fila[a] = 0
+        movimento = melhor_movimento(a)
+        if movimento is None:
+            continue
+        i, j, k, invertido = movimento
+        delta_tempo, delta_custo = delta_realocacao(tabelas, rota, i, j, k, invertido)
+        variacao_total += delta_tempo * fator_tempo + delta_custo * fator_custo
+        afetadas = (rota[i - 1], rota[i], rota[j], rota[(j + 1) % n], rota[k], rota[(k + 1) % n])
+
+        # Só o trecho entre o segmento e o destino muda de posição
+        segmento = rota[i:j + 1]
+        if invertido:
+            segmento.reverse()
+        if k > j:
+            inicio, fim = i, k
+            rota[inicio:fim + 1] = rota[j + 1:k + 1] + segmento
+        else:
+            inicio, fim = k + 1, j
+            rota[inicio:fim + 1] = segmento + rota[k + 1:i]
+        for p in range(inicio, fim + 1):
+            posicao[rota[p]] = p
+
+        for cidade in afetadas:
+            if not na_fila[cidade]:
+                na_fila[cidade] = 1
+                fila.append(cidade)
+    return array(individuo.typecode, rota), variacao_total
+
+
+
+def melhorar_rota(
+    individuo: array,
+    tabelas: TabelasArestas,
+    vizinhos: List[List[int]],
+    limites: Tuple[int, int, int, int],
+    peso_tempo: float = PESO_TEMPO,
+    prazo: float = float('inf')) -> Tuple[array, float]:
+    """
+    Otimizador independente para qualquer rota: alterna 2-opt e Or-opt (com inversão) até que nenhum dos dois
+    encontre melhoria ou o prazo acabe. Retorna o indivíduo melhorado e a variação total de fitness (<= 0).
+    """
+    variacao_total = 0.0
+    while time.perf_counter() < prazo:
+        individuo, variacao_2opt = dois_opt(individuo, tabelas, vizinhos, limites, peso_tempo, prazo)
+        individuo, variacao_or_opt = or_opt(individuo, tabelas, vizinhos, limites, peso_tempo, prazo)
+        variacao_total += variacao_2opt + variacao_or_opt
+        if variacao_or_opt == 0:
+            break
+    return individuo, variacao_total
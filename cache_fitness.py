@@ -0,0 +1,174 @@
+"""
+Cache de fitness (LRU limitado) para evitar reavaliar rotas repetidas.
+Elites sobrevivem de uma geração para outra e, após a convergência, o torneio e o ERX produzem
+muitas cópias exatas da mesma rota; todas compartilham a mesma entrada do cache.
+"""
+from array import array
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from algoritmos_geneticos import calcular_totais_populacao, normalizar_fitness, populacao_para_matriz
+from avaliacao_paralela import AvaliacaoParalela
+from custos import TabelasArestas
+from parametros import PESO_TEMPO, TAM_CACHE_FITNESS
+
+
+class CacheFitness:
+    """
+    Cache LRU de tempo e custo totais e transportes por rota.
+    - A chave é a forma canônica da rota: rotacionada para iniciar na cidade 0 e, quando o cenário
+      é simétrico, orientada no sentido cujo segundo elemento é o menor (rota e rota invertida coincidem);
+    - Os totais são inteiros e exatos, independentes dos limites de normalização e do peso do tempo;
+    - Os transportes são guardados na orientação canônica e realinhados para a rota consultada;
+    - acertos/falhas contabilizam as consultas para acompanhamento da taxa de acerto;
+    """
+
+    def __init__(self, simetrica: bool, capacidade: int = TAM_CACHE_FITNESS):
+        self.simetrica = simetrica
+        self.capacidade = capacidade
+        self.acertos: int = 0
+        self.falhas: int = 0
+        self._entradas: OrderedDict[bytes, Tuple[int, int, np.ndarray | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def forma_canonica(self, individuo: array) -> Tuple[bytes, int, bool]:
+        """
+        Retorna a chave canônica da rota, a rotação aplicada e se a orientação foi invertida.
+        """
+        rotacao = individuo.index(0)
+        canonica = individuo[rotacao:] + individuo[:rotacao]
+        invertida = self.simetrica and canonica[-1] < canonica[1]
+        if invertida:
+            canonica = canonica[:1] + canonica[:0:-1]
+        return canonica.tobytes(), rotacao, invertida
+
+    def obter_totais(self, individuo: array) -> Tuple[int, int] | None:
+        """
+        Retorna [tempo, custo] totais em cache da rota (ou None), atualizando a ordem de uso e os contadores.
+        """
+        return self.obter_totais_por_chave(self.forma_canonica(individuo)[0])
+
+    def obter_totais_por_chave(self, chave: bytes) -> Tuple[int, int] | None:
+        """
+        Igual a obter_totais, para quem já calculou a chave canônica da rota.
+        """
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self._entradas.move_to_end(chave)
+        return entrada[0], entrada[1]
+
+    def consultar_totais(self, individuo: array) -> Tuple[int, int] | None:
+        """
+        Igual a obter_totais, mas sem alterar a ordem de uso nem os contadores
+        (consultas internas do algoritmo, ex.: os totais do pai de um mutante em motor_ga.reproduzir).
+        """
+        entrada = self._entradas.get(self.forma_canonica(individuo)[0])
+        return None if entrada is None else (entrada[0], entrada[1])
+
+    def obter(self, individuo: array) -> Tuple[int, int, List[int]] | None:
+        """
+        Retorna (tempo, custo, transportes) da rota em cache, com os transportes alinhados aos trechos da rota consultada.
+        """
+        chave, rotacao, invertida = self.forma_canonica(individuo)
+        entrada = self._entradas.get(chave)
+        if entrada is None or entrada[2] is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self._entradas.move_to_end(chave)
+        tempo, custo, transportes = entrada
+        n = len(transportes)
+        if invertida:
+            # O trecho m da rota consultada é o inverso do trecho (rotacao - m - 1) da forma canônica
+            transportes = transportes[(rotacao - 1 - np.arange(n)) % n]
+        else:
+            transportes = np.roll(transportes, rotacao)
+        return tempo, custo, transportes.tolist()
+
+    def armazenar(self, individuo: array, tempo: int, custo: int, transportes: Sequence[int] | None = None) -> None:
+        """
+        Armazena tempo e custo totais e transportes (alinhados aos trechos de individuo), descartando a entrada
+        menos usada recentemente.
+        Sem transportes (ex.: mutante avaliado pela variação das arestas alteradas, ver motor_ga.reproduzir),
+        uma entrada existente não é substituída; obter trata a entrada sem transportes como ausente.
+        """
+        if self.capacidade <= 0:
+            return
+        chave, rotacao, invertida = self.forma_canonica(individuo)
+        if transportes is None:
+            if chave in self._entradas:
+                return
+        else:
+            transportes = np.asarray(transportes, dtype=np.int8)
+            n = len(transportes)
+            if invertida:
+                transportes = transportes[(rotacao - 1 - np.arange(n)) % n]
+            else:
+                transportes = np.roll(transportes, -rotacao)
+        self._entradas[chave] = (tempo, custo, transportes)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+
+    def taxa_acertos(self) -> float:
+        """
+        Retorna a proporção de consultas atendidas pelo cache.
+        """
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+
+
+def avaliar_populacao_com_cache(
+    cache: CacheFitness,
+    tabelas: TabelasArestas,
+    populacao: List[array],
+    tempo_min,
+    tempo_max,
+    custo_min,
+    custo_max,
+    peso_tempo: float = PESO_TEMPO,
+    paralela: AvaliacaoParalela | None = None) -> np.ndarray:
+    """
+    Calcula o fitness da população consultando o cache primeiro:
+    1 - Rotas em cache (e cópias repetidas na mesma geração) não são reavaliadas;
+    2 - Os totais das rotas restantes são calculados em lote por calcular_totais_populacao
+      (ou, se informado, pelo backend de avaliação paralela);
+    3 - Totais e transportes das rotas avaliadas são armazenados no cache;
+    4 - Os totais de toda a população são normalizados de uma só vez (normalizar_fitness);
+    Retorna o vetor de fitness na ordem da população.
+    """
+    if cache.capacidade <= 0:
+        matriz = populacao_para_matriz(populacao)
+        totais = paralela.avaliar(matriz)[0] if paralela is not None else calcular_totais_populacao(tabelas, matriz)
+        return normalizar_fitness(totais, tempo_min, tempo_max, custo_min, custo_max, peso_tempo)
+
+    totais_populacao = np.empty((len(populacao), 2), dtype=np.int64)
+    pendentes: dict[bytes, List[int]] = {}
+    for i, individuo in enumerate(populacao):
+        chave = cache.forma_canonica(individuo)[0]
+        totais = cache.obter_totais_por_chave(chave)
+        if totais is None:
+            pendentes.setdefault(chave, []).append(i)
+        else:
+            totais_populacao[i] = totais
+
+    if pendentes:
+        indices = [posicoes[0] for posicoes in pendentes.values()]
+        matriz = populacao_para_matriz([populacao[i] for i in indices])
+        if paralela is not None:
+            avaliados, transportes = paralela.avaliar(matriz)
+        else:
+            avaliados = calcular_totais_populacao(tabelas, matriz)
+            transportes = tabelas.transporte_np[matriz, np.roll(matriz, -1, axis=1)]
+        for k, posicoes in enumerate(pendentes.values()):
+            totais_populacao[posicoes] = avaliados[k]
+            cache.armazenar(populacao[posicoes[0]], int(avaliados[k, 0]), int(avaliados[k, 1]), transportes[k])
+    return normalizar_fitness(totais_populacao, tempo_min, tempo_max, custo_min, custo_max, peso_tempo)
@@ -0,0 +1,228 @@
+"""
+Geração do cenário do TSP multimodal: posições das cidades, matriz de distâncias
+e rotas possíveis de avião (unidirecionais) e de trem (bidirecionais).
+A geração é vetorizada (NumPy) e usa um numpy.random.Generator; sem gerador explícito, um novo gerador é semeado
+a partir do módulo random, de modo que random.seed(semente) continua fixando o cenário (modo interativo e em lote).
+As rotas são sorteadas sem materializar a lista de todos os pares de cidades (ver sortear_sem_reposicao)
+e os índices sorteados são convertidos em pares (i, j) em lote.
+Um cenário pode ser gravado e lido em um arquivo .npz compacto (ver salvar_cenario / carregar_cenario).
+"""
+import json
+import os
+import random
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from parametros import ALTURA_TELA, LARGURA_TELA, MARGEM, OFFSET_X_GRAFICO
+from utils import indice_para_letra
+
+VERSAO_CENARIO = 1
+
+
+class Cenario(NamedTuple):
+    """
+    Dados de uma instância do problema:
+    - cidades: rótulo da cidade -> posição (x, y), na ordem dos índices do genoma;
+    - matriz_distancias: distância euclidiana entre cada par de cidades;
+    - matriz_aviao: 1 onde existe rota de avião de i para j;
+    - matriz_trem: 1 onde existe rota de trem entre i e j (simétrica);
+    - posicoes_geometricas: False quando as posições servem apenas para desenho e não refletem as distâncias
+      (ex.: instância TSPLIB com matriz explícita); os vizinhos próximos vêm então da matriz de distâncias;
+    As matrizes são arrays NumPy nos cenários gerados ou lidos de arquivo, e listas de listas nos lidos de um checkpoint;
+    ambas as formas são indexadas como matriz[i][j].
+    """
+    cidades: Dict[str, Tuple[int, int]]
+    matriz_distancias: List[List[float]] | np.ndarray
+    matriz_aviao: List[List[int]] | np.ndarray
+    matriz_trem: List[List[int]] | np.ndarray
+    posicoes_geometricas: bool = True
+
+
+
+def criar_gerador(semente: int | None = None) -> np.random.Generator:
+    """
+    Gerador aleatório do cenário: semeado com semente, ou a partir do módulo random se semente for None.
+    """
+    return np.random.default_rng(semente if semente is not None else random.getrandbits(64))
+
+
+
+def gerar_cidades(num_cidades: int, gerador: np.random.Generator | None = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Posiciona as cidades aleatoriamente na área do mapa (à direita do gráfico de fitness).
+    """
+    gerador = gerador or criar_gerador()
+    x = gerador.integers(OFFSET_X_GRAFICO + MARGEM, LARGURA_TELA - MARGEM, size=num_cidades, endpoint=True)
+    y = gerador.integers(MARGEM, ALTURA_TELA - MARGEM, size=num_cidades, endpoint=True)
+    return {indice_para_letra(i): posicao for i, posicao in enumerate(zip(x.tolist(), y.tolist()))}
+
+
+
+def calcular_matriz_distancias(posicoes: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Calcula a distância euclidiana de cada par de cidades (matriz n x n calculada em lote).
+    """
+    coordenadas = np.asarray(posicoes, dtype=np.float64).reshape(-1, 2)
+    dx = np.subtract.outer(coordenadas[:, 0], coordenadas[:, 0])
+    dy = np.subtract.outer(coordenadas[:, 1], coordenadas[:, 1])
+    dx *= dx
+    dy *= dy
+    dx += dy
+    return np.sqrt(dx, out=dx)
+
+
+
+def calcular_qtd_rotas_aviao(num_cidades: int, perc_cnx_aviao: int) -> int:
+    """
+    Número de rotas unidirecionais de avião para o percentual informado.
+    """
+    return (num_cidades * (num_cidades - 1)) * perc_cnx_aviao // 100
+
+
+
+def calcular_qtd_rotas_trem(num_cidades: int, perc_cnx_trem: int) -> int:
+    """
+    Número de rotas bidirecionais de trem para o percentual informado.
+    """
+    return (num_cidades * (num_cidades - 1) // 2) * perc_cnx_trem // 100
+
+
+
+def sortear_sem_reposicao(total: int, k: int, gerador: np.random.Generator) -> np.ndarray:
+    """
+    Sorteia k inteiros distintos em [0, total), uniformemente, sem materializar a lista dos inteiros:
+    sorteios com reposição em lote, marcados em uma máscara booleana de tamanho total, até completar k (com k <= total / 2, poucas rodadas);
+    o excedente da última rodada é desmarcado por um novo sorteio entre os marcados. Retorna os inteiros em ordem crescente.
+    Para k > total / 2, use o complemento (ver _sortear_pares).
+    """
+    marcados = np.zeros(total, dtype=bool)
+    qtd = 0
+    while qtd < k:
+        # Compensa as colisões esperadas com os já marcados para completar k em poucas rodadas
+        lote = int((k - qtd) * total / (total - qtd)) + 1
+        marcados[gerador.integers(0, total, size=lote)] = True
+        qtd = int(np.count_nonzero(marcados))
+    escolhidos = np.flatnonzero(marcados)
+    if qtd > k:
+        escolhidos = np.delete(escolhidos, gerador.choice(qtd, size=qtd - k, replace=False))
+    return escolhidos
+
+
+
+def _sortear_pares(total: int, k: int, gerador: np.random.Generator) -> Tuple[np.ndarray, bool]:
+    """
+    Índices de pares sorteados: os k escolhidos ou, se k > total / 2, os total - k não escolhidos (complemento = True).
+    """
+    if k > total // 2:
+        return sortear_sem_reposicao(total, total - k, gerador), True
+    return sortear_sem_reposicao(total, k, gerador), False
+
+
+
+def gerar_matriz_aviao(num_cidades: int, qtd_cnx_aviao: int, gerador: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Sorteia as rotas unidirecionais de avião entre pares ordenados de cidades distintas.
+    O índice r de um par ordenado é decodificado em origem r // (n - 1) e destino r % (n - 1) (saltando a diagonal).
+    """
+    gerador = gerador or criar_gerador()
+    rotas, complemento = _sortear_pares(num_cidades * (num_cidades - 1), qtd_cnx_aviao, gerador)
+    origem = rotas // max(num_cidades - 1, 1)
+    destino = rotas % max(num_cidades - 1, 1)
+    destino += destino >= origem
+    if complemento:
+        matriz_aviao = np.ones((num_cidades, num_cidades), dtype=np.int8)
+        np.fill_diagonal(matriz_aviao, 0)
+        matriz_aviao[origem, destino] = 0
+    else:
+        matriz_aviao = np.zeros((num_cidades, num_cidades), dtype=np.int8)
+        matriz_aviao[origem, destino] = 1
+    return matriz_aviao
+
+
+
+def gerar_matriz_trem(num_cidades: int, qtd_cnx_trem: int, gerador: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Sorteia as rotas bidirecionais de trem entre pares não ordenados de cidades distintas.
+    O índice r de um par (i, j), i < j, é decodificado por busca binária no início de cada linha i do triângulo superior.
+    """
+    gerador = gerador or criar_gerador()
+    rotas, complemento = _sortear_pares(num_cidades * (num_cidades - 1) // 2, qtd_cnx_trem, gerador)
+    linhas = np.arange(num_cidades, dtype=np.int64)
+    inicio_linha = linhas * (2 * num_cidades - linhas - 1) // 2
+    i = np.searchsorted(inicio_linha, rotas, side="right") - 1
+    j = rotas - inicio_linha[i] + i + 1
+    if complemento:
+        matriz_trem = np.ones((num_cidades, num_cidades), dtype=np.int8)
+        np.fill_diagonal(matriz_trem, 0)
+        valor = 0
+    else:
+        matriz_trem = np.zeros((num_cidades, num_cidades), dtype=np.int8)
+        valor = 1
+    matriz_trem[i, j] = valor
+    matriz_trem[j, i] = valor
+    return matriz_trem
+
+
+
+def gerar_cenario(num_cidades: int, perc_cnx_aviao: int, perc_cnx_trem: int, gerador: np.random.Generator | None = None) -> Cenario:
+    """
+    Gera um cenário completo. Sem gerador, cada etapa semeia o próprio gerador a partir do módulo random,
+    na mesma sequência do modo interativo (a mesma semente produz o mesmo cenário nos dois modos).
+    """
+    cidades = gerar_cidades(num_cidades, gerador)
+    matriz_distancias = calcular_matriz_distancias(list(cidades.values()))
+    matriz_aviao = gerar_matriz_aviao(num_cidades, calcular_qtd_rotas_aviao(num_cidades, perc_cnx_aviao), gerador)
+    matriz_trem = gerar_matriz_trem(num_cidades, calcular_qtd_rotas_trem(num_cidades, perc_cnx_trem), gerador)
+    return Cenario(cidades, matriz_distancias, matriz_aviao, matriz_trem)
+
+
+
+def salvar_cenario(cenario: Cenario, caminho: str) -> None:
+    """
+    Grava o cenário em um .npz compactado: posições, matrizes de avião e trem em bits (np.packbits)
+    e a matriz de distâncias apenas se ela não puder ser recalculada das posições (ex.: instâncias TSPLIB).
+    A gravação usa um arquivo temporário renomeado sobre o anterior (os.replace).
+    """
+    n = len(cenario.cidades)
+    posicoes = np.asarray(list(cenario.cidades.values()), dtype=np.float64).reshape(n, 2)
+    distancias = np.asarray(cenario.matriz_distancias, dtype=np.float64)
+    derivadas = cenario.posicoes_geometricas and np.array_equal(distancias, calcular_matriz_distancias(posicoes))
+    metadados = {
+        "versao": VERSAO_CENARIO,
+        "rotulos": list(cenario.cidades),
+        "posicoes_geometricas": cenario.posicoes_geometricas,
+        "distancias_derivadas": bool(derivadas),
+    }
+    arrays = {
+        "posicoes": posicoes.astype(np.int32) if np.array_equal(posicoes, np.round(posicoes)) else posicoes,
+        "aviao": np.packbits(np.asarray(cenario.matriz_aviao, dtype=bool)),
+        "trem": np.packbits(np.asarray(cenario.matriz_trem, dtype=bool)),
+        "metadados": np.frombuffer(json.dumps(metadados, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+    }
+    if not derivadas:
+        arrays["distancias"] = distancias
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez_compressed(arquivo, **arrays)
+    os.replace(temporario, caminho)
+
+
+
+def carregar_cenario(caminho: str) -> Cenario:
+    """
+    Lê um cenário gravado por salvar_cenario. Lança ValueError se o arquivo não for um cenário desta versão.
+    """
+    with np.load(caminho) as dados:
+        if "metadados" not in dados or "aviao" not in dados:
+            raise ValueError(f"Arquivo não é um cenário: {caminho}")
+        metadados = json.loads(dados["metadados"].tobytes().decode("utf-8"))
+        if metadados.get("versao") != VERSAO_CENARIO:
+            raise ValueError(f"Versão de cenário não suportada: {metadados.get('versao')!r} (esperada {VERSAO_CENARIO})")
+        posicoes = dados["posicoes"]
+        n = len(posicoes)
+        matriz_aviao = np.unpackbits(dados["aviao"], count=n * n).reshape(n, n).astype(np.int8)
+        matriz_trem = np.unpackbits(dados["trem"], count=n * n).reshape(n, n).astype(np.int8)
+        matriz_distancias = calcular_matriz_distancias(posicoes) if metadados["distancias_derivadas"] else dados["distancias"]
+    cidades = dict(zip(metadados["rotulos"], map(tuple, posicoes.tolist())))
+    return Cenario(cidades, matriz_distancias, matriz_aviao, matriz_trem, metadados["posicoes_geometricas"])
@@ -0,0 +1,276 @@
+"""
+Checkpoint e retomada de uma execução do algoritmo genético (população única).
+O checkpoint guarda o estado completo da execução ao final de uma geração: cenário (posições e matrizes),
+configuração, população avaliada e ordenada com o fitness, contadores do critério de parada,
+histórico das melhores soluções, estado do gerador aleatório e tempo já decorrido.
+O formato é um .npz compactado (arrays numpy, genomas em uint16), gravado em um arquivo temporário
+e renomeado sobre o anterior (os.replace), de modo que uma queda durante a gravação nunca corrompe o último checkpoint.
+A gravação acontece em uma thread: o laço do algoritmo apenas copia o estado e segue para a próxima geração.
+Retomada exata: com a mesma configuração e o estado aleatório restaurado, a execução retomada produz as mesmas gerações
+que a original (exceto com busca local, limitada por tempo de relógio).
+"""
+import json
+import os
+import queue
+import random
+import signal
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, NamedTuple
+
+import numpy as np
+
+from cenario import Cenario
+from motor_ga import ConfiguracaoGA, EstadoGA
+from parametros import INTERVALO_CHECKPOINT
+
+VERSAO_CHECKPOINT = 1
+
+
+class Checkpoint(NamedTuple):
+    """
+    Conteúdo de um checkpoint:
+    - metadados: dados adicionais da interface que iniciou a execução (ex.: configuração da execução em lote);
+    - tempo_decorrido: segundos de execução acumulados até o checkpoint;
+    """
+    cenario: Cenario
+    config: ConfiguracaoGA
+    estado: EstadoGA
+    estado_aleatorio: tuple
+    tempo_decorrido: float
+    metadados: Dict[str, Any]
+
+
+
+def _arrays_cenario(cenario: Cenario) -> Dict[str, np.ndarray]:
+    return {
+        "posicoes": np.array(list(cenario.cidades.values()), dtype=np.float64),
+        "distancias": np.array(cenario.matriz_distancias, dtype=np.float64),
+        "aviao": np.array(cenario.matriz_aviao, dtype=np.int8),
+        "trem": np.array(cenario.matriz_trem, dtype=np.int8),
+    }
+
+
+
+def _arrays_estado(estado: EstadoGA, estado_aleatorio: tuple) -> Dict[str, np.ndarray]:
+    n = len(estado.populacao_fitness[0][0])
+    return {
+        "populacao": np.array([individuo for individuo, _ in estado.populacao_fitness], dtype=np.uint16).reshape(-1, n),
+        "fitness": np.array([fitness for _, fitness in estado.populacao_fitness], dtype=np.float64),
+        "historico_rotas": np.array([solucao[0] for solucao in estado.melhores_solucoes], dtype=np.uint16).reshape(-1, n),
+        "historico_fitness": np.array([solucao[1] for solucao in estado.melhores_solucoes], dtype=np.float64),
+        "historico_transportes": np.array([solucao[2] for solucao in estado.melhores_solucoes], dtype=np.int8).reshape(-1, n),
+        "aleatorio": np.array(estado_aleatorio[1], dtype=np.uint32),
+    }
+
+
+
+def _metadados_gerais(
+    cenario: Cenario,
+    config: ConfiguracaoGA,
+    estado: EstadoGA,
+    estado_aleatorio: tuple,
+    tempo_decorrido: float,
+    metadados: Dict[str, Any]) -> np.ndarray:
+    conteudo = {
+        "versao": VERSAO_CHECKPOINT,
+        "rotulos": list(cenario.cidades),
+        "posicoes_geometricas": cenario.posicoes_geometricas,
+        "config": config._asdict(),
+        "geracao": estado.geracao,
+        "melhor_fitness": estado.melhor_fitness,
+        "geracoes_sem_melhoria": estado.geracoes_sem_melhoria,
+        "criterio_atingido": estado.criterio_atingido,
+        "aleatorio": [estado_aleatorio[0], estado_aleatorio[2]],
+        "tempo_decorrido": tempo_decorrido,
+        "metadados": metadados,
+    }
+    return np.frombuffer(json.dumps(conteudo, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+
+
+
+def _gravar_atomico(caminho: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Grava os arrays em caminho.tmp e substitui caminho de uma só vez (os.replace é atômico no mesmo sistema de arquivos).
+    """
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez_compressed(arquivo, **arrays)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+
+def salvar_checkpoint(
+    caminho: str,
+    cenario: Cenario,
+    config: ConfiguracaoGA,
+    estado: EstadoGA,
+    tempo_decorrido: float = 0.0,
+    metadados: Dict[str, Any] | None = None) -> None:
+    """
+    Grava (no processo corrente, sem thread) o checkpoint do estado ao final de uma geração, com o estado aleatório atual.
+    """
+    estado_aleatorio = random.getstate()
+    _gravar_atomico(caminho, {
+        **_arrays_cenario(cenario),
+        **_arrays_estado(estado, estado_aleatorio),
+        "metadados": _metadados_gerais(cenario, config, estado, estado_aleatorio, tempo_decorrido, metadados or {}),
+    })
+
+
+
+def carregar_checkpoint(caminho: str) -> Checkpoint:
+    """
+    Lê um checkpoint gravado por salvar_checkpoint ou GravadorCheckpoint.
+    Lança ValueError se o arquivo não for um checkpoint desta versão.
+    """
+    with np.load(caminho) as dados:
+        if "metadados" not in dados:
+            raise ValueError(f"Arquivo não é um checkpoint: {caminho}")
+        conteudo = json.loads(dados["metadados"].tobytes().decode("utf-8"))
+        if conteudo.get("versao") != VERSAO_CHECKPOINT:
+            raise ValueError(f"Versão de checkpoint não suportada: {conteudo.get('versao')!r} (esperada {VERSAO_CHECKPOINT})")
+        posicoes = [tuple(int(c) if float(c).is_integer() else float(c) for c in posicao) for posicao in dados["posicoes"].tolist()]
+        cenario = Cenario(
+            dict(zip(conteudo["rotulos"], posicoes)),
+            dados["distancias"].tolist(),
+            dados["aviao"].tolist(),
+            dados["trem"].tolist(),
+            conteudo["posicoes_geometricas"])
+        populacao_fitness = [(array('H', individuo), fitness) for individuo, fitness in zip(dados["populacao"].tolist(), dados["fitness"].tolist())]
+        melhores_solucoes = [
+            (array('H', rota), fitness, transportes)
+            for rota, fitness, transportes
+            in zip(dados["historico_rotas"].tolist(), dados["historico_fitness"].tolist(), dados["historico_transportes"].tolist())]
+        versao_aleatorio, gauss = conteudo["aleatorio"]
+        estado_aleatorio = (versao_aleatorio, tuple(dados["aleatorio"].tolist()), gauss)
+    estado = EstadoGA(
+        populacao=[individuo for individuo, _ in populacao_fitness],
+        geracao=conteudo["geracao"],
+        melhores_solucoes=melhores_solucoes,
+        melhor_fitness=conteudo["melhor_fitness"],
+        geracoes_sem_melhoria=conteudo["geracoes_sem_melhoria"],
+        criterio_atingido=conteudo["criterio_atingido"],
+        populacao_fitness=populacao_fitness)
+    return Checkpoint(cenario, ConfiguracaoGA(**conteudo["config"]), estado, estado_aleatorio, conteudo["tempo_decorrido"], conteudo["metadados"])
+
+
+
+class GravadorCheckpoint:
+    """
+    Gravação periódica de checkpoints em uma thread, usada como acompanhamento de executar_ga (ver registrar):
+    - a cada intervalo segundos, o estado da geração é copiado para arrays no laço do algoritmo
+      e a gravação (compactação + escrita + renomeação) fica com a thread;
+    - a fila tem capacidade 1: se a thread ainda estiver gravando, o checkpoint pendente é substituído pelo mais recente;
+    - Ctrl-C (SIGINT) não interrompe a geração no meio: registrar passa a retornar False, a execução para ao final
+      da geração e fechar grava o checkpoint final; um segundo Ctrl-C interrompe imediatamente;
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        cenario: Cenario,
+        config: ConfiguracaoGA,
+        metadados: Dict[str, Any] | None = None,
+        intervalo: float = INTERVALO_CHECKPOINT,
+        tempo_decorrido: float = 0.0):
+        self.caminho = caminho
+        self.cenario = cenario
+        self.config = config
+        self.metadados = metadados or {}
+        self.intervalo = intervalo
+        self.tempo_anterior = tempo_decorrido
+        self.inicio = time.perf_counter()
+        self.interrompido = False
+        self.erro: BaseException | None = None
+        self._arrays_cenario = _arrays_cenario(cenario)
+        self._proximo = self.inicio + intervalo
+        self._fila: queue.Queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._gravar_continuamente, daemon=True)
+        self._thread.start()
+        self._tratador_anterior = None
+        if threading.current_thread() is threading.main_thread():
+            self._tratador_anterior = signal.signal(signal.SIGINT, self._interromper)
+
+    def tempo_decorrido(self) -> float:
+        """
+        Segundos de execução acumulados, incluindo os das execuções anteriores (retomadas).
+        """
+        return self.tempo_anterior + time.perf_counter() - self.inicio
+
+    def registrar(self, estado: EstadoGA) -> bool:
+        """
+        Acompanhamento da geração: envia um checkpoint à thread se já passou o intervalo.
+        Retorna False após um Ctrl-C, para que a execução pare ao final da geração.
+        """
+        if time.perf_counter() >= self._proximo:
+            self._enviar(estado)
+            self._proximo = time.perf_counter() + self.intervalo
+        return not self.interrompido
+
+    def fechar(self, estado: EstadoGA | None = None) -> None:
+        """
+        Envia o checkpoint final (se houver estado), aguarda a thread terminar e restaura o tratamento do Ctrl-C.
+        Lança a exceção da última gravação que falhou, se houver.
+        """
+        if estado is not None and estado.populacao_fitness:
+            self._enviar(estado)
+        self._fila.put(None)
+        self._thread.join()
+        if self._tratador_anterior is not None:
+            signal.signal(signal.SIGINT, self._tratador_anterior)
+            self._tratador_anterior = None
+        if self.erro is not None:
+            raise self.erro
+
+    def _enviar(self, estado: EstadoGA) -> None:
+        estado_aleatorio = random.getstate()
+        arrays = {
+            **self._arrays_cenario,
+            **_arrays_estado(estado, estado_aleatorio),
+            "metadados": _metadados_gerais(
+                self.cenario, self.config, estado, estado_aleatorio, self.tempo_decorrido(), self.metadados),
+        }
+        try:
+            self._fila.put_nowait(arrays)
+        except queue.Full:
+            # Descarta o checkpoint pendente (mais antigo) em favor do atual
+            try:
+                self._fila.get_nowait()
+            except queue.Empty:
+                pass
+            self._fila.put(arrays)
+
+    def _gravar_continuamente(self) -> None:
+        while True:
+            arrays = self._fila.get()
+            if arrays is None:
+                return
+            try:
+                _gravar_atomico(self.caminho, arrays)
+            except OSError as e:
+                self.erro = e
+
+    def _interromper(self, sinal, quadro) -> None:
+        if self.interrompido:
+            raise KeyboardInterrupt
+        self.interrompido = True
+        print("\nInterrupção solicitada: a execução para ao final da geração e o checkpoint é gravado (Ctrl-C novamente para sair imediatamente).")
+
+
+
+def acompanhar_com_gravador(
+    gravador: GravadorCheckpoint,
+    ao_final_da_geracao: Callable[[EstadoGA], bool] | None = None) -> Callable[[EstadoGA], bool]:
+    """
+    Acompanhamento da geração que chama ao_final_da_geracao (se houver) e registra o estado no gravador.
+    A execução para quando qualquer um dos dois retorna False.
+    """
+    def acompanhamento(estado: EstadoGA) -> bool:
+        continuar = ao_final_da_geracao(estado) if ao_final_da_geracao is not None else True
+        return gravador.registrar(estado) and continuar
+
+    return acompanhamento
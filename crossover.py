@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Crossover operators for the coordinate-based GA (genetic_algorithm.py / tsp.py).
+Individuals are permutations of integer city indices (0..n-1); every operator runs in O(n)
+using position arrays (index of each city in a parent) and visited bitmaps instead of list scans.
+"""
+import random
+from typing import Callable, Dict, List, Sequence
+
+
+def order_crossover(parent1: Sequence[int], parent2: Sequence[int]) -> List[int]:
+    """
+    Perform order crossover (OX) between two parent permutations to create a child permutation.
+
+    The child keeps a random slice of parent1 in place; the remaining positions are filled, left to right,
+    with the missing cities in the order they appear in parent2.
+
+    Parameters:
+    - parent1 (Sequence[int]): The first parent permutation.
+    - parent2 (Sequence[int]): The second parent permutation.
+
+    Returns:
+    List[int]: The child permutation resulting from the order crossover.
+    """
+    length = len(parent1)
+
+    # Choose two random indices for the crossover
+    start_index = random.randint(0, length - 1)
+    end_index = random.randint(start_index + 1, length)
+
+    segment = parent1[start_index:end_index]
+    in_segment = bytearray(length)
+    for gene in segment:
+        in_segment[gene] = 1
+
+    remaining_genes = [gene for gene in parent2 if not in_segment[gene]]
+    return remaining_genes[:start_index] + list(segment) + remaining_genes[start_index:]
+
+
+def pmx_crossover(parent1: Sequence[int], parent2: Sequence[int]) -> List[int]:
+    """
+    Perform partially mapped crossover (PMX) between two parent permutations.
+
+    The child keeps a random slice of parent1 in place; every other position takes the city of parent2,
+    following the slice mapping (parent1[k] -> parent2[k]) while that city is already in the slice.
+    The mapping chains of different positions are disjoint, so the whole child is built in O(n).
+
+    Parameters:
+    - parent1 (Sequence[int]): The first parent permutation.
+    - parent2 (Sequence[int]): The second parent permutation.
+
+    Returns:
+    List[int]: The child permutation resulting from the partially mapped crossover.
+    """
+    length = len(parent1)
+    start_index = random.randint(0, length - 1)
+    end_index = random.randint(start_index + 1, length)
+
+    position1 = [0] * length
+    for i, gene in enumerate(parent1):
+        position1[gene] = i
+    in_segment = bytearray(length)
+    for gene in parent1[start_index:end_index]:
+        in_segment[gene] = 1
+
+    child = list(parent2)
+    child[start_index:end_index] = parent1[start_index:end_index]
+    for i in (*range(start_index), *range(end_index, length)):
+        gene = parent2[i]
+        while in_segment[gene]:
+            gene = parent2[position1[gene]]
+        child[i] = gene
+    return child
+
+
+def cycle_crossover(parent1: Sequence[int], parent2: Sequence[int]) -> List[int]:
+    """
+    Perform cycle crossover (CX) between two parent permutations.
+
+    The positions of the cycle that contains a random start position take their cities from parent1;
+    all other positions take their cities from parent2, so every city keeps the position it has in one of the parents.
+
+    Parameters:
+    - parent1 (Sequence[int]): The first parent permutation.
+    - parent2 (Sequence[int]): The second parent permutation.
+
+    Returns:
+    List[int]: The child permutation resulting from the cycle crossover.
+    """
+    length = len(parent1)
+    position1 = [0] * length
+    for i, gene in enumerate(parent1):
+        position1[gene] = i
+
+    child = list(parent2)
+    start = i = random.randrange(length)
+    while True:
+        child[i] = parent1[i]
+        i = position1[parent2[i]]
+        if i == start:
+            break
+    return child
+
+
+CROSSOVER_OPERATORS: Dict[str, Callable[[Sequence[int], Sequence[int]], List[int]]] = {
+    "ox": order_crossover,
+    "pmx": pmx_crossover,
+    "cx": cycle_crossover,
+}
+
+
+def get_crossover(name: str) -> Callable[[Sequence[int], Sequence[int]], List[int]]:
+    """
+    Return the crossover operator registered under `name` (see CROSSOVER_OPERATORS).
+
+    Raises:
+    ValueError: If `name` is not a known operator.
+    """
+    try:
+        return CROSSOVER_OPERATORS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown crossover operator '{name}' (expected one of: {', '.join(CROSSOVER_OPERATORS)})") from None
@@ -0,0 +1,188 @@
+"""
+Modelo de custos por aresta do TSP multimodal.
+As tabelas de tempo, custo e transporte de cada aresta (i, j) são calculadas uma única vez
+a partir das matrizes do cenário, pois não mudam ao longo da execução do algoritmo genético.
+"""
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from parametros import (
+    CUSTO_AVIAO,
+    CUSTO_CAMINHAO,
+    CUSTO_CARRO_ELETRICO,
+    CUSTO_TREM,
+    LIM_CARRO_ELETRICO,
+    TIPO_TRANSPORTE_AVIAO,
+    TIPO_TRANSPORTE_CAMINHAO,
+    TIPO_TRANSPORTE_CARRO_ELETRICO,
+    TIPO_TRANSPORTE_TREM,
+    VELOC_AVIAO,
+    VELOC_CAMINHAO,
+    VELOC_CARRO_ELETRICO,
+    VELOC_TREM,
+)
+
+
+class TabelasArestas(NamedTuple):
+    """
+    Tabelas pré-calculadas por aresta (origem x destino):
+    - tempo: tempo gasto no trecho com o transporte escolhido;
+    - custo: custo do trecho com o transporte escolhido;
+    - transporte: tipo de transporte escolhido (TIPO_TRANSPORTE_*);
+    - tempo_np, custo_np, transporte_np: as mesmas tabelas como matrizes NumPy, para avaliação vetorizada;
+    - simetrica: indica se (i, j) e (j, i) têm sempre o mesmo tempo, custo e transporte
+      (as rotas de avião são unidirecionais, então em geral o cenário é assimétrico);
+    As listas são mais rápidas para consultas pontuais em Python e as matrizes para indexação em lote.
+    """
+    tempo: List[List[int]]
+    custo: List[List[int]]
+    transporte: List[List[int]]
+    tempo_np: np.ndarray
+    custo_np: np.ndarray
+    transporte_np: np.ndarray
+    simetrica: bool
+
+
+
+def definir_transporte_aresta(distancia: int, aviao: int, trem: int) -> Tuple[int, int, int]:
+    """
+    Escolhe o transporte de um trecho, preferindo primeiro os veículos mais rápidos.
+    Retorna uma tupla com [tempo, custo, tipo_transporte] do trecho.
+    """
+    if aviao == 1:
+        return distancia // VELOC_AVIAO, distancia * CUSTO_AVIAO, TIPO_TRANSPORTE_AVIAO
+    if trem == 1:
+        return distancia // VELOC_TREM, distancia * CUSTO_TREM, TIPO_TRANSPORTE_TREM
+    if distancia <= LIM_CARRO_ELETRICO:
+        return distancia // VELOC_CARRO_ELETRICO, distancia * CUSTO_CARRO_ELETRICO, TIPO_TRANSPORTE_CARRO_ELETRICO
+    return distancia // VELOC_CAMINHAO, distancia * CUSTO_CAMINHAO, TIPO_TRANSPORTE_CAMINHAO
+
+
+
+def construir_tabelas_arestas(
+    matriz_distancias: List[List[float]],
+    matriz_aviao: List[List[int]],
+    matriz_trem: List[List[int]],
+    somente_distancia: bool = False) -> TabelasArestas:
+    """
+    Monta as tabelas de tempo, custo e transporte de todas as arestas do cenário.
+    Usa as mesmas regras de calcular_fitness_prioridade_tempo, de modo que somar as tabelas
+    ao longo de uma rota produz exatamente o mesmo tempo e custo totais.
+    Com somente_distancia, tempo e custo de cada aresta são a própria distância (todos os trechos de caminhão):
+    o fitness passa a ser proporcional ao comprimento da rota, como no TSP clássico (ex.: benchmark contra o ótimo da TSPLIB).
+    """
+    # Mesmas regras de definir_transporte_aresta, aplicadas a todas as arestas de uma vez (np.select na ordem de preferência)
+    distancias = np.asarray(matriz_distancias, dtype=np.float64).astype(np.int64)
+    if somente_distancia:
+        tempo_np = distancias.copy()
+        custo_np = distancias.copy()
+        transporte_np = np.full(distancias.shape, TIPO_TRANSPORTE_CAMINHAO, dtype=np.int8)
+    else:
+        condicoes = [
+            np.asarray(matriz_aviao) == 1,
+            np.asarray(matriz_trem) == 1,
+            distancias <= LIM_CARRO_ELETRICO,
+        ]
+        velocidades = np.select(condicoes, [VELOC_AVIAO, VELOC_TREM, VELOC_CARRO_ELETRICO], VELOC_CAMINHAO)
+        custos = np.select(condicoes, [CUSTO_AVIAO, CUSTO_TREM, CUSTO_CARRO_ELETRICO], CUSTO_CAMINHAO)
+        tempo_np = distancias // velocidades
+        custo_np = distancias * custos
+        transporte_np = np.select(
+            condicoes,
+            [TIPO_TRANSPORTE_AVIAO, TIPO_TRANSPORTE_TREM, TIPO_TRANSPORTE_CARRO_ELETRICO],
+            TIPO_TRANSPORTE_CAMINHAO).astype(np.int8)
+    for tabela in (tempo_np, custo_np, transporte_np):
+        np.fill_diagonal(tabela, 0)
+    simetrica = bool(
+        np.array_equal(tempo_np, tempo_np.T)
+        and np.array_equal(custo_np, custo_np.T)
+        and np.array_equal(transporte_np, transporte_np.T))
+    return TabelasArestas(tempo_np.tolist(), custo_np.tolist(), transporte_np.tolist(), tempo_np, custo_np, transporte_np, simetrica)
+
+
+
+def _delta_posicoes(tabelas: TabelasArestas, rota: Sequence[int], nova_cidade, posicoes: Iterable[int]) -> Tuple[int, int]:
+    """
+    Soma a variação de tempo e custo das arestas que partem das posições informadas,
+    comparando a rota original com a rota alterada (descrita por nova_cidade(posição), sem cópia).
+    """
+    tempo, custo = tabelas.tempo, tabelas.custo
+    n = len(rota)
+    delta_tempo: int = 0
+    delta_custo: int = 0
+    for p in posicoes:
+        a, b = rota[p], rota[(p + 1) % n]
+        na, nb = nova_cidade(p), nova_cidade(p + 1)
+        delta_tempo += tempo[na][nb] - tempo[a][b]
+        delta_custo += custo[na][nb] - custo[a][b]
+    return delta_tempo, delta_custo
+
+
+
+def delta_troca(tabelas: TabelasArestas, rota: Sequence[int], i: int, j: int) -> Tuple[int, int]:
+    """
+    Calcula em O(1) a variação de [tempo, custo] ao trocar as cidades das posições i e j da rota.
+    Apenas as (no máximo) quatro arestas vizinhas às posições trocadas são consultadas.
+    """
+    n = len(rota)
+
+    def nova_cidade(k: int) -> int:
+        k %= n
+        if k == i:
+            return rota[j]
+        if k == j:
+            return rota[i]
+        return rota[k]
+
+    return _delta_posicoes(tabelas, rota, nova_cidade, {(i - 1) % n, i, (j - 1) % n, j})
+
+
+
+def delta_inversao(tabelas: TabelasArestas, rota: Sequence[int], i: int, j: int) -> Tuple[int, int]:
+    """
+    Calcula a variação de [tempo, custo] ao inverter o segmento rota[i..j] (i <= j, inclusive).
+    1 - Cenário simétrico: apenas as duas arestas de fronteira mudam, O(1);
+    2 - Cenário assimétrico (avião unidirecional): as arestas internas trocam de sentido e
+        também são reavaliadas, O(j - i), ainda sem percorrer a rota inteira;
+    """
+    n = len(rota)
+
+    def nova_cidade(k: int) -> int:
+        k %= n
+        if i <= k <= j:
+            return rota[i + j - k]
+        return rota[k]
+
+    posicoes = {(i - 1) % n, j}
+    if not tabelas.simetrica:
+        posicoes.update(range(i, j))
+    return _delta_posicoes(tabelas, rota, nova_cidade, posicoes)
+
+
+
+def delta_realocacao(tabelas: TabelasArestas, rota: Sequence[int], i: int, j: int, k: int, invertido: bool = False) -> Tuple[int, int]:
+    """
+    Calcula a variação de [tempo, custo] ao mover o segmento rota[i..j] (i <= j, inclusive, sem dar a volta)
+    para entre rota[k] e a cidade seguinte (k fora de [i - 1, j]), opcionalmente invertido (Or-opt / 3-opt de realocação).
+    1 - Três arestas saem (antes do segmento, depois do segmento e no destino) e três entram;
+    2 - Com inversão em cenário assimétrico, as arestas internas do segmento trocam de sentido e também são somadas;
+    O(1) sem inversão ou em cenários simétricos; O(j - i) com inversão em cenários assimétricos.
+    """
+    tempo, custo = tabelas.tempo, tabelas.custo
+    n = len(rota)
+    anterior, seguinte = rota[i - 1], rota[(j + 1) % n]
+    primeira, ultima = rota[i], rota[j]
+    destino, apos_destino = rota[k], rota[(k + 1) % n]
+    entrada, saida = (ultima, primeira) if invertido else (primeira, ultima)
+
+    removidas = ((anterior, primeira), (ultima, seguinte), (destino, apos_destino))
+    inseridas = ((anterior, seguinte), (destino, entrada), (saida, apos_destino))
+    delta_tempo = sum(tempo[a][b] for a, b in inseridas) - sum(tempo[a][b] for a, b in removidas)
+    delta_custo = sum(custo[a][b] for a, b in inseridas) - sum(custo[a][b] for a, b in removidas)
+    if invertido and not tabelas.simetrica:
+        for p in range(i, j):
+            a, b = rota[p], rota[p + 1]
+            delta_tempo += tempo[b][a] - tempo[a][b]
+            delta_custo += custo[b][a] - custo[a][b]
+    return delta_tempo, delta_custo
@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
 """
 Draw utilities for TSP visualizer.
-Uses FigureCanvasAgg.tostring_argb() and converts ARGB -> RGB for Pygame.
+draw_plot renders a one-off figure (FigureCanvasAgg.tostring_argb() converted ARGB -> RGB for Pygame);
+ConvergencePlot keeps a persistent figure and updates it in place, for per-frame use.
 """
 import matplotlib
 from parametros import COR_AZUL, COR_CINZA, COR_PRETO, COR_VERDE, COR_VERMELHA, ESPESSURA_AVIAO, ESPESSURA_CAMINHAO, ESPESSURA_CARRO_ELETRICO, ESPESSURA_TREM, RAIO
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import pygame
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import List, Tuple, Optional, Sequence
 import numpy as np
 
 
@@ -53,6 +56,117 @@ def draw_plot(screen: pygame.Surface, x: list, y: list, x_label: str = 'Generati
         plt.close(fig)
 
 
+class ConvergencePlot:
+    """
+    Persistent convergence plot: one matplotlib figure kept for the whole run, updated in place.
+    - new fitness values are appended to a growable NumPy buffer (no per-frame list copies);
+    - long histories are reduced to min/max pairs per pixel column before plotting;
+    - axes, ticks and labels are redrawn only when the axis limits change; otherwise the cached
+      background is restored and only the line is drawn (blitting);
+    - the RGBA pixels are copied into one pygame surface that shares memory with a NumPy array,
+      so no surface or intermediate buffer is allocated per frame;
+    """
+
+    def __init__(self, x_label: str = 'Generation', y_label: str = 'Fitness', size: Tuple[int, int] = (4, 4), dpi: int = 100) -> None:
+        self.fig = Figure(figsize=size, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlabel(x_label)
+        self.ax.set_ylabel(y_label)
+        (self.line,) = self.ax.plot([], [], animated=True)
+        self._values = np.empty(1024, dtype=np.float64)
+        self._count = 0
+        self._background = None
+        self._limits: Optional[Tuple[float, float, float, float]] = None
+        w, h = self.canvas.get_width_height()
+        self._pixels = np.zeros((h, w, 4), dtype=np.uint8)
+        self._surface = pygame.image.frombuffer(self._pixels, (w, h), "RGBA")
+
+    def extend(self, values: Sequence[float]) -> None:
+        """
+        Append new fitness values (one per generation) to the history.
+        """
+        n = len(values)
+        if self._count + n > len(self._values):
+            grown = np.empty(max(2 * len(self._values), self._count + n), dtype=np.float64)
+            grown[:self._count] = self._values[:self._count]
+            self._values = grown
+        self._values[self._count:self._count + n] = values
+        self._count += n
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _downsampled(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the points to plot: the full history, or the min and max of each bucket when the
+        history has more points than twice the pixel width of the axes.
+        """
+        y = self._values[:self._count]
+        columns = max(1, int(self.ax.bbox.width))
+        if self._count <= 2 * columns:
+            return np.arange(self._count), y
+        bucket = -(-self._count // columns)
+        full = (self._count // bucket) * bucket
+        blocks = y[:full].reshape(-1, bucket)
+        starts = np.arange(0, full, bucket)
+        xs = np.repeat(starts, 2) + np.tile([0, bucket - 1], len(starts))
+        ys = np.column_stack((blocks.max(axis=1), blocks.min(axis=1))).ravel()
+        if full < self._count:
+            xs = np.append(xs, [full, self._count - 1])
+            ys = np.append(ys, [y[full:].max(), y[full:].min()])
+        return xs, ys
+
+    def _required_limits(self) -> Tuple[float, float, float, float]:
+        """
+        Compute axis limits with headroom, keeping the current ones while the data still fits:
+        the x range doubles when exceeded and the y range grows with a 10% margin.
+        """
+        y = self._values[:self._count]
+        y_min, y_max = float(y.min()), float(y.max())
+        if self._limits is not None:
+            x_hi, lo, hi = self._limits[1], self._limits[2], self._limits[3]
+            if self._count - 1 <= x_hi and lo <= y_min and y_max <= hi:
+                return self._limits
+        x_hi = 1.0
+        while x_hi < self._count - 1:
+            x_hi *= 2
+        margin = 0.1 * (y_max - y_min) or 0.05 * (abs(y_max) or 1.0)
+        return 0.0, x_hi, y_min - margin, y_max + margin
+
+    def draw(self, screen: pygame.Surface, position: Tuple[int, int] = (0, 0)) -> pygame.Rect:
+        """
+        Render the current history and blit it to `screen` at `position`. Returns the updated screen area.
+        """
+        if self._count:
+            limits = self._required_limits()
+            if limits != self._limits or self._background is None:
+                self._limits = limits
+                self.ax.set_xlim(limits[0], limits[1])
+                self.ax.set_ylim(limits[2], limits[3])
+                self.fig.tight_layout()
+                self.canvas.draw()
+                self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+            else:
+                self.canvas.restore_region(self._background)
+            self.line.set_data(*self._downsampled())
+            self.ax.draw_artist(self.line)
+        elif self._background is None:
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        np.copyto(self._pixels, np.asarray(self.canvas.buffer_rgba()))
+        return screen.blit(self._surface, position)
+
+
+@lru_cache(maxsize=None)
+def get_font(name: str = 'Arial', size: int = 15, bold: bool = False) -> pygame.font.Font:
+    """
+    Return a loaded font, initializing pygame.font and creating each (name, size, bold) font only once.
+    """
+    pygame.font.init()
+    return pygame.font.SysFont(name, size, bold)
+
+
 def draw_cities(
         screen: pygame.Surface,
         cities_locations: List[Tuple[int, int]],
@@ -65,35 +179,101 @@ def draw_cities(
         - labels: lista de strings com mesmo comprimento que cities_locations.
         - label_offset: deslocamento (x,y) em pixels aplicado à posição do label.
         """
-        for city_location in cities_locations:
+        my_font = get_font('Arial', font_size, True)
+        for index, city_location in enumerate(cities_locations):
             pygame.draw.circle(screen, COR_VERMELHA, city_location, RAIO)
             if labels is not None:
-                pygame.font.init()
-                my_font = pygame.font.SysFont('Arial', font_size, True)
-                text_surface = my_font.render(labels[cities_locations.index(city_location)], False, font_color)
+                text_surface = my_font.render(labels[index], False, font_color)
                 screen.blit(text_surface, (city_location[0] + label_offset[0], city_location[1] + label_offset[1]))
 
 
-def draw_paths(screen: pygame.Surface, path: Tuple[List[str], float, List[int]], cidades: dict[str, Tuple[int, int]]) -> None:
+def draw_paths(screen: pygame.Surface, path: Tuple[Sequence[int], float, List[int]], cities_locations: List[Tuple[int, int]]) -> Optional[pygame.Rect]:
     """
     Draw a path on a Pygame screen as a closed polyline.
+    - path: (tour of city indices, fitness, transport type of each leg)
+    - cities_locations: city positions indexed by city index
+    Returns the bounding rectangle of everything drawn (None if nothing was drawn).
     """
     if not path:
-        return
+        return None
+    rects = []
     for i in range(len(path[0])):
-        ponto_atual = cidades[path[0][i]]
-        ponto_proximo = cidades[path[0][(i + 1) % len(path[0])]]
+        ponto_atual = cities_locations[path[0][i]]
+        ponto_proximo = cities_locations[path[0][(i + 1) % len(path[0])]]
         match path[2][i]:
             case 1:  # Avião
-                pygame.draw.line(screen, COR_VERMELHA, ponto_atual, ponto_proximo, ESPESSURA_AVIAO)
+                rects.append(pygame.draw.line(screen, COR_VERMELHA, ponto_atual, ponto_proximo, ESPESSURA_AVIAO))
             case 2:  # Trem
-                pygame.draw.line(screen, COR_AZUL, ponto_atual, ponto_proximo, ESPESSURA_TREM)
+                rects.append(pygame.draw.line(screen, COR_AZUL, ponto_atual, ponto_proximo, ESPESSURA_TREM))
             case 3:  # Carro Elétrico
-                pygame.draw.line(screen, COR_VERDE, ponto_atual, ponto_proximo, ESPESSURA_CARRO_ELETRICO)
+                rects.append(pygame.draw.line(screen, COR_VERDE, ponto_atual, ponto_proximo, ESPESSURA_CARRO_ELETRICO))
             case 4:  # Caminhão
-                pygame.draw.line(screen, COR_CINZA, ponto_atual, ponto_proximo, ESPESSURA_CAMINHAO)
+                rects.append(pygame.draw.line(screen, COR_CINZA, ponto_atual, ponto_proximo, ESPESSURA_CAMINHAO))
             case _:  # Desconhecido
                 print(f"{path[2][i]}  -> Transporte desconhecido: desenhando linha preta espessura 1")
+    return rects[0].unionall(rects[1:]) if rects else None
+
+
+def draw_route(screen: pygame.Surface, route: Sequence[Tuple[int, int]], rgb_color: Tuple[int, int, int], width: int = 1) -> Optional[pygame.Rect]:
+    """
+    Draw a route (sequence of point locations) as a closed polyline of a single color.
+    Returns the bounding rectangle of the polyline (None for routes with fewer than 2 points).
+    """
+    if len(route) < 2:
+        return None
+    return pygame.draw.lines(screen, rgb_color, True, route, width=width)
+
+
+class LayeredRenderer:
+    """
+    Frame renderer with three layers, for frame cost that stays flat as the number of cities grows:
+    1 - static layer: background, city markers and labels pre-rendered once onto a cached surface;
+    2 - route layer: the best path, redrawn each frame after restoring the static layer under the previous path;
+    3 - plot layer: a ConvergencePlot blitted at `plot_position`;
+    Only the dirty areas (previous and current route bounds, plot) are sent to the display.
+    """
+
+    def __init__(
+            self,
+            screen: pygame.Surface,
+            cities_locations: List[Tuple[int, int]],
+            labels: Optional[List[str]],
+            plot: ConvergencePlot,
+            background_color: Tuple[int, int, int] = (255, 255, 255),
+            plot_position: Tuple[int, int] = (0, 0)) -> None:
+        self.screen = screen
+        self.cities_locations = cities_locations
+        self.plot = plot
+        self.plot_position = plot_position
+        self.static_layer = pygame.Surface(screen.get_size()).convert()
+        self.static_layer.fill(background_color)
+        draw_cities(self.static_layer, cities_locations, labels)
+        self._route_rect: Optional[pygame.Rect] = None
+        self._first_frame = True
+
+    def draw_frame(self, path: Tuple[Sequence[int], float, List[int]]) -> List[pygame.Rect]:
+        """
+        Draw one frame for `path` and update only the changed screen areas. Returns the updated rectangles.
+        """
+        if self._first_frame:
+            self.screen.blit(self.static_layer, (0, 0))
+        elif self._route_rect is not None:
+            self.screen.blit(self.static_layer, self._route_rect, self._route_rect)
+
+        dirty = [self.plot.draw(self.screen, self.plot_position)]
+        route_rect = draw_paths(self.screen, path, self.cities_locations)
+        if route_rect is not None:
+            dirty.append(route_rect)
+        if self._route_rect is not None:
+            dirty.append(self._route_rect)
+        self._route_rect = route_rect
+
+        if self._first_frame:
+            pygame.display.flip()
+            self._first_frame = False
+        else:
+            pygame.display.update(dirty)
+        return dirty
 
 
 def draw_text(screen: pygame.Surface, text: str, color: Tuple[int, int, int], position: Optional[Tuple[int, int]] = None, font_size: int = 15) -> None:
@@ -107,8 +287,7 @@ def draw_text(screen: pygame.Surface, text: str, color: Tuple[int, int, int], po
     - position: (x,y) tuple for blit position. If None, uses (10,10).
     - font_size: font size in px
     """
-    pygame.font.init()
-    my_font = pygame.font.SysFont('Arial', font_size)
+    my_font = get_font('Arial', font_size)
     text_surface = my_font.render(text, False, color)
     if position is None:
         position = (10, 10)
@@ -1,5 +1,4 @@
-from postechfiap_modulo2 import TIPO_TRANSPORTE_AVIAO, TIPO_TRANSPORTE_TREM, TIPO_TRANSPORTE_CARRO_ELETRICO, TIPO_TRANSPORTE_CAMINHAO
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 import random
 import math
 import copy 
@@ -60,6 +59,36 @@ def calculate_fitness(path: List[Tuple[float, float]]) -> float:
     return distance
 
 
+def calculate_tour_length(individual: Sequence[int], distance_matrix: Sequence[Sequence[float]]) -> float:
+    """
+    Calculate the length of a closed tour given as city indices, using a precomputed distance matrix
+    (e.g. a TSPLIB instance metric, see tsplib.py).
+
+    Parameters:
+    - individual (Sequence[int]): A permutation of city indices.
+    - distance_matrix (Sequence[Sequence[float]]): The distance between each pair of cities.
+
+    Returns:
+    float: The total length of the tour, including the edge back to the first city.
+    """
+    n = len(individual)
+    return sum(distance_matrix[individual[i]][individual[(i + 1) % n]] for i in range(n))
+
+
+def route_from_indices(individual: Sequence[int], cities_locations: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Convert an individual encoded as city indices (as used by the operators in crossover.py) into its route of city locations.
+
+    Parameters:
+    - individual (Sequence[int]): A permutation of indices into cities_locations.
+    - cities_locations (List[Tuple[float, float]]): The locations of the cities.
+
+    Returns:
+    List[Tuple[float, float]]: The route as a list of city locations.
+    """
+    return [cities_locations[i] for i in individual]
+
+
 def order_crossover(parent1: List[Tuple[float, float]], parent2: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
     """
     Perform order crossover (OX) between two parent sequences to create a child sequence.
@@ -81,13 +110,11 @@ def order_crossover(parent1: List[Tuple[float, float]], parent2: List[Tuple[floa
     child = parent1[start_index:end_index]
 
     # Fill in the remaining positions with genes from parent2
-    remaining_positions = [i for i in range(length) if i < start_index or i >= end_index]
-    remaining_genes = [gene for gene in parent2 if gene not in child]
-
-    for position, gene in zip(remaining_positions, remaining_genes):
-        child.insert(position, gene)
+    # (set lookups and slicing keep this linear; see crossover.py for the index-based operators)
+    in_child = set(child)
+    remaining_genes = [gene for gene in parent2 if gene not in in_child]
 
-    return child
+    return remaining_genes[:start_index] + child + remaining_genes[start_index:]
 
 ### demonstration: crossover test code
 # Example usage:
@@ -0,0 +1,194 @@
+"""
+Modelo de ilhas: K populações independentes evoluem em paralelo em um pool de processos,
+cada uma com os operadores do motor_ga (torneio, ERX e mutações), e a cada M gerações
+os melhores indivíduos de cada ilha migram para as vizinhas segundo a topologia (anel ou completa).
+O histórico das ilhas é combinado em um único EstadoGA (melhor solução de todas as ilhas por geração),
+no mesmo formato da execução com uma única população.
+"""
+import multiprocessing
+import os
+import random
+from array import array
+from itertools import chain
+from operator import itemgetter
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from cache_fitness import CacheFitness
+from instrumentacao import ativar_medicao, desativar_medicao, fase, medidor_ativo
+from motor_ga import (
+    AvaliadorGA,
+    ConfiguracaoGA,
+    EstadoGA,
+    evoluir_geracoes,
+    registrar_melhor_solucao,
+    verificar_criterio_parada,
+)
+from parametros import (
+    CRITERIO_PARADA_AMBOS,
+    CRITERIO_PARADA_MAX_GERACOES,
+    INTERVALO_MIGRACAO,
+    NUM_ILHAS,
+    NUM_MIGRANTES,
+    TOPOLOGIA_ANEL,
+    TOPOLOGIA_COMPLETA,
+)
+
+
+class ConfiguracaoIlhas(NamedTuple):
+    """
+    Parâmetros do modelo de ilhas:
+    - num_ilhas: número de populações independentes (cada uma com config.tam_populacao indivíduos);
+    - intervalo_migracao: gerações entre migrações;
+    - num_migrantes: melhores indivíduos que cada ilha recebe em cada migração (substituindo os piores);
+    - topologia: TOPOLOGIA_ANEL ou TOPOLOGIA_COMPLETA;
+    - processos: tamanho do pool (None usa uma ilha por núcleo, limitado ao número de ilhas);
+    """
+    num_ilhas: int = NUM_ILHAS
+    intervalo_migracao: int = INTERVALO_MIGRACAO
+    num_migrantes: int = NUM_MIGRANTES
+    topologia: str = TOPOLOGIA_ANEL
+    processos: int | None = None
+
+
+# Avaliador de cada processo do pool (tabelas recebidas uma única vez, na inicialização do processo)
+_avaliador_processo: AvaliadorGA | None = None
+
+
+
+def _inicializar_processo(tabelas, limites, vizinhos) -> None:
+    global _avaliador_processo
+    _avaliador_processo = AvaliadorGA(tabelas, limites, CacheFitness(tabelas.simetrica), vizinhos=vizinhos)
+
+
+
+def _evoluir_ilha(
+    tarefa: Tuple[EstadoGA, List[Tuple[array, float]] | None, ConfiguracaoGA, int, int, bool]
+) -> Tuple[EstadoGA, List[Tuple[array, float]], int, int, Dict[str, array] | None]:
+    """
+    Executa uma etapa (num_geracoes gerações) de uma ilha no processo do pool.
+    Retorna o estado da ilha (histórico apenas da etapa), a população ordenada, os acertos/falhas de cache da etapa
+    e, se medir_fases, as durações de cada fase medidas na etapa (ver instrumentacao).
+    """
+    estado, populacao_fitness, config, num_geracoes, semente, medir_fases = tarefa
+    random.seed(semente)
+    cache = _avaliador_processo.cache
+    acertos, falhas = cache.acertos, cache.falhas
+    if medir_fases:
+        ativar_medicao()
+    populacao_fitness = evoluir_geracoes(estado, _avaliador_processo, config, num_geracoes, populacao_fitness)
+    medidor = desativar_medicao()
+    return estado, populacao_fitness, cache.acertos - acertos, cache.falhas - falhas, medidor.duracoes if medidor else None
+
+
+
+def migrar(populacoes_fitness: List[List[Tuple[array, float]]], num_migrantes: int, topologia: str) -> None:
+    """
+    Substitui, em cada ilha, os piores indivíduos pelos melhores das ilhas de origem (no lugar):
+    - anel: a ilha i recebe os num_migrantes melhores da ilha i - 1;
+    - completa: a ilha i recebe os num_migrantes melhores entre os melhores de todas as outras ilhas;
+    Os emigrantes são escolhidos antes de qualquer substituição, e cada população continua ordenada pelo fitness.
+    """
+    num_ilhas = len(populacoes_fitness)
+    if num_ilhas < 2 or num_migrantes <= 0:
+        return
+    emigrantes = [populacao[:num_migrantes] for populacao in populacoes_fitness]
+    for i, populacao in enumerate(populacoes_fitness):
+        if topologia == TOPOLOGIA_COMPLETA:
+            candidatos = [individuo for j in range(num_ilhas) if j != i for individuo in emigrantes[j]]
+            imigrantes = sorted(candidatos, key=itemgetter(1))[:num_migrantes]
+        else:
+            imigrantes = emigrantes[(i - 1) % num_ilhas]
+        qtd = min(len(imigrantes), len(populacao) - 1)
+        if qtd > 0:
+            populacao[-qtd:] = imigrantes[:qtd]
+            populacao.sort(key=itemgetter(1))
+
+
+
+def combinar_populacoes(populacoes_fitness: List[List[Tuple[array, float]]], tam_populacao: int) -> List[Tuple[array, float]]:
+    """
+    Reúne as populações avaliadas das ilhas em uma única lista ordenada pelo fitness, sem rotas repetidas
+    (as mesmas rotas chegam a várias ilhas pela migração), com no máximo tam_populacao indivíduos.
+    """
+    combinada: List[Tuple[array, float]] = []
+    vistas = set()
+    for individuo, fitness in sorted(chain.from_iterable(populacoes_fitness), key=itemgetter(1)):
+        chave = individuo.tobytes()
+        if chave not in vistas:
+            vistas.add(chave)
+            combinada.append((individuo, fitness))
+            if len(combinada) == tam_populacao:
+                break
+    return combinada
+
+
+
+def executar_ilhas(
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    config_ilhas: ConfiguracaoIlhas,
+    populacoes: List[List[array]],
+    ao_final_da_etapa: Callable[[EstadoGA], bool] | None = None) -> EstadoGA:
+    """
+    Executa o algoritmo genético no modelo de ilhas até atingir o critério de parada.
+    1 - Cada ilha evolui intervalo_migracao gerações em um processo do pool;
+    2 - O histórico combinado registra, por geração, a melhor solução entre todas as ilhas;
+      o critério de parada é verificado geração a geração sobre esse histórico combinado;
+    3 - Se não parou, os melhores indivíduos migram segundo a topologia e uma nova etapa começa;
+    - ao_final_da_etapa: chamada após cada etapa com o estado combinado; retornar False interrompe a execução;
+    - Os acertos/falhas do cache de cada processo são somados em avaliador.cache e, com a medição de fases ativa,
+      as durações medidas em cada ilha são acrescentadas ao medidor do processo principal;
+    Retorna o estado combinado: populacao é a população da ilha com a melhor solução, e populacao_fitness reúne as
+    melhores rotas distintas de todas as ilhas (ver combinar_populacoes).
+    """
+    num_ilhas = len(populacoes)
+    processos = config_ilhas.processos or min(num_ilhas, os.cpu_count() or 1)
+    estado = EstadoGA(populacoes[0])
+    estados_ilhas = [EstadoGA(populacao) for populacao in populacoes]
+    populacoes_fitness: List[List[Tuple[array, float]] | None] = [None] * num_ilhas
+    max_geracoes = config.max_geracoes if config.criterio_parada in [CRITERIO_PARADA_MAX_GERACOES, CRITERIO_PARADA_AMBOS] else None
+    medidor = medidor_ativo()
+
+    # spawn: o processo principal pode já ter iniciado o pygame/SDL (modo interativo), que não sobrevive a um fork
+    contexto = multiprocessing.get_context("spawn")
+    with contexto.Pool(processos, initializer=_inicializar_processo, initargs=(avaliador.tabelas, avaliador.limites, avaliador.vizinhos)) as pool:
+        while True:
+            num_geracoes = config_ilhas.intervalo_migracao
+            if max_geracoes is not None:
+                num_geracoes = min(num_geracoes, max_geracoes - estado.geracao)
+            tarefas = [
+                (estados_ilhas[i], populacoes_fitness[i], config, num_geracoes, random.getrandbits(64), medidor is not None)
+                for i in range(num_ilhas)]
+            resultados = pool.map(_evoluir_ilha, tarefas)
+
+            # Combina o histórico da etapa: melhor solução entre as ilhas em cada geração
+            for i, (estado_ilha, populacao_fitness, acertos, falhas, duracoes_fases) in enumerate(resultados):
+                populacoes_fitness[i] = populacao_fitness
+                avaliador.cache.acertos += acertos
+                avaliador.cache.falhas += falhas
+                if medidor is not None:
+                    medidor.mesclar(duracoes_fases)
+            for g in range(num_geracoes):
+                melhor = min((resultado[0].melhores_solucoes[g] for resultado in resultados), key=itemgetter(1))
+                estado.geracao += 1
+                registrar_melhor_solucao(estado, melhor)
+                estado.criterio_atingido = verificar_criterio_parada(estado, config)
+                if estado.criterio_atingido:
+                    break
+            ilha_melhor = min(range(num_ilhas), key=lambda i: populacoes_fitness[i][0][1])
+            estado.populacao = resultados[ilha_melhor][0].populacao
+            estado.populacao_fitness = combinar_populacoes(populacoes_fitness, config.tam_populacao)
+
+            continuar = ao_final_da_etapa(estado) if ao_final_da_etapa is not None else True
+            if estado.criterio_atingido or not continuar:
+                break
+
+            # O histórico já foi combinado: as ilhas voltam ao pool apenas com o estado corrente
+            for i, (estado_ilha, *_) in enumerate(resultados):
+                estado_ilha.melhores_solucoes = []
+                estado_ilha.populacao = []
+                estado_ilha.populacao_fitness = []
+                estados_ilhas[i] = estado_ilha
+            with fase("migracao"):
+                migrar(populacoes_fitness, config_ilhas.num_migrantes, config_ilhas.topologia)
+    return estado
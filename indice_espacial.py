@@ -0,0 +1,234 @@
+"""
+Índice espacial em grade uniforme para consultas de proximidade entre cidades sem percorrer todos os pares
+(nem montar a matriz de distâncias n x n).
+O plano é dividido em células quadradas com, em média, PONTOS_POR_CELULA pontos; uma consulta examina
+anéis de células em torno do ponto até que nenhuma célula ainda não examinada possa conter um ponto mais próximo.
+- Consultas pontuais: k vizinhos mais próximos e cidades dentro de um raio;
+- Listas candidatas pré-calculadas (k vizinhos de todas as cidades, alcance do carro elétrico) em arrays numpy compactos,
+  calculadas célula a célula de forma vetorizada;
+Os pontos podem ser inseridos e removidos do índice (ex.: cidades ainda não visitadas na construção de uma rota).
+"""
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from parametros import LIM_CARRO_ELETRICO, PONTOS_POR_CELULA
+
+
+class GradeEspacial:
+    """
+    Grade uniforme sobre as posições (x, y) das cidades.
+    - ativos: se True, todas as cidades começam no índice; se False, o índice começa vazio (ver inserir);
+    As consultas consideram apenas as cidades presentes no índice.
+    """
+
+    def __init__(self, posicoes: Sequence[Tuple[float, float]], ativos: bool = True):
+        self.posicoes = [(float(x), float(y)) for x, y in posicoes]
+        n = len(self.posicoes)
+        xs = [x for x, _ in self.posicoes] or [0.0]
+        ys = [y for _, y in self.posicoes] or [0.0]
+        self.x_min, self.y_min = min(xs), min(ys)
+        largura = max(max(xs) - self.x_min, 1e-9)
+        altura = max(max(ys) - self.y_min, 1e-9)
+        self.tamanho_celula = max(math.sqrt(largura * altura * PONTOS_POR_CELULA / max(n, 1)), 1e-9)
+        self.colunas = int(largura / self.tamanho_celula) + 1
+        self.linhas = int(altura / self.tamanho_celula) + 1
+        self.celula_ponto = [self._celula(x, y) for x, y in self.posicoes]
+        self.celulas: List[List[int]] = [[] for _ in range(self.colunas * self.linhas)]
+        self.presente = bytearray(n)
+        self.total = 0
+        if ativos:
+            for i in range(n):
+                self.inserir(i)
+
+    def _celula(self, x: float, y: float) -> Tuple[int, int]:
+        coluna = min(max(int((x - self.x_min) / self.tamanho_celula), 0), self.colunas - 1)
+        linha = min(max(int((y - self.y_min) / self.tamanho_celula), 0), self.linhas - 1)
+        return coluna, linha
+
+    def inserir(self, i: int) -> None:
+        if not self.presente[i]:
+            coluna, linha = self.celula_ponto[i]
+            self.celulas[coluna * self.linhas + linha].append(i)
+            self.presente[i] = 1
+            self.total += 1
+
+    def remover(self, i: int) -> None:
+        if self.presente[i]:
+            coluna, linha = self.celula_ponto[i]
+            self.celulas[coluna * self.linhas + linha].remove(i)
+            self.presente[i] = 0
+            self.total -= 1
+
+    def __len__(self) -> int:
+        return self.total
+
+    def mais_proximos(self, ponto: Tuple[float, float], k: int, excluir: int = -1) -> List[int]:
+        """
+        Retorna as k cidades do índice mais próximas do ponto (em ordem crescente de distância), exceto excluir.
+        Pontos fora do anel r de células estão a pelo menos r * tamanho_celula do ponto consultado,
+        então a busca para assim que a k-ésima distância encontrada não passa desse limite.
+        """
+        disponiveis = self.total - (1 if 0 <= excluir < len(self.presente) and self.presente[excluir] else 0)
+        k = min(k, disponiveis)
+        if k <= 0:
+            return []
+        x, y = ponto
+        coluna, linha = self._celula(x, y)
+        posicoes, celulas, linhas = self.posicoes, self.celulas, self.linhas
+        encontrados: List[Tuple[float, int]] = []
+        raio_max = max(coluna, self.colunas - 1 - coluna, linha, self.linhas - 1 - linha)
+        for raio in range(raio_max + 1):
+            for c in range(max(coluna - raio, 0), min(coluna + raio, self.colunas - 1) + 1):
+                borda_coluna = c == coluna - raio or c == coluna + raio
+                passo = 1 if borda_coluna else 2 * raio
+                for l in range(linha - raio, linha + raio + 1, max(passo, 1)):
+                    if not 0 <= l < linhas:
+                        continue
+                    for j in celulas[c * linhas + l]:
+                        if j != excluir:
+                            xj, yj = posicoes[j]
+                            encontrados.append(((xj - x) ** 2 + (yj - y) ** 2, j))
+            if len(encontrados) >= k:
+                encontrados.sort()
+                del encontrados[k:]
+                if encontrados[-1][0] <= (raio * self.tamanho_celula) ** 2:
+                    break
+        return [j for _, j in encontrados]
+
+    def no_raio(self, ponto: Tuple[float, float], raio: float, excluir: int = -1) -> List[int]:
+        """
+        Retorna as cidades do índice a no máximo raio do ponto (sem ordem definida), exceto excluir.
+        Examina apenas as células que cruzam o quadrado de lado 2 * raio centrado no ponto.
+        """
+        x, y = ponto
+        coluna_min, linha_min = self._celula(x - raio, y - raio)
+        coluna_max, linha_max = self._celula(x + raio, y + raio)
+        posicoes, celulas, linhas = self.posicoes, self.celulas, self.linhas
+        raio2 = raio * raio
+        encontrados: List[int] = []
+        for c in range(coluna_min, coluna_max + 1):
+            for l in range(linha_min, linha_max + 1):
+                for j in celulas[c * linhas + l]:
+                    if j != excluir:
+                        xj, yj = posicoes[j]
+                        if (xj - x) ** 2 + (yj - y) ** 2 <= raio2:
+                            encontrados.append(j)
+        return encontrados
+
+    def _celulas_ordenadas(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cidades do índice ordenadas por célula: (coordenadas de todas as cidades, índices ordenados,
+        início de cada célula em índices ordenados, com uma posição extra no fim).
+        """
+        pontos = np.array(self.posicoes, dtype=np.float64).reshape(-1, 2)
+        presentes = np.flatnonzero(np.frombuffer(bytes(self.presente), dtype=np.uint8))
+        ids = np.array([c * self.linhas + l for c, l in self.celula_ponto], dtype=np.int64).reshape(-1)
+        ordenados = presentes[np.argsort(ids[presentes], kind="stable")]
+        inicios = np.searchsorted(ids[ordenados], np.arange(self.colunas * self.linhas + 1))
+        return pontos, ordenados, inicios
+
+    def _bloco(self, ordenados: np.ndarray, inicios: np.ndarray, coluna: int, linha: int, raio: int) -> np.ndarray:
+        """
+        Cidades das células a até raio células (distância de Chebyshev) da célula (coluna, linha).
+        Em cada coluna as células do bloco são consecutivas, então cada coluna é uma única fatia.
+        """
+        linha_min, linha_max = max(linha - raio, 0), min(linha + raio, self.linhas - 1)
+        fatias = [
+            ordenados[inicios[c * self.linhas + linha_min]:inicios[c * self.linhas + linha_max + 1]]
+            for c in range(max(coluna - raio, 0), min(coluna + raio, self.colunas - 1) + 1)]
+        return np.concatenate(fatias)
+
+    def vizinhos_proximos(self, k: int) -> np.ndarray:
+        """
+        Listas candidatas: matriz n x k (int32) com os k vizinhos mais próximos de cada cidade do índice,
+        em ordem crescente de distância (linhas de cidades fora do índice ficam com -1).
+        Para cada célula, as distâncias são calculadas de uma vez entre as cidades da célula e as do menor bloco
+        de células em volta com pelo menos k + 1 cidades; se a k-ésima distância de uma cidade passar do raio
+        garantido pelo bloco, a cidade é resolvida pela consulta pontual (mais_proximos).
+        """
+        n = len(self.posicoes)
+        k = min(k, max(self.total - 1, 0))
+        resultado = np.full((n, k), -1, dtype=np.int32)
+        if k == 0:
+            return resultado
+        pontos, ordenados, inicios = self._celulas_ordenadas()
+        contagens = np.diff(inicios).reshape(self.colunas, self.linhas)
+        for id_celula in np.flatnonzero(contagens.reshape(-1)):
+            coluna, linha = divmod(int(id_celula), self.linhas)
+            consulta = ordenados[inicios[id_celula]:inicios[id_celula + 1]]
+            raio = 1
+            while True:
+                bloco = contagens[max(coluna - raio, 0):coluna + raio + 1, max(linha - raio, 0):linha + raio + 1]
+                if bloco.sum() > k or bloco.size == contagens.size:
+                    break
+                raio += 1
+            candidatos = self._bloco(ordenados, inicios, coluna, linha, raio)
+            distancias = ((pontos[consulta, None, :] - pontos[None, candidatos, :]) ** 2).sum(axis=2)
+            distancias[consulta[:, None] == candidatos[None, :]] = np.inf
+            selecionados = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+            selecionadas = np.take_along_axis(distancias, selecionados, axis=1)
+            ordem = np.argsort(selecionadas, axis=1, kind="stable")
+            resultado[consulta] = candidatos[np.take_along_axis(selecionados, ordem, axis=1)]
+            # Cidades cuja k-ésima distância não é garantida pelo bloco (fora dele pode haver cidade mais próxima)
+            limite = (raio * self.tamanho_celula) ** 2
+            for p in np.flatnonzero(selecionadas.max(axis=1) > limite):
+                cidade = int(consulta[p])
+                resultado[cidade] = self.mais_proximos(self.posicoes[cidade], k, excluir=cidade)
+        return resultado
+
+    def vizinhos_no_raio(self, raio: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Listas de cidades a no máximo raio de cada cidade do índice, no formato compacto CSR:
+        (inicios, vizinhos), em que os vizinhos da cidade i são vizinhos[inicios[i]:inicios[i + 1]] (int32).
+        """
+        n = len(self.posicoes)
+        pontos, ordenados, inicios_celulas = self._celulas_ordenadas()
+        contagens = np.diff(inicios_celulas)
+        alcance = int(math.ceil(raio / self.tamanho_celula))
+        listas: List[np.ndarray] = [np.empty(0, dtype=np.int32)] * n
+        for id_celula in np.flatnonzero(contagens):
+            coluna, linha = divmod(int(id_celula), self.linhas)
+            consulta = ordenados[inicios_celulas[id_celula]:inicios_celulas[id_celula + 1]]
+            candidatos = self._bloco(ordenados, inicios_celulas, coluna, linha, alcance)
+            distancias = ((pontos[consulta, None, :] - pontos[None, candidatos, :]) ** 2).sum(axis=2)
+            dentro = (distancias <= raio * raio) & (consulta[:, None] != candidatos[None, :])
+            for p, cidade in enumerate(consulta):
+                listas[cidade] = candidatos[dentro[p]].astype(np.int32)
+        inicios = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(lista) for lista in listas], out=inicios[1:])
+        vizinhos = np.concatenate(listas) if n else np.empty(0, dtype=np.int32)
+        return inicios, vizinhos.astype(np.int32)
+
+    def mais_proximo(self, ponto: Tuple[float, float], excluir: int = -1) -> int:
+        """
+        Retorna a cidade do índice mais próxima do ponto (exceto excluir), ou -1 se o índice estiver vazio.
+        """
+        resultado = self.mais_proximos(ponto, 1, excluir)
+        return resultado[0] if resultado else -1
+
+
+
+def criar_indice_espacial(cidades: Dict[str, Tuple[int, int]]) -> GradeEspacial:
+    """
+    Cria o índice espacial a partir do dicionário de cidades do cenário (rótulo -> posição, na ordem do genoma).
+    """
+    return GradeEspacial(list(cidades.values()))
+
+
+
+def alcance_carro_eletrico(indice: GradeEspacial) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cidades alcançáveis de carro elétrico a partir de cada cidade (mesma regra de custos.definir_transporte_aresta:
+    distância truncada para inteiro <= LIM_CARRO_ELETRICO, ou seja, distância < LIM_CARRO_ELETRICO + 1),
+    no formato CSR de GradeEspacial.vizinhos_no_raio.
+    """
+    inicios, vizinhos = indice.vizinhos_no_raio(LIM_CARRO_ELETRICO + 1)
+    # Descarta as cidades exatamente a LIM_CARRO_ELETRICO + 1 (a consulta por raio é inclusiva)
+    pontos = np.array(indice.posicoes, dtype=np.float64).reshape(-1, 2)
+    origens = np.repeat(np.arange(len(inicios) - 1), np.diff(inicios))
+    manter = np.hypot(*(pontos[origens] - pontos[vizinhos]).T).astype(np.int64) <= LIM_CARRO_ELETRICO
+    novos_inicios = np.zeros_like(inicios)
+    np.cumsum(np.bincount(origens[manter], minlength=len(inicios) - 1), out=novos_inicios[1:])
+    return novos_inicios, vizinhos[manter]
@@ -0,0 +1,166 @@
+"""
+Medição do tempo gasto em cada fase de uma geração (avaliação, ordenação, seleção, cruzamento, mutação,
+busca local, desenho, console, etc.), para saber onde o tempo de execução é gasto.
+A medição é desativada por padrão: fase(nome) devolve então um contexto vazio compartilhado e
+relogio_fases() um relógio que não consulta o sistema, de modo que o custo no laço do algoritmo é desprezível.
+Com ativar_medicao(), cada fase acumula suas durações e o resumo (contagem, total, média, p50 e p95)
+pode ser exportado em JSON ou CSV e incluído no relatório PDF.
+"""
+import csv
+import json
+import time
+from array import array
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+
+class MedidorFases:
+    """
+    Durações (em segundos) registradas por fase, na ordem em que cada fase aparece pela primeira vez.
+    """
+
+    def __init__(self):
+        self.duracoes: Dict[str, array] = {}
+
+    def registrar(self, nome: str, duracao: float) -> None:
+        """
+        Acrescenta uma duração à fase (criando a fase na primeira ocorrência).
+        """
+        amostras = self.duracoes.get(nome)
+        if amostras is None:
+            amostras = self.duracoes[nome] = array('d')
+        amostras.append(duracao)
+
+    def mesclar(self, duracoes: Dict[str, array]) -> None:
+        """
+        Acrescenta as durações medidas em outro processo (ex.: as ilhas do modelo de ilhas).
+        """
+        for nome, amostras in duracoes.items():
+            self.duracoes.setdefault(nome, array('d')).extend(amostras)
+
+    def fase(self, nome: str) -> "_Fase":
+        return _Fase(self, nome)
+
+    def resumo(self) -> List[Dict[str, Any]]:
+        """
+        Resumo por fase: contagem, tempo total, média, p50 e p95 (segundos) e percentual do tempo total medido.
+        """
+        total_geral = sum(sum(amostras) for amostras in self.duracoes.values())
+        resumo = []
+        for nome, amostras in self.duracoes.items():
+            valores = np.frombuffer(amostras, dtype=np.float64) if amostras else np.zeros(1)
+            p50, p95 = np.percentile(valores, [50, 95])
+            total = float(valores.sum())
+            resumo.append({
+                "fase": nome,
+                "contagem": len(amostras),
+                "total": total,
+                "media": total / len(amostras) if amostras else 0.0,
+                "p50": float(p50),
+                "p95": float(p95),
+                "percentual": total / total_geral * 100 if total_geral > 0 else 0.0,
+            })
+        return resumo
+
+
+class _Fase:
+    """
+    Contexto que mede uma ocorrência da fase (with medidor.fase("avaliacao"): ...).
+    """
+    __slots__ = ("medidor", "nome", "inicio")
+
+    def __init__(self, medidor: MedidorFases, nome: str):
+        self.medidor = medidor
+        self.nome = nome
+        self.inicio = 0.0
+
+    def __enter__(self) -> "_Fase":
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.medidor.registrar(self.nome, time.perf_counter() - self.inicio)
+
+
+class _FaseDesativada:
+    """
+    Contexto vazio usado quando a medição está desativada.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "_FaseDesativada":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        pass
+
+
+_FASE_DESATIVADA = _FaseDesativada()
+
+# Medidor do processo corrente (None: medição desativada)
+_medidor: MedidorFases | None = None
+
+
+
+def ativar_medicao() -> MedidorFases:
+    """
+    Ativa a medição no processo corrente com um medidor vazio e o retorna.
+    """
+    global _medidor
+    _medidor = MedidorFases()
+    return _medidor
+
+
+
+def desativar_medicao() -> MedidorFases | None:
+    """
+    Desativa a medição no processo corrente e retorna o medidor que estava ativo (se houver).
+    """
+    global _medidor
+    medidor, _medidor = _medidor, None
+    return medidor
+
+
+
+def medidor_ativo() -> MedidorFases | None:
+    return _medidor
+
+
+
+def fase(nome: str) -> _Fase | _FaseDesativada:
+    """
+    Contexto que mede uma ocorrência da fase no medidor ativo (ou não faz nada se a medição estiver desativada).
+    """
+    if _medidor is None:
+        return _FASE_DESATIVADA
+    return _Fase(_medidor, nome)
+
+
+
+def _relogio_desativado() -> float:
+    return 0.0
+
+
+
+def relogio_fases() -> Callable[[], float]:
+    """
+    Relógio para fases intercaladas em um mesmo laço (ex.: seleção e cruzamento), somadas e registradas
+    uma vez por geração: time.perf_counter com a medição ativa, ou uma função que retorna 0 sem consultar o sistema.
+    """
+    return time.perf_counter if _medidor is not None else _relogio_desativado
+
+
+
+def exportar_resumo_fases(resumo: List[Dict[str, Any]], caminho: str) -> None:
+    """
+    Grava o resumo por fase em CSV (extensão .csv) ou JSON (qualquer outra extensão).
+    """
+    if caminho.lower().endswith(".csv"):
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=["fase", "contagem", "total", "media", "p50", "p95", "percentual"])
+            escritor.writeheader()
+            escritor.writerows(resumo)
+    else:
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
@@ -0,0 +1,349 @@
+"""
+Execução em lote (sem interface): lê os parâmetros de linha de comando e/ou de um arquivo JSON,
+executa o algoritmo genético sem pygame, sem limite de FPS e sem impressões por geração,
+e grava o resultado em JSON.
+"""
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from acervo_solucoes import AcervoSolucoes, impressao_digital_cenario, rotas_iniciais_acervo
+from algoritmos_geneticos import criar_individuo
+from checkpoint import Checkpoint, GravadorCheckpoint, acompanhar_com_gravador
+from cenario import Cenario, carregar_cenario, gerar_cenario, salvar_cenario
+from ilhas import ConfiguracaoIlhas, executar_ilhas
+from instrumentacao import ativar_medicao, desativar_medicao, fase
+from motor_ga import ConfiguracaoGA, EstadoGA, criar_avaliador, executar_ga, otimizar_melhor_solucao
+from nsga2 import calcular_objetivos, executar_nsga2, frente_para_dicionarios, grafico_frente_pareto
+from parametros import (
+    BUSCA_LOCAL_DESATIVADA,
+    BUSCA_LOCAL_INDIVIDUOS,
+    BUSCA_LOCAL_ORCAMENTO,
+    BUSCA_LOCAL_VIZINHOS,
+    CRITERIO_PARADA_AMBOS,
+    CRITERIO_PARADA_CONVERGENCIA,
+    CRITERIO_PARADA_MAX_GERACOES,
+    INTERVALO_CHECKPOINT,
+    INTERVALO_MIGRACAO,
+    MAX_CIDADES,
+    MAX_GERACOES_SEM_MELHORIA,
+    MAX_ILHAS,
+    MAX_MAX_GERACOES,
+    MAX_POPULACAO,
+    MAX_PROCESSOS_AVALIACAO,
+    MIN_CIDADES,
+    MIN_GERACOES_SEM_MELHORIA,
+    MIN_MAX_GERACOES,
+    MIN_POPULACAO,
+    MODOS_BUSCA_LOCAL,
+    NUM_ILHAS,
+    NUM_MIGRANTES,
+    PESO_TEMPO,
+    POPULACAO_ALEATORIA,
+    PROPORCAO_ACERVO,
+    PROPORCAO_ALEATORIA,
+    PROB_MUTACAO,
+    TIPO_TRANSPORTE_MAP,
+    TOPOLOGIA_ANEL,
+    TOPOLOGIAS_MIGRACAO,
+)
+from populacao_inicial import METODOS_POPULACAO_INICIAL, composicao_populacao, gerar_populacao_inicial
+from tsplib import gerar_cenario_tsplib, ler_instancia
+from utils import trajeto_para_letras
+
+# Valores padrão dos parâmetros de execução em lote
+CONFIGURACAO_PADRAO_LOTE: Dict[str, Any] = {
+    "cidades": 25,
+    "perc_aviao": 30,
+    "perc_trem": 30,
+    "populacao": 100,
+    "criterio_parada": CRITERIO_PARADA_AMBOS,
+    "max_geracoes": 1000,
+    "max_geracoes_sem_melhoria": 500,
+    "peso_tempo": PESO_TEMPO,
+    "prob_mutacao": PROB_MUTACAO,
+    "populacao_inicial": POPULACAO_ALEATORIA,
+    "proporcao_aleatoria": PROPORCAO_ALEATORIA,
+    "busca_local": BUSCA_LOCAL_DESATIVADA,
+    "busca_local_individuos": BUSCA_LOCAL_INDIVIDUOS,
+    "busca_local_orcamento": BUSCA_LOCAL_ORCAMENTO,
+    "ilhas": NUM_ILHAS,
+    "intervalo_migracao": INTERVALO_MIGRACAO,
+    "migrantes": NUM_MIGRANTES,
+    "topologia": TOPOLOGIA_ANEL,
+    "processos_avaliacao": 0,
+    "otimizar_final": 0,
+    "tsplib": None,
+    "cenario": None,
+    "salvar_cenario": None,
+    "somente_distancia": False,
+    "tempos_fases": None,
+    "checkpoint": None,
+    "intervalo_checkpoint": INTERVALO_CHECKPOINT,
+    "acervo": None,
+    "proporcao_acervo": PROPORCAO_ACERVO,
+    "pareto": False,
+    "grafico_pareto": None,
+    "semente": None,
+    "saida": "resultado_tsp.json",
+}
+
+
+
+def carregar_configuracao_lote(caminho: str | None, sobrescritas: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta a configuração da execução em lote:
+    1 - Parte dos valores padrão (CONFIGURACAO_PADRAO_LOTE);
+    2 - Aplica o arquivo JSON informado (chaves iguais às de CONFIGURACAO_PADRAO_LOTE);
+    3 - Aplica os valores informados na linha de comando (None significa "não informado");
+    """
+    configuracao = dict(CONFIGURACAO_PADRAO_LOTE)
+    if caminho:
+        with open(caminho, encoding="utf-8") as arquivo:
+            do_arquivo = json.load(arquivo)
+        desconhecidas = set(do_arquivo) - set(CONFIGURACAO_PADRAO_LOTE)
+        if desconhecidas:
+            raise ValueError(f"Chaves desconhecidas no arquivo de configuração: {', '.join(sorted(desconhecidas))}")
+        configuracao.update(do_arquivo)
+    configuracao.update({chave: valor for chave, valor in sobrescritas.items() if valor is not None})
+    validar_configuracao_lote(configuracao)
+    return configuracao
+
+
+
+def validar_configuracao_lote(configuracao: Dict[str, Any]) -> None:
+    """
+    Valida os parâmetros com os mesmos limites do modo interativo, lançando ValueError na primeira violação.
+    """
+    limites = [
+        ("perc_aviao", 0, 100),
+        ("perc_trem", 0, 100),
+        ("populacao", MIN_POPULACAO, MAX_POPULACAO),
+        ("criterio_parada", CRITERIO_PARADA_MAX_GERACOES, CRITERIO_PARADA_AMBOS),
+        ("busca_local_individuos", 1, MAX_POPULACAO),
+        ("ilhas", 1, MAX_ILHAS),
+        ("intervalo_migracao", 1, MAX_MAX_GERACOES),
+        ("migrantes", 0, MAX_POPULACAO),
+        ("processos_avaliacao", 0, MAX_PROCESSOS_AVALIACAO),
+    ]
+    if not configuracao["tsplib"] and not configuracao["cenario"]:
+        # Com uma instância TSPLIB ou um cenário gravado, o número de cidades é o da instância ou do cenário
+        limites.append(("cidades", MIN_CIDADES, MAX_CIDADES))
+    if configuracao["criterio_parada"] in [CRITERIO_PARADA_MAX_GERACOES, CRITERIO_PARADA_AMBOS]:
+        limites.append(("max_geracoes", MIN_MAX_GERACOES, MAX_MAX_GERACOES))
+    if configuracao["criterio_parada"] in [CRITERIO_PARADA_CONVERGENCIA, CRITERIO_PARADA_AMBOS]:
+        limites.append(("max_geracoes_sem_melhoria", MIN_GERACOES_SEM_MELHORIA, MAX_GERACOES_SEM_MELHORIA))
+    for chave, minimo, maximo in limites:
+        valor = configuracao[chave]
+        if not isinstance(valor, int) or isinstance(valor, bool) or not minimo <= valor <= maximo:
+            raise ValueError(f"Parâmetro '{chave}' inválido: {valor!r} (esperado inteiro entre {minimo} e {maximo})")
+    peso_tempo = configuracao["peso_tempo"]
+    if not isinstance(peso_tempo, (int, float)) or isinstance(peso_tempo, bool) or not 0 <= peso_tempo <= 1:
+        raise ValueError(f"Parâmetro 'peso_tempo' inválido: {peso_tempo!r} (esperado entre 0 e 1)")
+    if not isinstance(configuracao["prob_mutacao"], (int, float)) or not 0 <= configuracao["prob_mutacao"] <= 1:
+        raise ValueError(f"Parâmetro 'prob_mutacao' inválido: {configuracao['prob_mutacao']!r} (esperado entre 0 e 1)")
+    if configuracao["populacao_inicial"] not in METODOS_POPULACAO_INICIAL:
+        raise ValueError(f"Parâmetro 'populacao_inicial' inválido: {configuracao['populacao_inicial']!r} (esperado {', '.join(METODOS_POPULACAO_INICIAL)})")
+    if not isinstance(configuracao["proporcao_aleatoria"], (int, float)) or not 0 <= configuracao["proporcao_aleatoria"] <= 1:
+        raise ValueError(f"Parâmetro 'proporcao_aleatoria' inválido: {configuracao['proporcao_aleatoria']!r} (esperado entre 0 e 1)")
+    if configuracao["busca_local"] not in (BUSCA_LOCAL_DESATIVADA, *MODOS_BUSCA_LOCAL):
+        raise ValueError(f"Parâmetro 'busca_local' inválido: {configuracao['busca_local']!r} (esperado vazio, {' ou '.join(MODOS_BUSCA_LOCAL)})")
+    if not isinstance(configuracao["busca_local_orcamento"], (int, float)) or configuracao["busca_local_orcamento"] <= 0:
+        raise ValueError(f"Parâmetro 'busca_local_orcamento' inválido: {configuracao['busca_local_orcamento']!r} (esperado número de segundos maior que 0)")
+    if not isinstance(configuracao["otimizar_final"], (int, float)) or configuracao["otimizar_final"] < 0:
+        raise ValueError(f"Parâmetro 'otimizar_final' inválido: {configuracao['otimizar_final']!r} (esperado número de segundos maior ou igual a 0)")
+    if not isinstance(configuracao["somente_distancia"], bool):
+        raise ValueError(f"Parâmetro 'somente_distancia' inválido: {configuracao['somente_distancia']!r} (esperado true ou false)")
+    for chave in ("cenario", "salvar_cenario"):
+        if configuracao[chave] is not None and not isinstance(configuracao[chave], str):
+            raise ValueError(f"Parâmetro '{chave}' inválido: {configuracao[chave]!r} (esperado caminho de arquivo .npz)")
+    if configuracao["cenario"] and configuracao["tsplib"]:
+        raise ValueError("Parâmetros 'cenario' e 'tsplib' não podem ser usados juntos")
+    if configuracao["tempos_fases"] is not None and not isinstance(configuracao["tempos_fases"], str):
+        raise ValueError(f"Parâmetro 'tempos_fases' inválido: {configuracao['tempos_fases']!r} (esperado caminho de arquivo .json ou .csv)")
+    if configuracao["checkpoint"] is not None and not isinstance(configuracao["checkpoint"], str):
+        raise ValueError(f"Parâmetro 'checkpoint' inválido: {configuracao['checkpoint']!r} (esperado caminho de arquivo)")
+    if configuracao["checkpoint"] and configuracao["ilhas"] > 1:
+        raise ValueError("Parâmetro 'checkpoint' não é suportado com o modelo de ilhas (ilhas > 1)")
+    if not isinstance(configuracao["intervalo_checkpoint"], (int, float)) or configuracao["intervalo_checkpoint"] <= 0:
+        raise ValueError(f"Parâmetro 'intervalo_checkpoint' inválido: {configuracao['intervalo_checkpoint']!r} (esperado número de segundos maior que 0)")
+    if configuracao["acervo"] is not None and not isinstance(configuracao["acervo"], str):
+        raise ValueError(f"Parâmetro 'acervo' inválido: {configuracao['acervo']!r} (esperado caminho de arquivo JSON)")
+    if not isinstance(configuracao["proporcao_acervo"], (int, float)) or not 0 <= configuracao["proporcao_acervo"] <= 1:
+        raise ValueError(f"Parâmetro 'proporcao_acervo' inválido: {configuracao['proporcao_acervo']!r} (esperado entre 0 e 1)")
+    if not isinstance(configuracao["pareto"], bool):
+        raise ValueError(f"Parâmetro 'pareto' inválido: {configuracao['pareto']!r} (esperado true ou false)")
+    if configuracao["pareto"]:
+        incompativeis = [
+            chave for chave, ativo in (
+                ("ilhas", configuracao["ilhas"] > 1),
+                ("checkpoint", bool(configuracao["checkpoint"])),
+                ("busca_local", bool(configuracao["busca_local"])),
+                ("processos_avaliacao", configuracao["processos_avaliacao"] > 0),
+                ("otimizar_final", configuracao["otimizar_final"] > 0))
+            if ativo]
+        if incompativeis:
+            raise ValueError(f"Parâmetro 'pareto' não é suportado com: {', '.join(incompativeis)}")
+    if configuracao["grafico_pareto"] is not None and not isinstance(configuracao["grafico_pareto"], str):
+        raise ValueError(f"Parâmetro 'grafico_pareto' inválido: {configuracao['grafico_pareto']!r} (esperado caminho de arquivo .png)")
+    if configuracao["topologia"] not in TOPOLOGIAS_MIGRACAO:
+        raise ValueError(f"Parâmetro 'topologia' inválido: {configuracao['topologia']!r} (esperado {' ou '.join(TOPOLOGIAS_MIGRACAO)})")
+
+
+
+def gerar_cenario_lote(configuracao: Dict[str, Any]) -> Cenario:
+    """
+    Gera o cenário da configuração: cenário gravado (chave cenario, ver cenario.carregar_cenario), instância TSPLIB
+    (chave tsplib) ou cidades sorteadas, com as rotas de avião e trem.
+    """
+    if configuracao["cenario"]:
+        return carregar_cenario(configuracao["cenario"])
+    if configuracao["tsplib"]:
+        return gerar_cenario_tsplib(ler_instancia(configuracao["tsplib"]), configuracao["perc_aviao"], configuracao["perc_trem"])
+    return gerar_cenario(configuracao["cidades"], configuracao["perc_aviao"], configuracao["perc_trem"])
+
+
+
+def executar_lote(
+    configuracao: Dict[str, Any],
+    ao_final_da_geracao: Callable[[EstadoGA], bool] | None = None,
+    retomada: Checkpoint | None = None) -> Dict[str, Any]:
+    """
+    Gera o cenário, executa o algoritmo genético e retorna o resultado em um dicionário serializável.
+    - ao_final_da_geracao: acompanhamento opcional da execução (ex.: benchmark), chamado após cada geração
+      (no modelo de ilhas, após cada etapa entre migrações); retornar False interrompe a execução;
+    - retomada: checkpoint de uma execução interrompida (ver checkpoint.carregar_checkpoint); o cenário, a população,
+      os contadores e o estado aleatório vêm do checkpoint, e a configuração deve ser a mesma da execução original;
+    Com a chave salvar_cenario, grava o cenário gerado em .npz, que a chave cenario lê em uma nova execução.
+    Com a chave acervo, semeia até proporcao_acervo da população inicial com as melhores rotas já encontradas no mesmo
+    cenário (ver acervo_solucoes) e, ao final, guarda no acervo as rotas que o melhoram.
+    Com a chave pareto, executa o modo multiobjetivo (ver nsga2): o resultado inclui a frente de Pareto tempo x custo,
+    e a melhor solução é a de compromisso pelo peso_tempo; com a chave grafico_pareto, grava o gráfico da frente em PNG.
+    Com a chave checkpoint, grava o estado da execução periodicamente (a cada intervalo_checkpoint segundos) e ao final.
+    Com a chave tempos_fases, mede o tempo de cada fase das gerações (ver instrumentacao) e inclui o resumo no resultado;
+    a gravação do arquivo fica a cargo de quem chama (ver instrumentacao.exportar_resumo_fases).
+    """
+    if configuracao["semente"] is not None:
+        random.seed(configuracao["semente"])
+
+    tempo_inicio = time.time()
+    if retomada is not None:
+        cenario = retomada.cenario
+        random.setstate(retomada.estado_aleatorio)
+        tempo_inicio -= retomada.tempo_decorrido
+    else:
+        cenario = gerar_cenario_lote(configuracao)
+        if configuracao["salvar_cenario"]:
+            salvar_cenario(cenario, configuracao["salvar_cenario"])
+    config_ga = ConfiguracaoGA(
+        tam_populacao=configuracao["populacao"],
+        criterio_parada=configuracao["criterio_parada"],
+        max_geracoes=configuracao["max_geracoes"],
+        max_geracoes_sem_melhoria=configuracao["max_geracoes_sem_melhoria"],
+        peso_tempo=configuracao["peso_tempo"],
+        busca_local=configuracao["busca_local"],
+        busca_local_individuos=configuracao["busca_local_individuos"],
+        busca_local_orcamento=configuracao["busca_local_orcamento"],
+        prob_mutacao=configuracao["prob_mutacao"])
+    num_vizinhos = BUSCA_LOCAL_VIZINHOS if config_ga.busca_local else 0
+    posicoes = list(cenario.cidades.values())
+    composicao = composicao_populacao(configuracao["populacao_inicial"], configuracao["proporcao_aleatoria"])
+
+    # Acervo de soluções: rotas de execuções anteriores no mesmo cenário semeiam parte da população inicial
+    acervo = impressao = None
+    rotas_acervo: List[List[int]] = []
+    if configuracao["acervo"]:
+        acervo = AcervoSolucoes(configuracao["acervo"])
+        impressao = impressao_digital_cenario(cenario, config_ga.peso_tempo, configuracao["somente_distancia"])
+        if retomada is None:
+            rotas_acervo = rotas_iniciais_acervo(acervo, impressao, config_ga.tam_populacao, configuracao["proporcao_acervo"])
+
+    def nova_populacao():
+        with fase("populacao_inicial"):
+            rotas = rotas_acervo + gerar_populacao_inicial(posicoes, config_ga.tam_populacao - len(rotas_acervo), composicao)
+            return [criar_individuo(rota) for rota in rotas]
+
+    # Desativada também em caso de erro, para não vazar para a próxima execução no mesmo processo (ex.: benchmark)
+    medidor = ativar_medicao() if configuracao["tempos_fases"] else None
+    try:
+        if configuracao["ilhas"] > 1:
+            # Cada ilha já ocupa um processo: a avaliação paralela só é usada com uma única população
+            avaliador = criar_avaliador(cenario, num_vizinhos=num_vizinhos, somente_distancia=configuracao["somente_distancia"])
+            config_ilhas = ConfiguracaoIlhas(
+                num_ilhas=configuracao["ilhas"],
+                intervalo_migracao=configuracao["intervalo_migracao"],
+                num_migrantes=configuracao["migrantes"],
+                topologia=configuracao["topologia"])
+            populacoes = [nova_populacao() for _ in range(config_ilhas.num_ilhas)]
+            estado = executar_ilhas(avaliador, config_ga, config_ilhas, populacoes, ao_final_da_geracao)
+        else:
+            avaliador = criar_avaliador(
+                cenario, configuracao["processos_avaliacao"], config_ga.tam_populacao, num_vizinhos, configuracao["somente_distancia"])
+            gravador = None
+            if configuracao["checkpoint"]:
+                gravador = GravadorCheckpoint(
+                    configuracao["checkpoint"], cenario, config_ga, {"configuracao": configuracao},
+                    configuracao["intervalo_checkpoint"], time.time() - tempo_inicio)
+            acompanhamento = acompanhar_com_gravador(gravador, ao_final_da_geracao) if gravador else ao_final_da_geracao
+            estado = None
+            try:
+                if configuracao["pareto"]:
+                    estado = executar_nsga2(avaliador, config_ga, nova_populacao(), acompanhamento)
+                elif retomada is not None:
+                    estado = executar_ga(avaliador, config_ga, [], acompanhamento, retomada.estado)
+                else:
+                    estado = executar_ga(avaliador, config_ga, nova_populacao(), acompanhamento)
+            finally:
+                avaliador.fechar()
+                if gravador is not None:
+                    gravador.fechar(estado)
+        otimizar_melhor_solucao(estado, avaliador, config_ga, configuracao["otimizar_final"], posicoes)
+        tempo_execucao = time.time() - tempo_inicio
+    finally:
+        desativar_medicao()
+
+    melhor_trajeto, melhor_fitness, transportes = min(estado.melhores_solucoes, key=lambda solucao: solucao[1])
+    resultado_acervo = None
+    if acervo is not None:
+        solucoes = [(melhor_trajeto, melhor_fitness)] + estado.populacao_fitness
+        novas = acervo.registrar(impressao, solucoes, avaliador.tabelas.simetrica)
+        acervo.salvar()
+        resultado_acervo = {"impressao_digital": impressao, "rotas_semeadas": len(rotas_acervo), "novas_rotas": novas}
+    frente_pareto = None
+    if configuracao["pareto"]:
+        frente_pareto = frente_para_dicionarios(avaliador.tabelas, estado.frente_pareto)
+        if configuracao["grafico_pareto"]:
+            compromisso = calcular_objetivos(avaliador.tabelas, [melhor_trajeto])[0]
+            grafico_frente_pareto(estado.frente_pareto, tuple(compromisso), configuracao["grafico_pareto"])
+    return {
+        "configuracao": configuracao,
+        "resultado": {
+            "criterio_parada": estado.criterio_atingido,
+            "total_geracoes": estado.geracao,
+            "melhor_fitness": melhor_fitness,
+            "melhor_trajeto": list(melhor_trajeto),
+            "melhor_trajeto_letras": trajeto_para_letras(melhor_trajeto),
+            "comprimento_trajeto": sum(cenario.matriz_distancias[a][b] for a, b in zip(melhor_trajeto, melhor_trajeto[1:] + melhor_trajeto[:1])),
+            "transportes": [TIPO_TRANSPORTE_MAP[t] for t in transportes],
+            "tempo_execucao_segundos": round(tempo_execucao, 3),
+            "cache_fitness": {
+                "acertos": avaliador.cache.acertos,
+                "falhas": avaliador.cache.falhas,
+            },
+            "historico_fitness": [solucao[1] for solucao in estado.melhores_solucoes],
+            "tempos_fases": medidor.resumo() if medidor is not None else None,
+            "acervo": resultado_acervo,
+            "frente_pareto": frente_pareto,
+        },
+        "cidades": {nome: {"x": pos[0], "y": pos[1]} for nome, pos in cenario.cidades.items()},
+    }
+
+
+
+def salvar_resultado_json(resultado: Dict[str, Any], caminho: str) -> None:
+    """
+    Grava o resultado da execução em um arquivo JSON (UTF-8).
+    """
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
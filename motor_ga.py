@@ -0,0 +1,362 @@
+"""
+Laço principal do algoritmo genético, independente da interface (pygame, console ou execução em lote).
+Cada geração: avaliação e ordenação, critérios de convergência/parada e reprodução
+(elitismo, torneio + ERX e, na metade inferior da nova população, mutantes de pais já avaliados,
+com os totais de tempo e custo atualizados apenas pelas arestas alteradas).
+"""
+import random
+import time
+from array import array
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Callable, List, NamedTuple, Tuple
+
+from algoritmos_geneticos import (
+    aplicar_mutacoes,
+    calcular_fitness_tabelas,
+    calcular_limites_estimados,
+    edge_recombination_crossover,
+    obter_transportes,
+    selecao_por_torneio,
+)
+from avaliacao_paralela import AvaliacaoParalela
+from busca_local import calcular_vizinhos_proximos, dois_opt, melhorar_rota
+from cache_fitness import CacheFitness, avaliar_populacao_com_cache
+from cenario import Cenario
+from custos import TabelasArestas, construir_tabelas_arestas
+from indice_espacial import GradeEspacial, criar_indice_espacial
+from instrumentacao import fase, medidor_ativo, relogio_fases
+from parametros import (
+    BUSCA_LOCAL_DESATIVADA,
+    BUSCA_LOCAL_ELITE,
+    BUSCA_LOCAL_INDIVIDUOS,
+    BUSCA_LOCAL_ORCAMENTO,
+    BUSCA_LOCAL_VIZINHOS,
+    CRITERIO_PARADA_AMBOS,
+    CRITERIO_PARADA_CONVERGENCIA,
+    CRITERIO_PARADA_MAX_GERACOES,
+    PESO_TEMPO,
+    PROB_MUTACAO,
+)
+
+
+class ConfiguracaoGA(NamedTuple):
+    """
+    Parâmetros de execução do algoritmo genético:
+    - tam_populacao: número de indivíduos por geração;
+    - criterio_parada: CRITERIO_PARADA_MAX_GERACOES, CRITERIO_PARADA_CONVERGENCIA ou CRITERIO_PARADA_AMBOS;
+    - max_geracoes / max_geracoes_sem_melhoria: limites usados pelo critério escolhido;
+    - peso_tempo: peso do tempo (e 1 - peso do custo) no fitness;
+    - busca_local: modo memético (BUSCA_LOCAL_ELITE ou BUSCA_LOCAL_FILHOS; vazio desativa);
+    - busca_local_individuos / busca_local_orcamento: indivíduos otimizados e tempo máximo (s) por geração;
+    - prob_mutacao: probabilidade de mutação de cada indivíduo sujeito à mutação;
+    """
+    tam_populacao: int
+    criterio_parada: int
+    max_geracoes: int = 0
+    max_geracoes_sem_melhoria: int = 0
+    peso_tempo: float = PESO_TEMPO
+    busca_local: str = BUSCA_LOCAL_DESATIVADA
+    busca_local_individuos: int = BUSCA_LOCAL_INDIVIDUOS
+    busca_local_orcamento: float = BUSCA_LOCAL_ORCAMENTO
+    prob_mutacao: float = PROB_MUTACAO
+
+
+class AvaliadorGA(NamedTuple):
+    """
+    Dados de avaliação calculados uma única vez por cenário: tabelas por aresta, limites de normalização e cache.
+    - paralela: backend opcional de avaliação em processos com memória compartilhada (ver avaliacao_paralela);
+    - vizinhos: listas de vizinhos mais próximos de cada cidade, usadas pela busca local (modo memético);
+    """
+    tabelas: TabelasArestas
+    limites: Tuple[int, int, int, int]
+    cache: CacheFitness
+    paralela: AvaliacaoParalela | None = None
+    vizinhos: List[List[int]] | None = None
+
+    def fechar(self) -> None:
+        """
+        Libera os processos e a memória compartilhada da avaliação paralela, se houver.
+        """
+        if self.paralela is not None:
+            self.paralela.fechar()
+
+
+@dataclass
+class EstadoGA:
+    """
+    Estado corrente de uma execução (população, contadores e histórico das melhores soluções por geração).
+    - populacao_fitness: população da última geração avaliada, ordenada como tuplas (indivíduo, fitness),
+      de onde a próxima geração é reproduzida (e a execução é retomada a partir de um checkpoint);
+    - frente_pareto: no modo multiobjetivo (ver nsga2), rotas da frente de Pareto como tuplas (indivíduo, tempo, custo);
+    """
+    populacao: List[array]
+    geracao: int = 0
+    melhores_solucoes: List[Tuple[array, float, List[int]]] = field(default_factory=list)
+    melhor_fitness: float = float('inf')
+    geracoes_sem_melhoria: int = 0
+    criterio_atingido: str = ""
+    populacao_fitness: List[Tuple[array, float]] = field(default_factory=list)
+    frente_pareto: List[Tuple[array, int, int]] = field(default_factory=list)
+
+
+
+def criar_avaliador(
+    cenario: Cenario,
+    processos_avaliacao: int = 0,
+    tam_populacao: int = 0,
+    num_vizinhos: int = 0,
+    somente_distancia: bool = False) -> AvaliadorGA:
+    """
+    Pré-calcula as tabelas por aresta e os limites de normalização do cenário.
+    Com processos_avaliacao > 0, cria também o backend de avaliação paralela com capacidade para tam_populacao
+    indivíduos por lote (o avaliador deve então ser encerrado com fechar()).
+    Com num_vizinhos > 0, calcula as listas de vizinhos mais próximos usadas pela busca local
+    (pelo índice espacial das posições das cidades, sem percorrer a matriz de distâncias).
+    Com somente_distancia, o fitness considera apenas o comprimento da rota (ver custos.construir_tabelas_arestas).
+    """
+    tabelas = construir_tabelas_arestas(cenario.matriz_distancias, cenario.matriz_aviao, cenario.matriz_trem, somente_distancia)
+    paralela = None
+    if processos_avaliacao > 0:
+        paralela = AvaliacaoParalela(tabelas, tam_populacao, processos_avaliacao)
+    vizinhos = None
+    if num_vizinhos > 0 and cenario.posicoes_geometricas:
+        vizinhos = criar_indice_espacial(cenario.cidades).vizinhos_proximos(num_vizinhos).tolist()
+    elif num_vizinhos > 0:
+        vizinhos = calcular_vizinhos_proximos(cenario.matriz_distancias, num_vizinhos)
+    return AvaliadorGA(tabelas, calcular_limites_estimados(cenario.matriz_distancias), CacheFitness(tabelas.simetrica), paralela, vizinhos)
+
+
+
+def avaliar_geracao(estado: EstadoGA, avaliador: AvaliadorGA, config: ConfiguracaoGA) -> List[Tuple[array, float]]:
+    """
+    Inicia uma nova geração avaliando a população corrente:
+    1 - Calcula e ordena o fitness da população (menor é melhor);
+    2 - Registra a melhor solução da geração no histórico;
+    3 - Atualiza o contador de gerações sem melhoria;
+    Retorna a população ordenada como tuplas (indivíduo, fitness).
+    """
+    estado.geracao += 1
+    with fase("avaliacao"):
+        fitness_populacao = avaliar_populacao_com_cache(
+            avaliador.cache,
+            avaliador.tabelas,
+            estado.populacao,
+            *avaliador.limites,
+            config.peso_tempo,
+            avaliador.paralela)
+    with fase("ordenacao"):
+        populacao_fitness: List[Tuple[array, float]] = sorted(
+            zip(estado.populacao, fitness_populacao.tolist()),
+            key=itemgetter(1))
+        estado.populacao_fitness = populacao_fitness
+        melhor_individuo, fitness_atual = populacao_fitness[0]
+        registrar_melhor_solucao(estado, (melhor_individuo, fitness_atual, obter_transportes(avaliador.tabelas, melhor_individuo)))
+    return populacao_fitness
+
+
+
+def registrar_melhor_solucao(estado: EstadoGA, solucao: Tuple[array, float, List[int]]) -> None:
+    """
+    Registra a melhor solução (indivíduo, fitness, transportes) da geração corrente no histórico
+    e atualiza o melhor fitness e o contador de gerações sem melhoria.
+    """
+    estado.melhores_solucoes.append(solucao)
+    if solucao[1] < estado.melhor_fitness:
+        estado.melhor_fitness = solucao[1]
+        estado.geracoes_sem_melhoria = 0
+    else:
+        estado.geracoes_sem_melhoria += 1
+
+
+
+def verificar_criterio_parada(estado: EstadoGA, config: ConfiguracaoGA) -> str:
+    """
+    Retorna a descrição do critério de parada atingido, ou uma string vazia para continuar.
+    """
+    if config.criterio_parada in [CRITERIO_PARADA_MAX_GERACOES, CRITERIO_PARADA_AMBOS] and estado.geracao >= config.max_geracoes:
+        return f"Número máximo de gerações atingido ({config.max_geracoes})"
+    if config.criterio_parada in [CRITERIO_PARADA_CONVERGENCIA, CRITERIO_PARADA_AMBOS] and estado.geracoes_sem_melhoria >= config.max_geracoes_sem_melhoria:
+        return f"Convergência atingida ({config.max_geracoes_sem_melhoria} gerações sem melhoria)"
+    return ""
+
+
+
+def calcular_tamanho_elite(tam_populacao: int) -> int:
+    """
+    Número de indivíduos preservados por elitismo (10% da população) no início da nova população.
+    """
+    return tam_populacao // 10
+
+
+
+def aplicar_busca_local(populacao: List[array], avaliador: AvaliadorGA, config: ConfiguracaoGA) -> None:
+    """
+    Modo memético: aplica a busca local 2-opt (ver busca_local.dois_opt) à nova população, no lugar:
+    - BUSCA_LOCAL_ELITE: aos primeiros indivíduos da elite;
+    - BUSCA_LOCAL_FILHOS: aos primeiros filhos gerados por cruzamento (logo após a elite);
+    No máximo busca_local_individuos indivíduos, dentro do orçamento de tempo da geração.
+    """
+    if not config.busca_local or avaliador.vizinhos is None:
+        return
+    tam_elite = calcular_tamanho_elite(config.tam_populacao)
+    if config.busca_local == BUSCA_LOCAL_ELITE:
+        indices = range(min(config.busca_local_individuos, tam_elite))
+    else:
+        indices = range(tam_elite, min(tam_elite + config.busca_local_individuos, len(populacao)))
+    prazo = time.perf_counter() + config.busca_local_orcamento
+    with fase("busca_local"):
+        for i in indices:
+            if time.perf_counter() >= prazo:
+                break
+            populacao[i] = dois_opt(populacao[i], avaliador.tabelas, avaliador.vizinhos, avaliador.limites, config.peso_tempo, prazo)[0]
+
+
+
+def otimizar_melhor_solucao(
+    estado: EstadoGA,
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    orcamento: float,
+    posicoes: List[Tuple[int, int]] | None = None) -> float:
+    """
+    Aplica 2-opt + Or-opt (ver busca_local.melhorar_rota) à melhor solução final, antes do relatório.
+    Se a rota melhorar, estado.melhores_solucoes[-1] e estado.melhor_fitness são substituídos pela rota otimizada
+    (fitness recalculado sobre as tabelas). As listas de vizinhos do avaliador são usadas quando existem;
+    caso contrário são calculadas pelo índice espacial das posições das cidades.
+    Retorna a redução de fitness obtida (0 se não houve melhoria).
+    """
+    if not estado.melhores_solucoes or orcamento <= 0:
+        return 0.0
+    vizinhos = avaliador.vizinhos
+    if vizinhos is None:
+        if posicoes is None:
+            return 0.0
+        vizinhos = GradeEspacial(posicoes).vizinhos_proximos(BUSCA_LOCAL_VIZINHOS).tolist()
+    individuo, fitness_atual, _ = estado.melhores_solucoes[-1]
+    prazo = time.perf_counter() + orcamento
+    with fase("otimizacao_final"):
+        otimizado, _ = melhorar_rota(individuo, avaliador.tabelas, vizinhos, avaliador.limites, config.peso_tempo, prazo)
+    solucao = calcular_fitness_tabelas(avaliador.tabelas, otimizado, *avaliador.limites, config.peso_tempo)
+    if solucao[1] >= fitness_atual:
+        return 0.0
+    estado.melhores_solucoes[-1] = solucao
+    estado.melhor_fitness = min(estado.melhor_fitness, solucao[1])
+    return fitness_atual - solucao[1]
+
+
+
+def reproduzir(populacao_fitness: List[Tuple[array, float]], avaliador: AvaliadorGA, config: ConfiguracaoGA) -> List[array]:
+    """
+    Gera a população da próxima geração a partir da população ordenada:
+    1 - Elite: os 10% melhores indivíduos;
+    2 - Filhos do ERX, com pais selecionados por torneio;
+    3 - Mutantes: cada posição da metade inferior da população é, com probabilidade prob_mutacao, ocupada por um
+      mutante de um pai selecionado por torneio, em vez de um filho do ERX. Os filhos do ERX não são mutados:
+      a mutação parte de uma rota já avaliada para que os totais inteiros de tempo e custo do mutante sejam
+      os do pai (em cache) mais a variação das arestas alteradas (ver aplicar_mutacoes), e a avaliação da geração
+      os obtenha do cache sem percorrer a rota. Se o pai não estiver em cache (cache desativado, imigrante de
+      outra ilha), o mutante é avaliado normalmente;
+    """
+    tam_populacao = config.tam_populacao
+    num_mutantes = sum(random.random() < config.prob_mutacao for _ in range(tam_populacao - tam_populacao // 2))
+    tam_filhos = tam_populacao - num_mutantes
+
+    # ------------------------------------------------------------
+    # Implementação do algoritmo genético: seleção
+    # - Utiliza elitismo para iniciar a nova população com os 10% melhores resultados
+    # ------------------------------------------------------------
+    nova_populacao: List[array] = list(populacao_fitness[i][0] for i in range(calcular_tamanho_elite(tam_populacao)))
+    # Seleção e cruzamento se alternam no laço: as durações são somadas e registradas uma vez por geração
+    relogio = relogio_fases()
+    tempo_selecao = tempo_cruzamento = 0.0
+
+    # ------------------------------------------------------------
+    # Implementação do algoritmo genético: cruzamento
+    # - Utiliza toneiro para selecionar os pais;
+    # - Utiliza Edge Recombination Crossover (ERX) para gerar os filhos;
+    # ------------------------------------------------------------
+    while len(nova_populacao) < tam_filhos:
+        inicio = relogio()
+        p1 = selecao_por_torneio(populacao_fitness)
+        p2 = selecao_por_torneio(populacao_fitness)
+        meio = relogio()
+        if p1 is not None and p2 is not None:
+            nova_populacao.extend(edge_recombination_crossover(p1, p2))
+        tempo_selecao += meio - inicio
+        tempo_cruzamento += relogio() - meio
+    medidor = medidor_ativo()
+    if medidor is not None:
+        medidor.registrar("selecao", tempo_selecao)
+        medidor.registrar("cruzamento", tempo_cruzamento)
+    del nova_populacao[tam_filhos:]
+
+    # ------------------------------------------------------------
+    # Implementação do algoritmo genético: mutação
+    # - Completa a população com mutantes de pais selecionados por torneio, avaliados pelas arestas alteradas
+    # ------------------------------------------------------------
+    with fase("mutacao"):
+        for _ in range(num_mutantes):
+            pai = selecao_por_torneio(populacao_fitness)
+            mutante, delta_tempo, delta_custo = aplicar_mutacoes(pai, avaliador.tabelas)
+            totais_pai = avaliador.cache.consultar_totais(pai)
+            if totais_pai is not None:
+                avaliador.cache.armazenar(mutante, totais_pai[0] + delta_tempo, totais_pai[1] + delta_custo)
+            nova_populacao.append(mutante)
+
+    return nova_populacao
+
+
+
+def executar_ga(
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    populacao: List[array],
+    ao_final_da_geracao: Callable[[EstadoGA], bool] | None = None,
+    estado: EstadoGA | None = None) -> EstadoGA:
+    """
+    Executa o algoritmo genético até atingir o critério de parada.
+    - ao_final_da_geracao: chamada após a avaliação de cada geração (desenho, console, checkpoint, etc.);
+      retornar False interrompe a execução (parada manual);
+    - estado: estado de uma execução interrompida (ver checkpoint); a execução continua reproduzindo
+      estado.populacao_fitness, e populacao é ignorada. Um estado que já atingiu o critério de parada é retornado como está;
+    Retorna o estado final da execução.
+    """
+    if estado is None:
+        estado = EstadoGA(populacao)
+    elif estado.criterio_atingido:
+        return estado
+    else:
+        estado.populacao = reproduzir(estado.populacao_fitness, avaliador, config)
+        aplicar_busca_local(estado.populacao, avaliador, config)
+    while True:
+        populacao_fitness = avaliar_geracao(estado, avaliador, config)
+        estado.criterio_atingido = verificar_criterio_parada(estado, config)
+        continuar = ao_final_da_geracao(estado) if ao_final_da_geracao is not None else True
+        if estado.criterio_atingido or not continuar:
+            break
+        estado.populacao = reproduzir(populacao_fitness, avaliador, config)
+        aplicar_busca_local(estado.populacao, avaliador, config)
+    return estado
+
+
+
+def evoluir_geracoes(
+    estado: EstadoGA,
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    num_geracoes: int,
+    populacao_fitness: List[Tuple[array, float]] | None = None) -> List[Tuple[array, float]]:
+    """
+    Executa exatamente num_geracoes gerações a partir de um estado existente, sem verificar o critério de parada
+    (quem chama decide quando parar, ex.: o modelo de ilhas entre migrações).
+    - populacao_fitness: população avaliada e ordenada da última geração; se None, a primeira geração
+      avalia estado.populacao sem reproduzir (início da execução);
+    Retorna a população avaliada e ordenada da última geração executada.
+    """
+    for _ in range(num_geracoes):
+        if populacao_fitness is not None:
+            estado.populacao = reproduzir(populacao_fitness, avaliador, config)
+            aplicar_busca_local(estado.populacao, avaliador, config)
+        populacao_fitness = avaliar_geracao(estado, avaliador, config)
+    return populacao_fitness
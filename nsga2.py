@@ -0,0 +1,324 @@
+"""
+Modo multiobjetivo (NSGA-II): em vez de ponderar tempo e custo em um único fitness (peso_tempo),
+uma única execução evolui a frente de Pareto tempo x custo inteira.
+Cada geração: seleção por torneio binário (posição da frente e distância de aglomeração), ERX ou mutação
+(os mesmos operadores do modo ponderado, com os objetivos dos mutantes calculados pelas arestas alteradas), e sobrevivência elitista (μ + λ) dos melhores entre pais e filhos.
+A ordenação não-dominada e a distância de aglomeração são vetorizadas (NumPy): a matriz de dominância N x N
+é montada em O(MN²) e as frentes são removidas uma a uma somando linhas dessa matriz.
+Para manter a compatibilidade com o desenho, o console, o acervo e o relatório, o histórico de melhores soluções
+registra a solução de compromisso da geração (a de menor fitness ponderado por peso_tempo), e a convergência é
+medida pelo hipervolume da frente (gerações sem melhoria = gerações sem aumento do hipervolume).
+"""
+import random
+from array import array
+from io import BytesIO
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from algoritmos_geneticos import aplicar_mutacoes, calcular_totais_populacao, edge_recombination_crossover, obter_transportes, populacao_para_matriz
+from custos import TabelasArestas
+from instrumentacao import fase, medidor_ativo, relogio_fases
+from motor_ga import AvaliadorGA, ConfiguracaoGA, EstadoGA, verificar_criterio_parada
+from parametros import PROB_MUTACAO, REFERENCIA_HIPERVOLUME, TIPO_TRANSPORTE_MAP
+
+
+
+def calcular_objetivos(tabelas: TabelasArestas, populacao: Sequence[array]) -> np.ndarray:
+    """
+    Tempo e custo totais de cada indivíduo (matriz indivíduos x 2), sem normalizar nem ponderar
+    (ver algoritmos_geneticos.calcular_totais_populacao).
+    """
+    if len(populacao) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    return calcular_totais_populacao(tabelas, populacao_para_matriz(populacao))
+
+
+
+def ordenacao_nao_dominada(objetivos: np.ndarray) -> np.ndarray:
+    """
+    Posição (0 = frente de Pareto) de cada linha de objetivos (indivíduos x objetivos, menor é melhor):
+    1 - Monta a matriz de dominância (domina[i, j]: i é menor ou igual em todos os objetivos e menor em algum), O(MN²);
+    2 - Conta os dominadores de cada indivíduo; os que não têm nenhum formam a frente corrente;
+    3 - Remove a frente subtraindo suas linhas da contagem e repete até classificar todos;
+    """
+    n = len(objetivos)
+    menor_ou_igual = np.ones((n, n), dtype=bool)
+    menor = np.zeros((n, n), dtype=bool)
+    for coluna in objetivos.T:
+        menor_ou_igual &= coluna[:, None] <= coluna[None, :]
+        menor |= coluna[:, None] < coluna[None, :]
+    domina = menor_ou_igual & menor
+    dominadores = domina.sum(axis=0)
+    frentes = np.full(n, -1, dtype=np.int64)
+    atual = np.flatnonzero(dominadores == 0)
+    posicao = 0
+    while atual.size:
+        frentes[atual] = posicao
+        dominadores -= domina[atual].sum(axis=0)
+        dominadores[frentes >= 0] = -1
+        atual = np.flatnonzero(dominadores == 0)
+        posicao += 1
+    return frentes
+
+
+
+def distancia_aglomeracao(objetivos: np.ndarray, frentes: np.ndarray) -> np.ndarray:
+    """
+    Distância de aglomeração de cada indivíduo dentro da própria frente, calculada para todas as frentes de uma vez:
+    por objetivo, ordena por (frente, valor); os extremos de cada frente recebem infinito e os demais somam
+    a diferença entre os vizinhos, normalizada pela amplitude do objetivo na frente.
+    """
+    n = len(objetivos)
+    distancias = np.zeros(n)
+    if n == 0:
+        return distancias
+    indices = np.arange(n)
+    for coluna in objetivos.T:
+        ordem = np.lexsort((coluna, frentes))
+        valores = coluna[ordem].astype(np.float64)
+        frentes_ordenadas = frentes[ordem]
+        mudanca = frentes_ordenadas[1:] != frentes_ordenadas[:-1]
+        inicio = np.concatenate(([True], mudanca))
+        fim = np.concatenate((mudanca, [True]))
+        # Primeira e última posição da frente de cada elemento (na ordem ordenada)
+        primeiro = np.maximum.accumulate(np.where(inicio, indices, 0))
+        ultimo = np.minimum.accumulate(np.where(fim, indices, n - 1)[::-1])[::-1]
+        amplitude = valores[ultimo] - valores[primeiro]
+        diferenca = np.zeros(n)
+        diferenca[1:-1] = valores[2:] - valores[:-2]
+        interior = ~(inicio | fim) & (amplitude > 0)
+        distancias[ordem[interior]] += diferenca[interior] / amplitude[interior]
+        distancias[ordem[inicio | fim]] = np.inf
+    return distancias
+
+
+
+def selecao_por_torneio_binario(frentes: np.ndarray, aglomeracao: np.ndarray) -> int:
+    """
+    Torneio binário pelo operador de comparação de aglomeração: vence a menor frente e,
+    na mesma frente, a maior distância de aglomeração (região menos povoada).
+    Retorna o índice do vencedor.
+    """
+    a, b = random.sample(range(len(frentes)), 2)
+    if frentes[a] != frentes[b]:
+        return a if frentes[a] < frentes[b] else b
+    return a if aglomeracao[a] >= aglomeracao[b] else b
+
+
+
+def reproduzir_nsga2(
+    populacao: List[array],
+    objetivos: np.ndarray,
+    frentes: np.ndarray,
+    aglomeracao: np.ndarray,
+    tabelas: TabelasArestas,
+    tam_populacao: int,
+    prob_mutacao: float = PROB_MUTACAO) -> Tuple[List[array], np.ndarray]:
+    """
+    Gera tam_populacao filhos, com pais por torneio binário: cada filho é, com probabilidade prob_mutacao,
+    um mutante do pai (ver aplicar_mutacoes) e, caso contrário, um filho do ERX.
+    Os mutantes ficam no final da lista; seus objetivos são os do pai mais a variação das arestas alteradas.
+    Retorna os filhos e os objetivos dos mutantes (os dos filhos do ERX ficam a cargo de quem chama).
+    """
+    num_mutantes = sum(random.random() < prob_mutacao for _ in range(tam_populacao))
+    tam_filhos = tam_populacao - num_mutantes
+    filhos: List[array] = []
+    # Seleção e cruzamento se alternam no laço: as durações são somadas e registradas uma vez por geração
+    relogio = relogio_fases()
+    tempo_selecao = tempo_cruzamento = 0.0
+    while len(filhos) < tam_filhos:
+        inicio = relogio()
+        p1 = populacao[selecao_por_torneio_binario(frentes, aglomeracao)]
+        p2 = populacao[selecao_por_torneio_binario(frentes, aglomeracao)]
+        meio = relogio()
+        filhos.extend(edge_recombination_crossover(p1, p2))
+        tempo_selecao += meio - inicio
+        tempo_cruzamento += relogio() - meio
+    medidor = medidor_ativo()
+    if medidor is not None:
+        medidor.registrar("selecao", tempo_selecao)
+        medidor.registrar("cruzamento", tempo_cruzamento)
+    del filhos[tam_filhos:]
+    objetivos_mutantes = np.empty((num_mutantes, 2), dtype=objetivos.dtype)
+    with fase("mutacao"):
+        for k in range(num_mutantes):
+            pai = selecao_por_torneio_binario(frentes, aglomeracao)
+            mutante, delta_tempo, delta_custo = aplicar_mutacoes(populacao[pai], tabelas)
+            filhos.append(mutante)
+            objetivos_mutantes[k] = objetivos[pai, 0] + delta_tempo, objetivos[pai, 1] + delta_custo
+    return filhos, objetivos_mutantes
+
+
+
+def selecionar_sobreviventes(populacao: List[array], objetivos: np.ndarray, tam_populacao: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sobrevivência elitista do NSGA-II sobre a união de pais e filhos: frentes completas em ordem e,
+    na última frente que não cabe inteira, os de maior distância de aglomeração.
+    Rotas repetidas entram apenas uma vez (as cópias só completam a população se faltarem rotas distintas,
+    em uma frente após as demais).
+    Retorna os índices dos sobreviventes, na ordem (frente, -aglomeração), e a frente de cada um: remover as piores
+    frentes (e parte da última) não muda a posição das que ficam, então a ordenação não precisa ser refeita.
+    """
+    _, primeiros = np.unique(populacao_para_matriz(populacao), axis=0, return_index=True)
+    distintos = np.sort(primeiros)
+    frentes = ordenacao_nao_dominada(objetivos[distintos])
+    aglomeracao = distancia_aglomeracao(objetivos[distintos], frentes)
+    ordem = np.lexsort((-aglomeracao, frentes))
+    sobreviventes = distintos[ordem]
+    frentes = frentes[ordem]
+    if len(sobreviventes) < tam_populacao:
+        copias = np.setdiff1d(np.arange(len(populacao)), distintos)
+        sobreviventes = np.concatenate((sobreviventes, copias))
+        frentes = np.concatenate((frentes, np.full(len(copias), frentes.max() + 1)))
+    return sobreviventes[:tam_populacao], frentes[:tam_populacao]
+
+
+
+def calcular_hipervolume(objetivos_normalizados: np.ndarray, referencia: float = REFERENCIA_HIPERVOLUME) -> float:
+    """
+    Hipervolume (área dominada) de um conjunto de pontos 2-D normalizados até o ponto de referência (referencia, referencia).
+    Pontos fora da caixa de referência não contribuem.
+    """
+    pontos = objetivos_normalizados[(objetivos_normalizados < referencia).all(axis=1)]
+    if len(pontos) == 0:
+        return 0.0
+    pontos = pontos[np.lexsort((pontos[:, 1], pontos[:, 0]))]
+    # Percorrendo em ordem crescente do primeiro objetivo, só contam os pontos que melhoram o segundo
+    melhor_segundo = np.minimum.accumulate(pontos[:, 1])
+    nao_dominados = np.concatenate(([True], melhor_segundo[1:] < melhor_segundo[:-1]))
+    x = pontos[nao_dominados, 0]
+    y = pontos[nao_dominados, 1]
+    larguras = np.append(x[1:], referencia) - x
+    return float((larguras * (referencia - y)).sum())
+
+
+
+def normalizar_objetivos(objetivos: np.ndarray, limites: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Normaliza tempo e custo totais pelos limites estimados (ver calcular_limites_estimados), como no fitness ponderado.
+    """
+    tempo_min, tempo_max, custo_min, custo_max = limites
+    return np.column_stack((
+        (objetivos[:, 0] - tempo_min) / (tempo_max - tempo_min),
+        (objetivos[:, 1] - custo_min) / (custo_max - custo_min)))
+
+
+
+def registrar_geracao_nsga2(
+    estado: EstadoGA,
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    objetivos: np.ndarray,
+    frentes: np.ndarray,
+    melhor_hipervolume: float) -> float:
+    """
+    Registra a geração corrente no estado:
+    - frente_pareto: rotas da frente 0 com tempo e custo totais (uma rota por par tempo/custo), em ordem crescente de tempo;
+    - populacao_fitness e melhores_solucoes: população ordenada pelo fitness ponderado e a solução de compromisso;
+    - geracoes_sem_melhoria: zerado quando o hipervolume da frente aumenta;
+    Retorna o maior hipervolume até a geração corrente.
+    """
+    normalizados = normalizar_objetivos(objetivos, avaliador.limites)
+    fitness = normalizados[:, 0] * config.peso_tempo + normalizados[:, 1] * (1 - config.peso_tempo)
+    ordem = np.argsort(fitness, kind="stable")
+    estado.populacao_fitness = [(estado.populacao[i], float(fitness[i])) for i in ordem]
+    melhor_individuo, melhor_fitness = estado.populacao_fitness[0]
+    estado.melhores_solucoes.append((melhor_individuo, melhor_fitness, obter_transportes(avaliador.tabelas, melhor_individuo)))
+    estado.melhor_fitness = min(estado.melhor_fitness, melhor_fitness)
+
+    na_frente = np.flatnonzero(frentes == 0)
+    _, distintos = np.unique(objetivos[na_frente], axis=0, return_index=True)
+    na_frente = na_frente[distintos]
+    na_frente = na_frente[np.lexsort((objetivos[na_frente, 1], objetivos[na_frente, 0]))]
+    estado.frente_pareto = [(estado.populacao[i], int(objetivos[i, 0]), int(objetivos[i, 1])) for i in na_frente]
+
+    hipervolume = calcular_hipervolume(normalizados[na_frente])
+    if hipervolume > melhor_hipervolume:
+        estado.geracoes_sem_melhoria = 0
+        return hipervolume
+    estado.geracoes_sem_melhoria += 1
+    return melhor_hipervolume
+
+
+
+def executar_nsga2(
+    avaliador: AvaliadorGA,
+    config: ConfiguracaoGA,
+    populacao: List[array],
+    ao_final_da_geracao: Callable[[EstadoGA], bool] | None = None) -> EstadoGA:
+    """
+    Executa o NSGA-II até atingir o critério de parada (mesmos critérios de executar_ga, com a convergência
+    medida pelo hipervolume da frente). A busca local e a avaliação paralela não são usadas neste modo.
+    - ao_final_da_geracao: chamada após o registro de cada geração; retornar False interrompe a execução;
+    Retorna o estado final, com a frente de Pareto em estado.frente_pareto.
+    """
+    estado = EstadoGA(populacao)
+    with fase("avaliacao"):
+        objetivos = calcular_objetivos(avaliador.tabelas, populacao)
+    with fase("ordenacao"):
+        frentes = ordenacao_nao_dominada(objetivos)
+        aglomeracao = distancia_aglomeracao(objetivos, frentes)
+    melhor_hipervolume = -1.0
+    while True:
+        estado.geracao += 1
+        melhor_hipervolume = registrar_geracao_nsga2(estado, avaliador, config, objetivos, frentes, melhor_hipervolume)
+        estado.criterio_atingido = verificar_criterio_parada(estado, config)
+        continuar = ao_final_da_geracao(estado) if ao_final_da_geracao is not None else True
+        if estado.criterio_atingido or not continuar:
+            break
+        filhos, objetivos_mutantes = reproduzir_nsga2(
+            estado.populacao, objetivos, frentes, aglomeracao, avaliador.tabelas, config.tam_populacao, config.prob_mutacao)
+        with fase("avaliacao"):
+            uniao = estado.populacao + filhos
+            filhos_erx = filhos[:len(filhos) - len(objetivos_mutantes)]
+            objetivos_uniao = np.concatenate((objetivos, calcular_objetivos(avaliador.tabelas, filhos_erx), objetivos_mutantes))
+        with fase("ordenacao"):
+            sobreviventes, frentes = selecionar_sobreviventes(uniao, objetivos_uniao, config.tam_populacao)
+            estado.populacao = [uniao[i] for i in sobreviventes]
+            objetivos = objetivos_uniao[sobreviventes]
+            aglomeracao = distancia_aglomeracao(objetivos, frentes)
+    return estado
+
+
+
+def frente_para_dicionarios(tabelas: TabelasArestas, frente: Sequence[Tuple[array, int, int]]) -> List[Dict]:
+    """
+    Frente de Pareto serializável: tempo e custo totais, rota e transportes de cada ponto.
+    """
+    return [
+        {"tempo": tempo, "custo": custo, "trajeto": list(rota), "transportes": [TIPO_TRANSPORTE_MAP[t] for t in obter_transportes(tabelas, rota)]}
+        for rota, tempo, custo in frente]
+
+
+
+def grafico_frente_pareto(
+    frente: Sequence[Tuple[array, int, int]],
+    compromisso: Tuple[int, int] | None = None,
+    caminho: str | None = None) -> bytes:
+    """
+    Desenha a frente de Pareto (tempo x custo) com matplotlib, sem janela, destacando a solução de compromisso (se houver).
+    Grava o PNG em caminho (se informado) e retorna os bytes da imagem (ex.: para o relatório PDF).
+    """
+    figura = Figure(figsize=(6, 4), dpi=100)
+    FigureCanvasAgg(figura)
+    eixo = figura.add_subplot(111)
+    tempos = [tempo for _, tempo, _ in frente]
+    custos = [custo for _, _, custo in frente]
+    eixo.step(tempos, custos, where="post", color="#1d3557", alpha=0.4)
+    eixo.scatter(tempos, custos, color="#1d3557", s=18, label=f"Frente de Pareto ({len(frente)} rotas)")
+    if compromisso is not None:
+        eixo.scatter([compromisso[0]], [compromisso[1]], color="#e63946", s=60, marker="*", label="Solução de compromisso")
+    eixo.set_xlabel("Tempo total")
+    eixo.set_ylabel("Custo total")
+    eixo.grid(True, alpha=0.3)
+    eixo.legend()
+    figura.tight_layout()
+    imagem = BytesIO()
+    figura.savefig(imagem, format="png")
+    if caminho:
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(imagem.getvalue())
+    return imagem.getvalue()
@@ -1,17 +1,22 @@
 # Constantes/macros de configuração
 MIN_CIDADES = 5
-MAX_CIDADES = 25
+MAX_CIDADES = 5000
+MAX_CIDADES_IMPRESSAO = 25
 MIN_POPULACAO = 25
-MAX_POPULACAO = 100
+MAX_POPULACAO = 5000
 MIN_MAX_GERACOES = 100
 MAX_MAX_GERACOES = 10000
 MIN_GERACOES_SEM_MELHORIA = 100
 MAX_GERACOES_SEM_MELHORIA = 5000
+CRITERIO_PARADA_MAX_GERACOES = 1
+CRITERIO_PARADA_CONVERGENCIA = 2
+CRITERIO_PARADA_AMBOS = 3
 LIM_CARRO_ELETRICO = 120
 TIPO_TRANSPORTE_AVIAO = 1
 TIPO_TRANSPORTE_TREM = 2
 TIPO_TRANSPORTE_CARRO_ELETRICO = 3
 TIPO_TRANSPORTE_CAMINHAO = 4
+TIPO_GENOMA = "H" # array de inteiros sem sinal de 16 bits (até 65535 cidades)
 
 # Mapeamento de tipos de transporte (ID -> Nome)
 TIPO_TRANSPORTE_MAP = {
@@ -23,6 +28,51 @@ TIPO_TRANSPORTE_MAP = {
 
 PESO_TEMPO = 0.3
 PROB_MUTACAO = 0.5
+TAM_CACHE_FITNESS = 10000 # rotas distintas mantidas no cache de fitness (0 desativa)
+
+# Constantes/macros do modo memético (busca local 2-opt aplicada a cada geração)
+BUSCA_LOCAL_DESATIVADA = ""
+BUSCA_LOCAL_ELITE = "elite" # aplica aos indivíduos da elite
+BUSCA_LOCAL_FILHOS = "filhos" # aplica aos primeiros filhos gerados por cruzamento
+MODOS_BUSCA_LOCAL = (BUSCA_LOCAL_ELITE, BUSCA_LOCAL_FILHOS)
+BUSCA_LOCAL_INDIVIDUOS = 4 # indivíduos otimizados por geração
+BUSCA_LOCAL_ORCAMENTO = 0.05 # segundos de busca local por geração
+BUSCA_LOCAL_VIZINHOS = 8 # tamanho das listas de vizinhos mais próximos
+COMPRIMENTO_MAX_OR_OPT = 3 # maior segmento realocado pelo Or-opt (acima de 3: 3-opt de realocação de segmentos)
+ORCAMENTO_OTIMIZACAO_FINAL = 5.0 # segundos de 2-opt + Or-opt aplicados à melhor solução final (--otimizar-final sem valor)
+
+# Constantes/macros da população inicial (heurísticas construtivas misturadas a rotas aleatórias)
+POPULACAO_ALEATORIA = "aleatoria"
+POPULACAO_MISTA = "mista" # todas as heurísticas em partes iguais, mais as rotas aleatórias
+PROPORCAO_ALEATORIA = 0.5 # fração de rotas aleatórias nas populações heurísticas (diversidade)
+PROB_SEGUNDO_VIZINHO = 0.1 # vizinho mais próximo: chance de seguir para o segundo mais próximo
+RUIDO_ARESTAS_GULOSAS = 0.2 # arestas gulosas: ruído relativo máximo nos comprimentos das arestas
+VIZINHOS_CONSTRUCAO = 8 # cidades próximas consultadas por passo (arestas candidatas / posições de inserção)
+PONTOS_POR_CELULA = 2 # ocupação média das células do índice espacial em grade
+
+# Constantes/macros do modelo de ilhas (populações independentes em processos paralelos)
+NUM_ILHAS = 1 # 1 desativa o modelo de ilhas
+MAX_ILHAS = 256
+INTERVALO_MIGRACAO = 20 # gerações entre migrações
+NUM_MIGRANTES = 2 # melhores indivíduos enviados por ilha em cada migração
+TOPOLOGIA_ANEL = "anel" # cada ilha envia para a próxima
+TOPOLOGIA_COMPLETA = "completa" # cada ilha recebe os melhores migrantes de todas as outras
+TOPOLOGIAS_MIGRACAO = (TOPOLOGIA_ANEL, TOPOLOGIA_COMPLETA)
+
+# Constantes/macros da avaliação paralela de fitness (pool de processos com memória compartilhada)
+MAX_PROCESSOS_AVALIACAO = 256 # 0 desativa a avaliação paralela
+MIN_INDIVIDUOS_POR_PROCESSO = 64 # lotes menores são avaliados no processo principal
+
+# Constantes/macros do acervo de soluções (melhores rotas de execuções anteriores, por cenário)
+ROTAS_POR_CENARIO_ACERVO = 10 # rotas distintas mantidas por cenário
+MAX_CENARIOS_ACERVO = 100 # cenários mantidos (os usados há mais tempo são descartados)
+PROPORCAO_ACERVO = 0.2 # fração máxima da população inicial semeada com rotas do acervo
+
+# Constantes/macros do modo multiobjetivo (NSGA-II: frente de Pareto tempo x custo)
+REFERENCIA_HIPERVOLUME = 1.1 # ponto de referência (tempo e custo normalizados) do hipervolume usado na convergência
+
+# Constantes/macros de checkpoint (gravação periódica do estado da execução para retomada)
+INTERVALO_CHECKPOINT = 30.0 # segundos entre checkpoints
 
 # Constantes/macros de velocidade média dos transportes (em pixels por unidade de tempo)
 VELOC_AVIAO = 250 # 50 V/C
@@ -53,6 +103,7 @@ ESPESSURA_CARRO_ELETRICO = 2
 ESPESSURA_CAMINHAO = 3
 RAIO = 7
 FPS = 30
+PROPORCAO_MAX_RENDERIZACAO = 0.25 # fração máxima do tempo de execução gasta desenhando (modo limitado)
 
 # LLM
 LLM_MAX_OUTPUT_TOKENS = 3500
@@ -0,0 +1,301 @@
+"""
+Geração da população inicial por heurísticas construtivas sobre as posições das cidades:
+vizinho mais próximo, arestas gulosas, inserção mais barata, inserção mais distante e envoltória convexa,
+misturadas a rotas aleatórias na proporção desejada.
+Todas as heurísticas são aleatorizadas (cidade inicial, ordem de inserção, ruído nos comprimentos) para que a população
+não seja formada por cópias da mesma rota, e usam o índice espacial em grade (ver indice_espacial) em vez de
+percorrer todas as cidades a cada passo, de modo que cada rota é construída em tempo subquadrático.
+As rotas são listas de índices de cidades (0..n-1), usadas pelos dois algoritmos genéticos
+(multimodal, via algoritmos_geneticos.criar_individuo, e o baseado em coordenadas do tsp.py).
+"""
+import math
+import random
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from indice_espacial import GradeEspacial
+from parametros import (
+    POPULACAO_ALEATORIA,
+    POPULACAO_MISTA,
+    PROB_SEGUNDO_VIZINHO,
+    RUIDO_ARESTAS_GULOSAS,
+    VIZINHOS_CONSTRUCAO,
+)
+
+Posicoes = Sequence[Tuple[float, float]]
+
+
+def rota_aleatoria(posicoes: Posicoes, _indice: GradeEspacial) -> List[int]:
+    """
+    Permutação aleatória das cidades.
+    """
+    return random.sample(range(len(posicoes)), len(posicoes))
+
+
+
+def rota_vizinho_mais_proximo(posicoes: Posicoes, indice: GradeEspacial) -> List[int]:
+    """
+    Vizinho mais próximo aleatorizado: parte de uma cidade aleatória e segue para a cidade não visitada mais próxima
+    (com probabilidade PROB_SEGUNDO_VIZINHO, para a segunda mais próxima).
+    """
+    n = len(posicoes)
+    for i in range(n):
+        indice.inserir(i)
+    atual = random.randrange(n)
+    indice.remover(atual)
+    rota = [atual]
+    while len(indice):
+        candidatos = indice.mais_proximos(posicoes[atual], 2 if random.random() < PROB_SEGUNDO_VIZINHO else 1)
+        atual = candidatos[-1]
+        indice.remover(atual)
+        rota.append(atual)
+    return rota
+
+
+
+def _unir_fragmentos(posicoes: Posicoes, indice: GradeEspacial, fragmentos: List[List[int]]) -> List[int]:
+    """
+    Une caminhos disjuntos em uma rota: a partir de um fragmento aleatório, liga repetidamente o fim da rota
+    à extremidade livre mais próxima de outro fragmento (percorrido a partir dessa extremidade).
+    """
+    fragmento_da_extremidade: Dict[int, int] = {}
+    for f, fragmento in enumerate(fragmentos):
+        fragmento_da_extremidade[fragmento[0]] = f
+        fragmento_da_extremidade[fragmento[-1]] = f
+    for extremidade in fragmento_da_extremidade:
+        indice.inserir(extremidade)
+
+    atual = random.randrange(len(fragmentos))
+    rota: List[int] = []
+    while True:
+        fragmento = fragmentos[atual]
+        indice.remover(fragmento[0])
+        indice.remover(fragmento[-1])
+        rota.extend(fragmento)
+        if not len(indice):
+            return rota
+        extremidade = indice.mais_proximo(posicoes[rota[-1]])
+        atual = fragmento_da_extremidade[extremidade]
+        if fragmentos[atual][0] != extremidade:
+            fragmentos[atual].reverse()
+
+
+
+def rota_arestas_gulosas(posicoes: Posicoes, indice: GradeEspacial) -> List[int]:
+    """
+    Arestas gulosas (greedy edge): considera as arestas candidatas entre cada cidade e seus VIZINHOS_CONSTRUCAO
+    vizinhos mais próximos, da mais curta para a mais longa (com ruído relativo de até RUIDO_ARESTAS_GULOSAS),
+    aceitando cada aresta que não dá a uma cidade grau 3 nem fecha um ciclo; os caminhos resultantes
+    são unidos pela extremidade mais próxima.
+    """
+    n = len(posicoes)
+    for i in range(n):
+        indice.inserir(i)
+    candidatos = indice.vizinhos_proximos(VIZINHOS_CONSTRUCAO).tolist()
+    for i in range(n):
+        indice.remover(i)
+    arestas = []
+    for i in range(n):
+        xi, yi = posicoes[i]
+        for j in candidatos[i]:
+            if i < j:
+                xj, yj = posicoes[j]
+                arestas.append((math.hypot(xi - xj, yi - yj) * (1 + RUIDO_ARESTAS_GULOSAS * random.random()), i, j))
+    arestas.sort()
+
+    # Union-find com compressão de caminho para detectar ciclos
+    pai = list(range(n))
+
+    def raiz(i: int) -> int:
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    grau = bytearray(n)
+    adjacentes: List[List[int]] = [[] for _ in range(n)]
+    for _, i, j in arestas:
+        if grau[i] < 2 and grau[j] < 2:
+            raiz_i, raiz_j = raiz(i), raiz(j)
+            if raiz_i != raiz_j:
+                pai[raiz_i] = raiz_j
+                grau[i] += 1
+                grau[j] += 1
+                adjacentes[i].append(j)
+                adjacentes[j].append(i)
+
+    # Percorre cada caminho a partir de uma extremidade (grau 0 ou 1)
+    visitado = bytearray(n)
+    fragmentos: List[List[int]] = []
+    for inicio in range(n):
+        if visitado[inicio] or grau[inicio] == 2:
+            continue
+        fragmento = [inicio]
+        visitado[inicio] = 1
+        anterior, atual = -1, inicio
+        while True:
+            proximos = [c for c in adjacentes[atual] if c != anterior]
+            if not proximos:
+                break
+            anterior, atual = atual, proximos[0]
+            visitado[atual] = 1
+            fragmento.append(atual)
+        fragmentos.append(fragmento)
+    return _unir_fragmentos(posicoes, indice, fragmentos)
+
+
+
+def _inserir_cidades(posicoes: Posicoes, indice: GradeEspacial, rota_inicial: List[int], ordem: List[int]) -> List[int]:
+    """
+    Insere as cidades de ordem, uma a uma, na posição mais barata (menor acréscimo de distância) da rota parcial.
+    As posições candidatas são as arestas que tocam as VIZINHOS_CONSTRUCAO cidades já inseridas mais próximas
+    da cidade, em vez de todas as arestas da rota. A rota parcial é uma lista duplamente ligada (sucessor/antecessor).
+    """
+    n = len(posicoes)
+    sucessor = [-1] * n
+    antecessor = [-1] * n
+    for p, cidade in enumerate(rota_inicial):
+        sucessor[cidade] = rota_inicial[(p + 1) % len(rota_inicial)]
+        antecessor[sucessor[cidade]] = cidade
+        indice.inserir(cidade)
+
+    def distancia(a: int, b: int) -> float:
+        return math.dist(posicoes[a], posicoes[b])
+
+    for cidade in ordem:
+        melhor_acrescimo, melhor_a = float('inf'), -1
+        for t in indice.mais_proximos(posicoes[cidade], VIZINHOS_CONSTRUCAO):
+            for a in (antecessor[t], t):
+                b = sucessor[a]
+                acrescimo = distancia(a, cidade) + distancia(cidade, b) - distancia(a, b)
+                if acrescimo < melhor_acrescimo:
+                    melhor_acrescimo, melhor_a = acrescimo, a
+        b = sucessor[melhor_a]
+        sucessor[melhor_a], antecessor[cidade] = cidade, melhor_a
+        sucessor[cidade], antecessor[b] = b, cidade
+        indice.inserir(cidade)
+
+    for cidade in rota_inicial + ordem:
+        indice.remover(cidade)
+    rota = [rota_inicial[0]]
+    for _ in range(n - 1):
+        rota.append(sucessor[rota[-1]])
+    return rota
+
+
+
+def rota_insercao_mais_barata(posicoes: Posicoes, indice: GradeEspacial) -> List[int]:
+    """
+    Inserção mais barata aleatorizada: parte de três cidades aleatórias e insere as demais, em ordem aleatória,
+    na posição de menor acréscimo de distância.
+    (A escolha global da próxima cidade da inserção mais barata clássica é quadrática; aqui a ordem é aleatória
+    e apenas a posição é escolhida pelo menor acréscimo.)
+    """
+    cidades = random.sample(range(len(posicoes)), len(posicoes))
+    return _inserir_cidades(posicoes, indice, cidades[:3], cidades[3:])
+
+
+
+def rota_insercao_mais_distante(posicoes: Posicoes, indice: GradeEspacial) -> List[int]:
+    """
+    Inserção mais distante: as cidades são inseridas de fora para dentro, em ordem decrescente de distância
+    ao centro das cidades (com ruído), cada uma na posição de menor acréscimo de distância.
+    Assim como na inserção mais distante clássica, o contorno da rota é definido primeiro e o interior depois.
+    """
+    n = len(posicoes)
+    centro_x = sum(x for x, _ in posicoes) / n
+    centro_y = sum(y for _, y in posicoes) / n
+    ordem = sorted(range(n), key=lambda i: -math.hypot(posicoes[i][0] - centro_x, posicoes[i][1] - centro_y) * (0.5 + random.random()))
+    return _inserir_cidades(posicoes, indice, ordem[:3], ordem[3:])
+
+
+
+def envoltoria_convexa(posicoes: Posicoes) -> List[int]:
+    """
+    Índices das cidades da envoltória convexa em sentido anti-horário (cadeia monótona de Andrew, O(n log n)).
+    """
+    pontos = sorted(range(len(posicoes)), key=lambda i: posicoes[i])
+
+    def giro(o: int, a: int, b: int) -> float:
+        (ox, oy), (ax, ay), (bx, by) = posicoes[o], posicoes[a], posicoes[b]
+        return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+    inferior: List[int] = []
+    for i in pontos:
+        while len(inferior) >= 2 and giro(inferior[-2], inferior[-1], i) <= 0:
+            inferior.pop()
+        inferior.append(i)
+    superior: List[int] = []
+    for i in reversed(pontos):
+        while len(superior) >= 2 and giro(superior[-2], superior[-1], i) <= 0:
+            superior.pop()
+        superior.append(i)
+    return inferior[:-1] + superior[:-1]
+
+
+
+def rota_envoltoria_convexa(posicoes: Posicoes, indice: GradeEspacial) -> List[int]:
+    """
+    Inserção a partir da envoltória convexa: a rota parcial começa com a envoltória convexa das cidades
+    e as cidades interiores são inseridas, em ordem aleatória, na posição de menor acréscimo de distância.
+    """
+    contorno = envoltoria_convexa(posicoes)
+    if len(contorno) < 3:
+        return rota_insercao_mais_barata(posicoes, indice)
+    no_contorno = set(contorno)
+    interiores = [i for i in range(len(posicoes)) if i not in no_contorno]
+    random.shuffle(interiores)
+    return _inserir_cidades(posicoes, indice, contorno, interiores)
+
+
+
+CONSTRUTORES_ROTA: Dict[str, Callable[[Posicoes, GradeEspacial], List[int]]] = {
+    POPULACAO_ALEATORIA: rota_aleatoria,
+    "vizinho_mais_proximo": rota_vizinho_mais_proximo,
+    "arestas_gulosas": rota_arestas_gulosas,
+    "insercao_mais_barata": rota_insercao_mais_barata,
+    "insercao_mais_distante": rota_insercao_mais_distante,
+    "envoltoria_convexa": rota_envoltoria_convexa,
+}
+METODOS_POPULACAO_INICIAL = (*CONSTRUTORES_ROTA, POPULACAO_MISTA)
+
+
+
+def composicao_populacao(metodo: str, proporcao_aleatoria: float) -> Dict[str, float]:
+    """
+    Proporção de cada construtor na população para o método escolhido:
+    - POPULACAO_ALEATORIA: apenas rotas aleatórias;
+    - um construtor heurístico: esse construtor, completado com proporcao_aleatoria de rotas aleatórias;
+    - POPULACAO_MISTA: todos os construtores heurísticos em partes iguais, mais proporcao_aleatoria de rotas aleatórias;
+    """
+    if metodo not in METODOS_POPULACAO_INICIAL:
+        raise ValueError(f"Método de população inicial inválido: {metodo!r} (esperado {', '.join(METODOS_POPULACAO_INICIAL)})")
+    if metodo == POPULACAO_ALEATORIA:
+        return {POPULACAO_ALEATORIA: 1.0}
+    heuristicos = [nome for nome in CONSTRUTORES_ROTA if nome != POPULACAO_ALEATORIA] if metodo == POPULACAO_MISTA else [metodo]
+    composicao = {nome: (1 - proporcao_aleatoria) / len(heuristicos) for nome in heuristicos}
+    composicao[POPULACAO_ALEATORIA] = proporcao_aleatoria
+    return composicao
+
+
+
+def gerar_populacao_inicial(posicoes: Posicoes, tamanho_populacao: int, composicao: Dict[str, float]) -> List[List[int]]:
+    """
+    Gera tamanho_populacao rotas (listas de índices) com a composição informada (construtor -> proporção).
+    As quantidades são arredondadas pelo método dos maiores restos, somando exatamente tamanho_populacao;
+    as rotas heurísticas vêm primeiro. Com menos de 4 cidades todas as rotas são aleatórias.
+    """
+    if len(posicoes) < 4:
+        composicao = {POPULACAO_ALEATORIA: 1.0}
+    total = sum(composicao.values())
+    cotas = {nome: tamanho_populacao * proporcao / total for nome, proporcao in composicao.items()}
+    quantidades = {nome: int(cota) for nome, cota in cotas.items()}
+    restantes = sorted(cotas, key=lambda nome: cotas[nome] - quantidades[nome], reverse=True)
+    for nome in restantes[:tamanho_populacao - sum(quantidades.values())]:
+        quantidades[nome] += 1
+
+    indice = GradeEspacial(posicoes, ativos=False)
+    populacao: List[List[int]] = []
+    for nome in sorted(quantidades, key=lambda nome: nome == POPULACAO_ALEATORIA):
+        construtor = CONSTRUTORES_ROTA[nome]
+        populacao.extend(construtor(posicoes, indice) for _ in range(quantidades[nome]))
+    return populacao
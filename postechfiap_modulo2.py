@@ -1,25 +1,38 @@
-import math
+import argparse
 import os
 import random
+import sys
 import time
-from operator import itemgetter
-from typing import List, Tuple
-
-import pygame
-
-from algoritmos_geneticos import (
-    aplicar_mutacoes,
-    calcular_fitness_prioridade_tempo,
-    calcular_limites_estimados,
-    edge_recombination_crossover,
-    populacao_inicial_aleatoria,
-    selecao_por_torneio,
+from array import array
+from typing import List
+
+from acervo_solucoes import AcervoSolucoes, impressao_digital_cenario, rotas_iniciais_acervo
+from algoritmos_geneticos import criar_individuo
+from checkpoint import GravadorCheckpoint, acompanhar_com_gravador, carregar_checkpoint
+from cenario import (
+    Cenario,
+    calcular_matriz_distancias,
+    calcular_qtd_rotas_aviao,
+    calcular_qtd_rotas_trem,
+    carregar_cenario,
+    gerar_cidades,
+    gerar_matriz_aviao,
+    gerar_matriz_trem,
+    salvar_cenario,
 )
-from draw_functions import draw_cities, draw_paths, draw_plot
+from ilhas import ConfiguracaoIlhas, executar_ilhas
+from instrumentacao import ativar_medicao, desativar_medicao, exportar_resumo_fases
+from modo_lote import carregar_configuracao_lote, executar_lote, salvar_resultado_json
+from motor_ga import ConfiguracaoGA, criar_avaliador, executar_ga, otimizar_melhor_solucao
+from nsga2 import calcular_objetivos, executar_nsga2, frente_para_dicionarios, grafico_frente_pareto
 from parametros import (
     ALTURA_TELA,
-    COR_BRANCO,
-    FPS,
+    BUSCA_LOCAL_DESATIVADA,
+    BUSCA_LOCAL_INDIVIDUOS,
+    BUSCA_LOCAL_ORCAMENTO,
+    BUSCA_LOCAL_VIZINHOS,
+    INTERVALO_CHECKPOINT,
+    INTERVALO_MIGRACAO,
     LARGURA_TELA,
     MARGEM,
     MAX_CIDADES,
@@ -30,19 +43,193 @@ from parametros import (
     MIN_GERACOES_SEM_MELHORIA,
     MIN_MAX_GERACOES,
     MIN_POPULACAO,
+    MODOS_BUSCA_LOCAL,
+    NUM_MIGRANTES,
     OFFSET_X_GRAFICO,
+    ORCAMENTO_OTIMIZACAO_FINAL,
+    PESO_TEMPO,
+    POPULACAO_ALEATORIA,
+    POPULACAO_MISTA,
+    PROPORCAO_ACERVO,
+    PROPORCAO_ALEATORIA,
+    PROB_MUTACAO,
+    TOPOLOGIA_ANEL,
+    TOPOLOGIAS_MIGRACAO,
 )
-from relatorio import gerar_relatorio_pdf
+from populacao_inicial import METODOS_POPULACAO_INICIAL, composicao_populacao, gerar_populacao_inicial
+from tsplib import calcular_matriz_tsplib, ler_instancia, posicoes_tela
 from utils import (
     imprimir_matriz,
     indice_para_letra,
     ler_inteiro_positivo,
     limpar_console,
+    trajeto_para_letras,
 )
 
+# Opções do passo 7 (geração da população inicial): método (ver populacao_inicial) e descrição
+OPCOES_POPULACAO_INICIAL = [
+    (POPULACAO_ALEATORIA, "Aleatória"),
+    ("vizinho_mais_proximo", "Vizinho mais próximo (aleatorizado) + aleatória"),
+    ("arestas_gulosas", "Arestas gulosas + aleatória"),
+    ("insercao_mais_barata", "Inserção mais barata + aleatória"),
+    ("insercao_mais_distante", "Inserção mais distante + aleatória"),
+    ("envoltoria_convexa", "Envoltória convexa com inserção + aleatória"),
+    (POPULACAO_MISTA, "Mista (todas as heurísticas + aleatória)"),
+]
+
+
+
+def ler_argumentos() -> argparse.Namespace:
+    """
+    Lê os argumentos de linha de comando. Sem --lote, o programa segue o fluxo interativo com pygame.
+    """
+    parser = argparse.ArgumentParser(description="TSP multimodal com algoritmo genético")
+    parser.add_argument("--lote", "--headless", action="store_true", help="executa sem interação, sem pygame e grava o resultado em JSON")
+    parser.add_argument("--config", help="arquivo JSON com os parâmetros da execução em lote")
+    parser.add_argument("--cidades", type=int, help="número de cidades")
+    parser.add_argument("--perc-aviao", type=int, help="percentual de rotas possíveis de avião")
+    parser.add_argument("--perc-trem", type=int, help="percentual de rotas possíveis de trem")
+    parser.add_argument("--populacao", type=int, help="tamanho da população")
+    parser.add_argument("--criterio-parada", type=int, choices=[1, 2, 3], help="1 - máx. gerações, 2 - convergência, 3 - ambos")
+    parser.add_argument("--max-geracoes", type=int, help="número máximo de gerações")
+    parser.add_argument("--max-geracoes-sem-melhoria", type=int, help="número máximo de gerações sem melhoria")
+    parser.add_argument("--peso-tempo", type=float, help="peso do tempo no fitness (0 a 1)")
+    parser.add_argument("--prob-mutacao", type=float, help=f"probabilidade de mutação (0 a 1, padrão {PROB_MUTACAO})")
+    parser.add_argument("--busca-local", choices=MODOS_BUSCA_LOCAL, help="modo memético: busca local 2-opt na elite ou nos primeiros filhos de cada geração")
+    parser.add_argument("--busca-local-individuos", type=int, help=f"indivíduos otimizados pela busca local por geração (padrão {BUSCA_LOCAL_INDIVIDUOS})")
+    parser.add_argument("--busca-local-orcamento", type=float, help=f"segundos de busca local por geração (padrão {BUSCA_LOCAL_ORCAMENTO})")
+    parser.add_argument("--ilhas", type=int, help="número de ilhas (populações em processos paralelos); 1 desativa o modelo de ilhas")
+    parser.add_argument("--intervalo-migracao", type=int, help=f"gerações entre migrações entre ilhas (padrão {INTERVALO_MIGRACAO})")
+    parser.add_argument("--migrantes", type=int, help=f"melhores indivíduos recebidos por ilha em cada migração (padrão {NUM_MIGRANTES})")
+    parser.add_argument("--topologia", choices=TOPOLOGIAS_MIGRACAO, help=f"topologia de migração (padrão {TOPOLOGIA_ANEL})")
+    parser.add_argument("--processos-avaliacao", type=int, help="processos para a avaliação de fitness em memória compartilhada (0 desativa)")
+    parser.add_argument("--populacao-inicial", choices=METODOS_POPULACAO_INICIAL, help=f"método de geração da população inicial na execução em lote (padrão {POPULACAO_ALEATORIA})")
+    parser.add_argument("--proporcao-aleatoria", type=float, help=f"fração de rotas aleatórias nas populações heurísticas (padrão {PROPORCAO_ALEATORIA})")
+    parser.add_argument("--otimizar-final", type=float, nargs="?", const=ORCAMENTO_OTIMIZACAO_FINAL,
+                        help=f"segundos de 2-opt + Or-opt aplicados à melhor rota antes do relatório (sem valor: {ORCAMENTO_OTIMIZACAO_FINAL})")
+    parser.add_argument("--tsplib", help="arquivo .tsp da TSPLIB (substitui o sorteio das cidades; distâncias pela métrica da instância)")
+    parser.add_argument("--cenario", metavar="ARQUIVO",
+                        help="cenário gravado com --salvar-cenario (.npz): substitui o sorteio das cidades e das rotas de avião e trem")
+    parser.add_argument("--salvar-cenario", metavar="ARQUIVO", help="grava o cenário da execução em ARQUIVO (.npz) para reutilizá-lo com --cenario")
+    parser.add_argument("--somente-distancia", action="store_true", default=None,
+                        help="fitness pelo comprimento da rota, sem a escolha de transportes (TSP clássico)")
+    parser.add_argument("--tempos-fases", metavar="ARQUIVO",
+                        help="mede o tempo de cada fase das gerações e grava o resumo em ARQUIVO (.json ou .csv); no modo interativo, inclui a seção de tempos no PDF")
+    parser.add_argument("--acervo", metavar="ARQUIVO",
+                        help="acervo JSON de soluções entre execuções: semeia a população inicial com as melhores rotas já encontradas no mesmo cenário e guarda as novas")
+    parser.add_argument("--proporcao-acervo", type=float, help=f"fração máxima da população inicial vinda do acervo (padrão {PROPORCAO_ACERVO})")
+    parser.add_argument("--pareto", action="store_true", default=None,
+                        help="modo multiobjetivo (NSGA-II): uma execução retorna a frente de Pareto tempo x custo (no relatório e no resultado em lote)")
+    parser.add_argument("--grafico-pareto", metavar="ARQUIVO", help="com --pareto, grava o gráfico da frente de Pareto em ARQUIVO (.png)")
+    parser.add_argument("--checkpoint", metavar="ARQUIVO",
+                        help="grava periodicamente o estado completo da execução em ARQUIVO (.npz) para retomada com --resume")
+    parser.add_argument("--intervalo-checkpoint", type=float, help=f"segundos entre checkpoints (padrão {INTERVALO_CHECKPOINT})")
+    parser.add_argument("--resume", metavar="ARQUIVO",
+                        help="retoma a execução salva em ARQUIVO exatamente de onde parou (os checkpoints seguintes vão para o mesmo arquivo, salvo --checkpoint)")
+    parser.add_argument("--semente", type=int, help="semente do gerador aleatório (execução reprodutível)")
+    parser.add_argument("--saida", help="arquivo JSON de resultado da execução em lote")
+    parser.add_argument("--renderizacao", choices=["limitado", "processo"], default="limitado",
+                        help="modo interativo: desenhar no mesmo processo limitado a FPS quadros/s ou em um processo separado")
+    return parser.parse_args()
+
+
+
 # Rotina Prncipal
 if __name__ == "__main__":
 
+    argumentos = ler_argumentos()
+
+    # Execução em lote: sem perguntas, sem pygame, sem limite de FPS e sem impressões por geração
+    if argumentos.lote:
+        retomada_lote = None
+        try:
+            if argumentos.resume:
+                # A configuração é a da execução salva; apenas os arquivos de saída e de checkpoint podem mudar
+                retomada_lote = carregar_checkpoint(argumentos.resume)
+                if "configuracao" not in retomada_lote.metadados:
+                    raise ValueError(f"{argumentos.resume} não é um checkpoint de execução em lote")
+                configuracao_lote = carregar_configuracao_lote(None, {
+                    **retomada_lote.metadados["configuracao"],
+                    "checkpoint": argumentos.checkpoint or argumentos.resume,
+                    "tempos_fases": argumentos.tempos_fases,
+                    "saida": argumentos.saida,
+                })
+            else:
+                configuracao_lote = carregar_configuracao_lote(argumentos.config, {
+                    "cidades": argumentos.cidades,
+                    "perc_aviao": argumentos.perc_aviao,
+                    "perc_trem": argumentos.perc_trem,
+                    "populacao": argumentos.populacao,
+                    "criterio_parada": argumentos.criterio_parada,
+                    "max_geracoes": argumentos.max_geracoes,
+                    "max_geracoes_sem_melhoria": argumentos.max_geracoes_sem_melhoria,
+                    "peso_tempo": argumentos.peso_tempo,
+                    "prob_mutacao": argumentos.prob_mutacao,
+                    "busca_local": argumentos.busca_local,
+                    "busca_local_individuos": argumentos.busca_local_individuos,
+                    "busca_local_orcamento": argumentos.busca_local_orcamento,
+                    "ilhas": argumentos.ilhas,
+                    "intervalo_migracao": argumentos.intervalo_migracao,
+                    "migrantes": argumentos.migrantes,
+                    "topologia": argumentos.topologia,
+                    "processos_avaliacao": argumentos.processos_avaliacao,
+                    "populacao_inicial": argumentos.populacao_inicial,
+                    "proporcao_aleatoria": argumentos.proporcao_aleatoria,
+                    "otimizar_final": argumentos.otimizar_final,
+                    "tsplib": argumentos.tsplib,
+                    "cenario": argumentos.cenario,
+                    "salvar_cenario": argumentos.salvar_cenario,
+                    "somente_distancia": argumentos.somente_distancia,
+                    "tempos_fases": argumentos.tempos_fases,
+                    "checkpoint": argumentos.checkpoint,
+                    "intervalo_checkpoint": argumentos.intervalo_checkpoint,
+                    "acervo": argumentos.acervo,
+                    "proporcao_acervo": argumentos.proporcao_acervo,
+                    "pareto": argumentos.pareto,
+                    "grafico_pareto": argumentos.grafico_pareto,
+                    "semente": argumentos.semente,
+                    "saida": argumentos.saida,
+                })
+        except (OSError, ValueError) as e:
+            print(f"Configuração inválida: {e}", file=sys.stderr)
+            sys.exit(2)
+        resultado_lote = executar_lote(configuracao_lote, retomada=retomada_lote)
+        salvar_resultado_json(resultado_lote, configuracao_lote["saida"])
+        print(f"Resultado gravado em {configuracao_lote['saida']} (fitness {resultado_lote['resultado']['melhor_fitness']:.3f})")
+        if configuracao_lote["pareto"]:
+            print(f"Frente de Pareto: {len(resultado_lote['resultado']['frente_pareto'])} rotas")
+            if configuracao_lote["grafico_pareto"]:
+                print(f"Gráfico da frente de Pareto gravado em {configuracao_lote['grafico_pareto']}")
+        if configuracao_lote["salvar_cenario"]:
+            print(f"Cenário gravado em {configuracao_lote['salvar_cenario']} (reutilize com --cenario {configuracao_lote['salvar_cenario']})")
+        if configuracao_lote["tempos_fases"]:
+            exportar_resumo_fases(resultado_lote["resultado"]["tempos_fases"], configuracao_lote["tempos_fases"])
+            print(f"Tempos por fase gravados em {configuracao_lote['tempos_fases']}")
+        if configuracao_lote["checkpoint"]:
+            print(f"Checkpoint gravado em {configuracao_lote['checkpoint']} (retome com --lote --resume {configuracao_lote['checkpoint']})")
+        sys.exit(0)
+
+    if (argumentos.checkpoint or argumentos.resume) and argumentos.ilhas is not None and argumentos.ilhas > 1:
+        print("Checkpoint e retomada não são suportados com o modelo de ilhas (--ilhas > 1)", file=sys.stderr)
+        sys.exit(2)
+    if argumentos.pareto and (argumentos.checkpoint or argumentos.resume or argumentos.busca_local or argumentos.otimizar_final
+                              or (argumentos.ilhas is not None and argumentos.ilhas > 1)):
+        print("O modo multiobjetivo (--pareto) não é suportado com checkpoint, retomada, busca local, otimização final ou ilhas", file=sys.stderr)
+        sys.exit(2)
+    if argumentos.cenario and argumentos.tsplib:
+        print("--cenario e --tsplib não podem ser usados juntos", file=sys.stderr)
+        sys.exit(2)
+    if argumentos.peso_tempo is not None and not 0 <= argumentos.peso_tempo <= 1:
+        print(f"--peso-tempo inválido: {argumentos.peso_tempo} (esperado entre 0 e 1)", file=sys.stderr)
+        sys.exit(2)
+
+    # Modo interativo: pygame e o relatório (weasyprint/LLM) só são necessários aqui
+    from relatorio import gerar_relatorio_pdf
+    from renderizador import criar_renderizador
+
+    if argumentos.semente is not None:
+        random.seed(argumentos.semente)
+
     # Introdução
     limpar_console()
     print("* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *")
@@ -54,265 +241,273 @@ if __name__ == "__main__":
 
 
 
-    # Definição do número de cidades
-    print("1 - DEFINIÇÃO DO NÚMERO DE CIDADES")
-    entrada = None
-    num_cidades: int = 0
-    while entrada is None:
-        print(f"Digite um número inteiro positivo maior ou igual a {MIN_CIDADES} e menor ou igual a {MAX_CIDADES}: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(MIN_CIDADES, MAX_CIDADES)
-        if entrada is not None:
-            num_cidades = entrada
-            print(f"Número de cidades definido para {num_cidades}.\n")
-
-
-
-    # Definindo posicionamento das cidades aleatoriamente
-    print("2 - POSICIONAMENTO ALEATÓRIO DAS CIDADES")
-    cidades = {
-        cidade: posicao
-        for cidade, posicao
-        in zip(
-            [indice_para_letra(i) for i in range(num_cidades)],
-            [(random.randint(OFFSET_X_GRAFICO + MARGEM, LARGURA_TELA - MARGEM), random.randint(MARGEM, ALTURA_TELA - MARGEM)) for _ in range(num_cidades)])}
-    cidades_str = "\n".join(f"{k}: {v}" for k, v in cidades.items())
-    print(f"Cidades posicionadas aleatoriamente em um terreno de {LARGURA_TELA - OFFSET_X_GRAFICO - 2 * MARGEM} x {ALTURA_TELA - 2 * MARGEM}:\n{cidades_str}\n")
-
-
-
-    # Calculando a distância euclidiana de cada par de cidades para montar a matriz de distâncias
-    print("3 - DEFININDO MATRIZ DE DISTÂNCIAS ENTRE AS CIDADES")
-    matriz_distancias = [[0.0 for _ in range(num_cidades)] for _ in range(num_cidades)]
-    for i in range(num_cidades):
-        xi, yi = cidades[indice_para_letra(i)]
-        for j in range(i + 1, num_cidades):
-            xj, yj = cidades[indice_para_letra(j)]
-            d = math.hypot(xi - xj, yi - yj)
-            matriz_distancias[i][j] = d
-            matriz_distancias[j][i] = d
-    print("Matriz de distâncias calculada: \n")
-    imprimir_matriz(matriz_distancias)
-
-
-
-    # Definindo aleatoriamente rotas possíveis de avião entre as cidades
-    print("4 - DEFININDO ALEATORIAMENTE ROTAS UNIDIRECIONAIS POSSÍVEIS DE AVIÃO ENTRE AS CIDADES")
-    entrada = None
-    perc_cnx_aviao: int = 0
-    while entrada is None:
-        print(f"Digite um percentual válido entre 0 e 100 para a proporção de rotas possíveis de avião: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(0, 100)
-        if entrada is not None:
-            perc_cnx_aviao = entrada
-    qtd_cnx_aviao = (num_cidades * (num_cidades - 1)) * perc_cnx_aviao // 100
-    print(f"Percentual de rotas de avião definido para {perc_cnx_aviao}%, resultando em {qtd_cnx_aviao} rotas unidirecionais possíveis.\n")
-    vetor_rotas_aviao = list(range((num_cidades * (num_cidades - 1))))
-    rotas_aviao = sorted(random.sample(vetor_rotas_aviao, k = qtd_cnx_aviao))
-    matriz_aviao = [[0 for _ in range(num_cidades)] for _ in range(num_cidades)]
-    for rota in rotas_aviao:
-        xma = rota // (num_cidades - 1)
-        yma = rota % (num_cidades - 1)
-        if yma >= xma:
-            yma += 1
-        matriz_aviao[xma][yma] = 1
-    print("Matriz de rotas de avião: \n")
-    imprimir_matriz(matriz_aviao)
-
-
-
-    # Definindo aleatoriamente rotas possíveis de trem entre as cidades
-    print("5 - DEFININDO ALEATORIAMENTE ROTAS BIDIRECIONAIS POSSÍVEIS DE TREM ENTRE AS CIDADES")
-    entrada = None
-    perc_cnx_trem: int = 0
-    while entrada is None:
-        print(f"Digite um percentual válido entre 0 e 100 para a proporção de rotas possíveis de trem: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(0, 100)
-        if entrada is not None:
-            perc_cnx_trem = entrada
-    qtd_cnx_trem = (num_cidades * (num_cidades - 1) // 2) * perc_cnx_trem // 100
-    print(f"Percentual de rotas de trem definido para {perc_cnx_trem}%, resultando em {qtd_cnx_trem} rotas bidirecionais possíveis.\n")
-    vetor_rotas_trem = list(range((num_cidades * (num_cidades - 1) // 2)))
-    rotas_trem = sorted(random.sample(vetor_rotas_trem, k = qtd_cnx_trem))
-    matriz_trem = [[0 for _ in range(num_cidades)] for _ in range(num_cidades)]
-    ymt, controle = 0, 0
-    for rota in rotas_trem:
-        while rota >= controle + (num_cidades - ymt - 1):
-            controle += (num_cidades - ymt - 1)
-            ymt += 1
-        xmt = rota - controle + ymt + 1
-        matriz_trem[xmt][ymt] = 1
-        matriz_trem[ymt][xmt] = 1
-    print("Matriz de rotas de trem: \n")
-    imprimir_matriz(matriz_trem)
-
-
-
-    # Definição do tamanho da população inicial para o algoritmo genético
-    print("6 - DEFINIÇÃO DO TAMANHO DA POPULAÇÃO")
-    entrada = None
-    tam_populacao: int = 0
-    while entrada is None:
-        print(f"Digite um número inteiro positivo maior ou igual a {MIN_POPULACAO} e menor ou igual a {MAX_POPULACAO}: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(MIN_POPULACAO, MAX_POPULACAO)
-        if entrada is not None:
-            tam_populacao = entrada
-            print(f"Tamanho da população definido para {tam_populacao}.\n")
-
-
-
-    # Escolha do algoritmo de geração da população inicial
-    print("7 - GERAÇÃO DA POPULAÇÃO INICIAL")
-    print("Escolha o algoritmo de geração da população inicial:")
-    print("1 - Aleatória")
-    entrada = None
-    populacao: List[List[str]] = []
-    while entrada is None:
-        print("Algoritmo de geração da população inicial: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(1, 1)
-        if entrada is not None:
-            if entrada == 1:
-                populacao = populacao_inicial_aleatoria(list(cidades.keys()), tam_populacao)
-            else:
-                # Implementar heurística aqui
-                pass
-
-    # Definição dos critérios de parada
-    print("\n8 - DEFINIÇÃO DOS CRITÉRIOS DE PARADA")
-    print("Escolha os critérios de parada para o algoritmo genético:")
-    print("1 - Número máximo de gerações")
-    print("2 - Convergência (gerações sem melhoria)")
-    print("3 - Ambos (o que ocorrer primeiro)")
-    entrada = None
-    criterio_parada: int = 0
-    while entrada is None:
-        print("Critério de parada: ", end="", flush=True)
-        entrada = ler_inteiro_positivo(1, 3)
-        if entrada is not None:
-            criterio_parada = entrada
-    
-    max_geracoes: int = 0
-    max_geracoes_sem_melhoria: int = 0
-    
-    if criterio_parada in [1, 3]:
+    # Retomada de um checkpoint (--resume): cenário, configuração e população vêm do arquivo, sem as perguntas
+    retomada = None
+    if argumentos.resume:
+        print(f"RETOMANDO A EXECUÇÃO SALVA EM {argumentos.resume}")
+        retomada = carregar_checkpoint(argumentos.resume)
+        cidades = retomada.cenario.cidades
+        posicoes = list(cidades.values())
+        num_cidades = len(cidades)
+        matriz_distancias = retomada.cenario.matriz_distancias
+        matriz_aviao = retomada.cenario.matriz_aviao
+        matriz_trem = retomada.cenario.matriz_trem
+        posicoes_geometricas = retomada.cenario.posicoes_geometricas
+        tam_populacao = retomada.config.tam_populacao
+        somente_distancia = retomada.metadados.get("somente_distancia", False)
+        populacao: List[array] = []
+        print(f"{num_cidades} cidades, população de {tam_populacao}, geração {retomada.estado.geracao}, "
+              f"melhor fitness {retomada.estado.melhor_fitness:.3f}.\n")
+    else:
+        # Cidades e matriz de distâncias: sorteadas (passos 1 a 3), lidas de uma instância TSPLIB (--tsplib)
+        # ou, com as rotas de avião e trem (passos 4 e 5), de um cenário gravado (--cenario)
+        posicoes_geometricas = True
+        somente_distancia = bool(argumentos.somente_distancia)
+        if argumentos.cenario:
+            print("1 a 5 - CARREGANDO CENÁRIO GRAVADO")
+            cenario_gravado = carregar_cenario(argumentos.cenario)
+            cidades = cenario_gravado.cidades
+            posicoes = list(cidades.values())
+            num_cidades = len(cidades)
+            matriz_distancias = cenario_gravado.matriz_distancias
+            matriz_aviao = cenario_gravado.matriz_aviao
+            matriz_trem = cenario_gravado.matriz_trem
+            posicoes_geometricas = cenario_gravado.posicoes_geometricas
+            print(f"Cenário {argumentos.cenario}: {num_cidades} cidades, {int(matriz_aviao.sum())} rotas de avião "
+                  f"e {int(matriz_trem.sum()) // 2} rotas de trem.\n")
+        elif argumentos.tsplib:
+            # Instância TSPLIB: cidades, posições (ajustadas à tela) e distâncias vêm do arquivo, pela métrica da instância
+            print("1 a 3 - CARREGANDO INSTÂNCIA TSPLIB")
+            instancia = ler_instancia(argumentos.tsplib)
+            num_cidades = instancia.dimensao
+            posicoes = posicoes_tela(instancia)
+            cidades = {indice_para_letra(i): posicao for i, posicao in enumerate(posicoes)}
+            matriz_distancias = calcular_matriz_tsplib(instancia).astype(float).tolist()
+            posicoes_geometricas = instancia.coordenadas is not None
+            print(f"Instância {instancia.nome}: {num_cidades} cidades, distâncias {instancia.tipo_peso}.\n")
+            imprimir_matriz(matriz_distancias)
+        else:
+            # Definição do número de cidades
+            print("1 - DEFINIÇÃO DO NÚMERO DE CIDADES")
+            entrada = None
+            num_cidades: int = 0
+            while entrada is None:
+                print(f"Digite um número inteiro positivo maior ou igual a {MIN_CIDADES} e menor ou igual a {MAX_CIDADES}: ", end="", flush=True)
+                entrada = ler_inteiro_positivo(MIN_CIDADES, MAX_CIDADES)
+                if entrada is not None:
+                    num_cidades = entrada
+                    print(f"Número de cidades definido para {num_cidades}.\n")
+
+            # Definindo posicionamento das cidades aleatoriamente
+            print("2 - POSICIONAMENTO ALEATÓRIO DAS CIDADES")
+            cidades = gerar_cidades(num_cidades)
+            posicoes = list(cidades.values())
+            cidades_str = "\n".join(f"{k}: {v}" for k, v in cidades.items())
+            print(f"Cidades posicionadas aleatoriamente em um terreno de {LARGURA_TELA - OFFSET_X_GRAFICO - 2 * MARGEM} x {ALTURA_TELA - 2 * MARGEM}:\n{cidades_str}\n")
+
+            # Calculando a distância euclidiana de cada par de cidades para montar a matriz de distâncias
+            print("3 - DEFININDO MATRIZ DE DISTÂNCIAS ENTRE AS CIDADES")
+            matriz_distancias = calcular_matriz_distancias(posicoes)
+            print("Matriz de distâncias calculada: \n")
+            imprimir_matriz(matriz_distancias)
+
+
+
+        if not argumentos.cenario:
+            # Definindo aleatoriamente rotas possíveis de avião entre as cidades
+            print("4 - DEFININDO ALEATORIAMENTE ROTAS UNIDIRECIONAIS POSSÍVEIS DE AVIÃO ENTRE AS CIDADES")
+            entrada = None
+            perc_cnx_aviao: int = 0
+            while entrada is None:
+                print(f"Digite um percentual válido entre 0 e 100 para a proporção de rotas possíveis de avião: ", end="", flush=True)
+                entrada = ler_inteiro_positivo(0, 100)
+                if entrada is not None:
+                    perc_cnx_aviao = entrada
+            qtd_cnx_aviao = calcular_qtd_rotas_aviao(num_cidades, perc_cnx_aviao)
+            print(f"Percentual de rotas de avião definido para {perc_cnx_aviao}%, resultando em {qtd_cnx_aviao} rotas unidirecionais possíveis.\n")
+            matriz_aviao = gerar_matriz_aviao(num_cidades, qtd_cnx_aviao)
+            print("Matriz de rotas de avião: \n")
+            imprimir_matriz(matriz_aviao)
+
+
+
+            # Definindo aleatoriamente rotas possíveis de trem entre as cidades
+            print("5 - DEFININDO ALEATORIAMENTE ROTAS BIDIRECIONAIS POSSÍVEIS DE TREM ENTRE AS CIDADES")
+            entrada = None
+            perc_cnx_trem: int = 0
+            while entrada is None:
+                print(f"Digite um percentual válido entre 0 e 100 para a proporção de rotas possíveis de trem: ", end="", flush=True)
+                entrada = ler_inteiro_positivo(0, 100)
+                if entrada is not None:
+                    perc_cnx_trem = entrada
+            qtd_cnx_trem = calcular_qtd_rotas_trem(num_cidades, perc_cnx_trem)
+            print(f"Percentual de rotas de trem definido para {perc_cnx_trem}%, resultando em {qtd_cnx_trem} rotas bidirecionais possíveis.\n")
+            matriz_trem = gerar_matriz_trem(num_cidades, qtd_cnx_trem)
+            print("Matriz de rotas de trem: \n")
+            imprimir_matriz(matriz_trem)
+
+
+
+        # Definição do tamanho da população inicial para o algoritmo genético
+        print("6 - DEFINIÇÃO DO TAMANHO DA POPULAÇÃO")
         entrada = None
+        tam_populacao: int = 0
         while entrada is None:
-            print(f"Digite o número máximo de gerações ({MIN_MAX_GERACOES}-{MAX_MAX_GERACOES}): ", end="", flush=True)
-            entrada = ler_inteiro_positivo(MIN_MAX_GERACOES, MAX_MAX_GERACOES)
+            print(f"Digite um número inteiro positivo maior ou igual a {MIN_POPULACAO} e menor ou igual a {MAX_POPULACAO}: ", end="", flush=True)
+            entrada = ler_inteiro_positivo(MIN_POPULACAO, MAX_POPULACAO)
             if entrada is not None:
-                max_geracoes = entrada
-                print(f"Número máximo de gerações definido para {max_geracoes}.")
-    
-    if criterio_parada in [2, 3]:
+                tam_populacao = entrada
+                print(f"Tamanho da população definido para {tam_populacao}.\n")
+
+
+
+        # Escolha do algoritmo de geração da população inicial
+        print("7 - GERAÇÃO DA POPULAÇÃO INICIAL")
+        print("Escolha o algoritmo de geração da população inicial:")
+        proporcao_aleatoria = argumentos.proporcao_aleatoria if argumentos.proporcao_aleatoria is not None else PROPORCAO_ALEATORIA
+        for opcao, (_, descricao) in enumerate(OPCOES_POPULACAO_INICIAL, start=1):
+            print(f"{opcao} - {descricao}")
+        entrada = None
+        populacao: List[array] = []
+        while entrada is None:
+            print("Algoritmo de geração da população inicial: ", end="", flush=True)
+            entrada = ler_inteiro_positivo(1, len(OPCOES_POPULACAO_INICIAL))
+            if entrada is not None:
+                metodo_populacao, descricao_populacao = OPCOES_POPULACAO_INICIAL[entrada - 1]
+                composicao = composicao_populacao(metodo_populacao, proporcao_aleatoria)
+                populacao = [criar_individuo(rota) for rota in gerar_populacao_inicial(posicoes, tam_populacao, composicao)]
+                print(f"População inicial gerada: {descricao_populacao}.\n")
+
+        # Definição dos critérios de parada
+        print("\n8 - DEFINIÇÃO DOS CRITÉRIOS DE PARADA")
+        print("Escolha os critérios de parada para o algoritmo genético:")
+        print("1 - Número máximo de gerações")
+        print("2 - Convergência (gerações sem melhoria)")
+        print("3 - Ambos (o que ocorrer primeiro)")
         entrada = None
+        criterio_parada: int = 0
         while entrada is None:
-            print(f"Digite o número máximo de gerações sem melhoria ({MIN_GERACOES_SEM_MELHORIA}-{MAX_GERACOES_SEM_MELHORIA}): ", end="", flush=True)
-            entrada = ler_inteiro_positivo(MIN_GERACOES_SEM_MELHORIA, MAX_GERACOES_SEM_MELHORIA)
+            print("Critério de parada: ", end="", flush=True)
+            entrada = ler_inteiro_positivo(1, 3)
             if entrada is not None:
-                max_geracoes_sem_melhoria = entrada
-                print(f"Número máximo de gerações sem melhoria definido para {max_geracoes_sem_melhoria}.")
+                criterio_parada = entrada
+    
+        max_geracoes: int = 0
+        max_geracoes_sem_melhoria: int = 0
+    
+        if criterio_parada in [1, 3]:
+            entrada = None
+            while entrada is None:
+                print(f"Digite o número máximo de gerações ({MIN_MAX_GERACOES}-{MAX_MAX_GERACOES}): ", end="", flush=True)
+                entrada = ler_inteiro_positivo(MIN_MAX_GERACOES, MAX_MAX_GERACOES)
+                if entrada is not None:
+                    max_geracoes = entrada
+                    print(f"Número máximo de gerações definido para {max_geracoes}.")
+    
+        if criterio_parada in [2, 3]:
+            entrada = None
+            while entrada is None:
+                print(f"Digite o número máximo de gerações sem melhoria ({MIN_GERACOES_SEM_MELHORIA}-{MAX_GERACOES_SEM_MELHORIA}): ", end="", flush=True)
+                entrada = ler_inteiro_positivo(MIN_GERACOES_SEM_MELHORIA, MAX_GERACOES_SEM_MELHORIA)
+                if entrada is not None:
+                    max_geracoes_sem_melhoria = entrada
+                    print(f"Número máximo de gerações sem melhoria definido para {max_geracoes_sem_melhoria}.")
 
 
 
     # Inicializando a solução do problema do caixeiro viajante usando algoritmo genético
     input("\nPressione ENTER para iniciar a solução do problema do caixeiro viajante usando algoritmo genético...\n")
+    medidor = ativar_medicao() if argumentos.tempos_fases else None
     tempo_inicio = time.time()
-    pygame.init()
-    pygame.display.set_caption("PÓS TECH FIAP - Turma 7IADT/Módulo 02 - Traveling Salesman Problem (TSP) - Algoritmo Genético")
-    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
-    clock = pygame.time.Clock()
-
-    limites_estimados = calcular_limites_estimados(matriz_distancias)
-    geracao = 0
-    melhores_solucoes: List[Tuple[List[str], float, List[int]]] = []
-    melhor_fitness: float = float('inf')
-    geracoes_sem_melhoria: int = 0
-    criterio_atingido: str = ""
-
-    # Loop de execução
-    em_execucao: bool = True
-    while em_execucao:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                em_execucao = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    em_execucao = False
-        
-        geracao += 1
-        populacao_fitness_trajeto: List[Tuple[List[str], float, List[int]]] = []
-        for individuo in populacao:
-            populacao_fitness_trajeto.append(
-                calcular_fitness_prioridade_tempo(
-                    matriz_distancias,
-                    matriz_aviao,
-                    matriz_trem,
-                    individuo,
-                    *limites_estimados))
-        populacao_fitness_trajeto.sort(key=itemgetter(1), reverse=False)
-        melhores_solucoes.append(populacao_fitness_trajeto[0])
-        
-        # Verificar critérios de convergência
-        fitness_atual = populacao_fitness_trajeto[0][1]
-        if fitness_atual < melhor_fitness:
-            melhor_fitness = fitness_atual
-            geracoes_sem_melhoria = 0
-        else:
-            geracoes_sem_melhoria += 1
-        
-        # Verificar critérios de parada
-        parar_execucao = False
-        if criterio_parada == 1 and geracao >= max_geracoes:
-            parar_execucao = True
-            criterio_atingido = f"Número máximo de gerações atingido ({max_geracoes})"
-        elif criterio_parada == 2 and geracoes_sem_melhoria >= max_geracoes_sem_melhoria:
-            parar_execucao = True
-            criterio_atingido = f"Convergência atingida ({max_geracoes_sem_melhoria} gerações sem melhoria)"
-        elif criterio_parada == 3:
-            if geracao >= max_geracoes:
-                parar_execucao = True
-                criterio_atingido = f"Número máximo de gerações atingido ({max_geracoes})"
-            elif geracoes_sem_melhoria >= max_geracoes_sem_melhoria:
-                parar_execucao = True
-                criterio_atingido = f"Convergência atingida ({max_geracoes_sem_melhoria} gerações sem melhoria)"
-        
-        if parar_execucao:
-            em_execucao = False
-
-        tela.fill(COR_BRANCO)
-        draw_plot(tela, list(range(len(melhores_solucoes))), [solucao[1] for solucao in melhores_solucoes], y_label="Gráfico de fitness")
-        draw_cities(tela, list(cidades.values()), list(cidades.keys()))
-        draw_paths(tela, melhores_solucoes[-1], cidades)
-        pygame.display.flip()
-        clock.tick(FPS)
-
-        print(f"Geração {geracao}: Fitness {melhores_solucoes[-1][1]:5.3f} (Sem melhoria: {geracoes_sem_melhoria}) - Trajeto {melhores_solucoes[-1][0]}, Transportes {melhores_solucoes[-1][2]}\r", end="", flush=True)
-        
-        # ------------------------------------------------------------
-        # Implementação do algoritmo genético: seleção
-        # - Utiliza elitismo para iniciar a nova população com os 10% melhores resultados
-        # ------------------------------------------------------------
-        nova_populacao: List[List[str]] = list(populacao_fitness_trajeto[i][0] for i in range(tam_populacao // 10))
-
-        # ------------------------------------------------------------
-        # Implementação do algoritmo genético: cruzamento
-        # - Utiliza toneiro para selecionar os pais;
-        # - Utiliza Edge Recombination Crossover (ERX) para gerar os filhos;
-        # ------------------------------------------------------------
-        while len(nova_populacao) < tam_populacao:
-            p1 = selecao_por_torneio(populacao_fitness_trajeto)
-            p2 = selecao_por_torneio(populacao_fitness_trajeto)
-            if p1 is not None and p2 is not None:
-                nova_populacao.extend(edge_recombination_crossover(p1, p2))
-        
-        # ------------------------------------------------------------
-        # Implementação do algoritmo genético: mutação
-        # - Percorre a nova população aplicando mutação na metade inferior dos indivíduos
-        # ------------------------------------------------------------
-        for i in range(len(nova_populacao) // 2, len(nova_populacao)):
-            nova_populacao[i] = aplicar_mutacoes(nova_populacao[i])
-
-        # Finalizando esta geração, definindo a população para a próxima geração
-        populacao = nova_populacao[:tam_populacao]        
+    cenario = Cenario(cidades, matriz_distancias, matriz_aviao, matriz_trem, posicoes_geometricas)
+    if argumentos.salvar_cenario:
+        salvar_cenario(cenario, argumentos.salvar_cenario)
+        print(f"Cenário gravado em {argumentos.salvar_cenario}.")
+    usar_ilhas = argumentos.ilhas is not None and argumentos.ilhas > 1
+    if retomada is not None:
+        config_ga = retomada.config
+        random.setstate(retomada.estado_aleatorio)
+        tempo_inicio -= retomada.tempo_decorrido
+    else:
+        config_ga = ConfiguracaoGA(
+            tam_populacao, criterio_parada, max_geracoes, max_geracoes_sem_melhoria,
+            peso_tempo=argumentos.peso_tempo if argumentos.peso_tempo is not None else PESO_TEMPO,
+            busca_local=argumentos.busca_local or BUSCA_LOCAL_DESATIVADA,
+            busca_local_individuos=argumentos.busca_local_individuos or BUSCA_LOCAL_INDIVIDUOS,
+            busca_local_orcamento=argumentos.busca_local_orcamento or BUSCA_LOCAL_ORCAMENTO,
+            prob_mutacao=argumentos.prob_mutacao if argumentos.prob_mutacao is not None else PROB_MUTACAO)
+    avaliador = criar_avaliador(
+        cenario,
+        0 if usar_ilhas or argumentos.pareto else argumentos.processos_avaliacao or 0,
+        tam_populacao,
+        BUSCA_LOCAL_VIZINHOS if config_ga.busca_local else 0,
+        somente_distancia)
+
+    # Acervo de soluções (--acervo): rotas de execuções anteriores no mesmo cenário substituem parte da população inicial
+    acervo = impressao = None
+    rotas_acervo: List[List[int]] = []
+    if argumentos.acervo:
+        acervo = AcervoSolucoes(argumentos.acervo)
+        impressao = impressao_digital_cenario(cenario, config_ga.peso_tempo, somente_distancia)
+        if retomada is None:
+            proporcao_acervo = argumentos.proporcao_acervo if argumentos.proporcao_acervo is not None else PROPORCAO_ACERVO
+            rotas_acervo = rotas_iniciais_acervo(acervo, impressao, tam_populacao, proporcao_acervo)
+            populacao = [criar_individuo(rota) for rota in rotas_acervo] + populacao[len(rotas_acervo):]
+            print(f"Acervo de soluções: {len(rotas_acervo)} rotas de execuções anteriores semeadas na população inicial.")
+
+    # Loop de execução: o renderizador decide quando desenhar, sem limitar a velocidade da evolução
+    renderizador = criar_renderizador(argumentos.renderizacao, posicoes, list(cidades.keys()))
+    if usar_ilhas:
+        # Modelo de ilhas: a população escolhida é a primeira ilha; as demais são geradas com o mesmo método
+        config_ilhas = ConfiguracaoIlhas(
+            num_ilhas=argumentos.ilhas,
+            intervalo_migracao=argumentos.intervalo_migracao or INTERVALO_MIGRACAO,
+            num_migrantes=argumentos.migrantes if argumentos.migrantes is not None else NUM_MIGRANTES,
+            topologia=argumentos.topologia or TOPOLOGIA_ANEL)
+        populacoes = [populacao] + [
+            [criar_individuo(rota) for rota in rotas_acervo + gerar_populacao_inicial(posicoes, tam_populacao - len(rotas_acervo), composicao)]
+            for _ in range(config_ilhas.num_ilhas - 1)]
+        estado = executar_ilhas(avaliador, config_ga, config_ilhas, populacoes, renderizador.publicar)
+    else:
+        # Checkpoints periódicos (--checkpoint; na retomada, no próprio arquivo retomado) gravados em uma thread
+        caminho_checkpoint = argumentos.checkpoint or argumentos.resume
+        gravador = None
+        if caminho_checkpoint:
+            gravador = GravadorCheckpoint(
+                caminho_checkpoint, cenario, config_ga, {"somente_distancia": somente_distancia},
+                intervalo=argumentos.intervalo_checkpoint or INTERVALO_CHECKPOINT,
+                tempo_decorrido=time.time() - tempo_inicio)
+        acompanhamento = acompanhar_com_gravador(gravador, renderizador.publicar) if gravador else renderizador.publicar
+        estado = None
+        try:
+            if argumentos.pareto:
+                estado = executar_nsga2(avaliador, config_ga, populacao, acompanhamento)
+            else:
+                estado = executar_ga(avaliador, config_ga, populacao, acompanhamento, retomada.estado if retomada else None)
+        finally:
+            avaliador.fechar()
+            if gravador is not None:
+                gravador.fechar(estado)
+                print(f"\nCheckpoint gravado em {caminho_checkpoint} (retome com --resume {caminho_checkpoint})")
+    if argumentos.otimizar_final:
+        reducao = otimizar_melhor_solucao(estado, avaliador, config_ga, argumentos.otimizar_final, posicoes)
+        print(f"\nOtimização final (2-opt + Or-opt): fitness reduzido em {reducao:.3f}")
+    renderizador.fechar(estado)
+    desativar_medicao()
+    # Melhor solução do histórico (no modo multiobjetivo, a rota de compromisso de menor fitness ponderado)
+    melhor_solucao = min(estado.melhores_solucoes, key=lambda solucao: solucao[1])
+    if acervo is not None:
+        novas = acervo.registrar(impressao, [melhor_solucao[:2]] + estado.populacao_fitness, avaliador.tabelas.simetrica)
+        acervo.salvar()
+        print(f"\nAcervo de soluções: {novas} novas rotas guardadas em {argumentos.acervo}")
+    cache_fitness = avaliador.cache
+
+    # Modo multiobjetivo (--pareto): frente de Pareto e gráfico (tempo x custo) para o console e o relatório
+    frente_pareto = grafico_pareto = None
+    if argumentos.pareto:
+        frente_pareto = frente_para_dicionarios(avaliador.tabelas, estado.frente_pareto)
+        compromisso = calcular_objetivos(avaliador.tabelas, [melhor_solucao[0]])[0]
+        grafico_pareto = grafico_frente_pareto(estado.frente_pareto, tuple(compromisso), argumentos.grafico_pareto)
 
     # Finalização
     tempo_fim = time.time()
@@ -321,13 +516,29 @@ if __name__ == "__main__":
     print(f"\n\n{'='*80}")
     print(f"EXECUÇÃO FINALIZADA")
     print(f"{'='*80}")
-    if criterio_atingido:
-        print(f"Critério de parada: {criterio_atingido}")
-    print(f"Total de gerações: {geracao}")
-    print(f"Melhor fitness encontrado: {melhor_fitness:.3f}")
-    print(f"Melhor trajeto: {melhores_solucoes[-1][0]}")
-    print(f"Transportes utilizados: {melhores_solucoes[-1][2]}")
+    if estado.criterio_atingido:
+        print(f"Critério de parada: {estado.criterio_atingido}")
+    print(f"Total de gerações: {estado.geracao}")
+    print(f"Melhor fitness encontrado: {melhor_solucao[1]:.3f}")
+    print(f"Melhor trajeto: {trajeto_para_letras(melhor_solucao[0])}")
+    print(f"Transportes utilizados: {melhor_solucao[2]}")
     print(f"Tempo de execução: {tempo_execucao:.2f}s")
+    print(f"Cache de fitness: {cache_fitness.acertos} acertos, {cache_fitness.falhas} falhas ({cache_fitness.taxa_acertos():.1%})")
+    if frente_pareto is not None:
+        print(f"Frente de Pareto ({len(frente_pareto)} rotas, tempo / custo):")
+        for ponto in frente_pareto:
+            print(f"  {ponto['tempo']:>10} / {ponto['custo']:>12}")
+        if argumentos.grafico_pareto:
+            print(f"Gráfico da frente de Pareto gravado em {argumentos.grafico_pareto}")
+    tempos_fases = None
+    if medidor is not None:
+        tempos_fases = medidor.resumo()
+        print("Tempo por fase (total / p50 / p95):")
+        for tempo_fase in tempos_fases:
+            print(f"  {tempo_fase['fase']:<18} {tempo_fase['total']:8.3f}s ({tempo_fase['percentual']:5.1f}%)  "
+                  f"{tempo_fase['p50'] * 1000:8.3f}ms  {tempo_fase['p95'] * 1000:8.3f}ms  x{tempo_fase['contagem']}")
+        exportar_resumo_fases(tempos_fases, argumentos.tempos_fases)
+        print(f"Tempos por fase gravados em {argumentos.tempos_fases}")
     print(f"{'='*80}")
     
     # Gerar relatório em PDF
@@ -337,14 +548,17 @@ if __name__ == "__main__":
             num_cidades=num_cidades,
             cidades=cidades,
             tamanho_populacao=tam_populacao,
-            total_geracoes=geracao,
-            criterio_parada=criterio_atingido if criterio_atingido else "Manual",
-            melhor_fitness=melhor_fitness,
-            melhor_trajeto=melhores_solucoes[-1][0],
-            transportes=melhores_solucoes[-1][2],
+            total_geracoes=estado.geracao,
+            criterio_parada=estado.criterio_atingido if estado.criterio_atingido else "Manual",
+            melhor_fitness=melhor_solucao[1],
+            melhor_trajeto=melhor_solucao[0],
+            transportes=melhor_solucao[2],
             tempo_execucao=tempo_execucao,
             matriz_distancias=matriz_distancias,
-            diretorio_saida=diretorio_atual
+            diretorio_saida=diretorio_atual,
+            tempos_fases=tempos_fases,
+            frente_pareto=frente_pareto,
+            grafico_pareto=grafico_pareto
         )
         print(f"\n✓ Relatório PDF gerado e aberto: {os.path.basename(caminho_pdf)}")
     except Exception as e:
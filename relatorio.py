@@ -1,15 +1,17 @@
+import base64
 import os
 import platform
 import subprocess
 from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from weasyprint import HTML
 
 from llm import gerar_analise_tsp_llm
 from parametros import TIPO_TRANSPORTE_MAP
+from utils import trajeto_para_letras
 
 
 def calcular_estatisticas_uso_transporte(transportes: List[int]) -> List[Dict]:
@@ -28,18 +30,15 @@ def calcular_estatisticas_uso_transporte(transportes: List[int]) -> List[Dict]:
 
 def calcular_estatisticas_distancia_transporte(
     transportes: List[int],
-    melhor_trajeto: List[str],
+    melhor_trajeto: Sequence[int],
     matriz_distancias: List[List[float]],
     estatisticas_uso: List[Dict]
 ) -> List[Dict]:
     distancias_por_tipo = {tipo_id: 0.0 for tipo_id in TIPO_TRANSPORTE_MAP.keys()}
     
     for i, tipo_transporte in enumerate(transportes):
-        cidade_atual = melhor_trajeto[i]
-        cidade_proxima = melhor_trajeto[(i + 1) % len(melhor_trajeto)]
-        
-        idx_atual = ord(cidade_atual) - ord('A')
-        idx_proxima = ord(cidade_proxima) - ord('A')
+        idx_atual = melhor_trajeto[i]
+        idx_proxima = melhor_trajeto[(i + 1) % len(melhor_trajeto)]
         
         distancia = matriz_distancias[idx_atual][idx_proxima]
         distancias_por_tipo[tipo_transporte] += distancia
@@ -64,7 +63,7 @@ def formatar_dados_tsp(
     total_geracoes: int,
     criterio_parada: str,
     melhor_fitness: float,
-    melhor_trajeto: List[str],
+    melhor_trajeto: Sequence[int],
     transportes: List[int],
     tempo_execucao: float,
     matriz_distancias: List[List[float]]
@@ -90,7 +89,7 @@ def formatar_dados_tsp(
         },
         "resultado": {
             "melhor_fitness": round(melhor_fitness, 3),
-            "trajeto": " → ".join(melhor_trajeto),
+            "trajeto": " → ".join(trajeto_para_letras(melhor_trajeto)),
             "transportes_utilizados": transportes_formatados,
             "num_trechos": len(melhor_trajeto) - 1,
             "estatisticas_transporte": estatisticas_transporte,
@@ -100,7 +99,28 @@ def formatar_dados_tsp(
     }
 
 
-def gerar_html_relatorio(analise_llm: Dict, dados_tsp: Dict) -> str:    
+def formatar_tempos_fases(tempos_fases: List[Dict]) -> List[Dict]:
+    # Durações em milissegundos (p50/p95) e segundos (total), arredondadas para a tabela do relatório
+    return [
+        {
+            "fase": tempo["fase"],
+            "contagem": tempo["contagem"],
+            "total_s": round(tempo["total"], 3),
+            "percentual": round(tempo["percentual"], 1),
+            "p50_ms": round(tempo["p50"] * 1000, 3),
+            "p95_ms": round(tempo["p95"] * 1000, 3),
+        }
+        for tempo in tempos_fases
+    ]
+
+
+def gerar_html_relatorio(
+    analise_llm: Dict,
+    dados_tsp: Dict,
+    tempos_fases: List[Dict] | None = None,
+    frente_pareto: List[Dict] | None = None,
+    grafico_pareto: bytes | None = None
+) -> str:    
     # Configura o ambiente Jinja2 (Template Processing)
     template_dir = os.path.dirname(__file__)
     env = Environment(
@@ -138,6 +158,9 @@ def gerar_html_relatorio(analise_llm: Dict, dados_tsp: Dict) -> str:
         transportes=', '.join(resultado['transportes_utilizados']),
         estatisticas_transporte=resultado.get('estatisticas_transporte', []),
         estatisticas_distancia=resultado.get('estatisticas_distancia', []),
+        tempos_fases=formatar_tempos_fases(tempos_fases) if tempos_fases else [],
+        frente_pareto=frente_pareto or [],
+        grafico_pareto=base64.b64encode(grafico_pareto).decode("ascii") if grafico_pareto else "",
         # Análises geradas por LLM
         analise_convergencia=analise_llm.get('analise_convergencia', []),
         analise_solucao=analise_llm.get('analise_solucao', []),
@@ -173,11 +196,14 @@ def gerar_relatorio_pdf(
     total_geracoes: int,
     criterio_parada: str,
     melhor_fitness: float,
-    melhor_trajeto: List[str],
+    melhor_trajeto: Sequence[int],
     transportes: List[int],
     tempo_execucao: float,
     matriz_distancias: List[List[float]],
-    diretorio_saida: str = "."
+    diretorio_saida: str = ".",
+    tempos_fases: List[Dict] | None = None,
+    frente_pareto: List[Dict] | None = None,
+    grafico_pareto: bytes | None = None
 ) -> str:
     print("\n" + "="*80)
     print("GERANDO RELATÓRIO EM PDF")
@@ -194,7 +220,7 @@ def gerar_relatorio_pdf(
     analise_llm = gerar_analise_tsp_llm(dados_tsp)
     
     print("3/4 - Gerando HTML...")
-    html_content = gerar_html_relatorio(analise_llm, dados_tsp)
+    html_content = gerar_html_relatorio(analise_llm, dados_tsp, tempos_fases, frente_pareto, grafico_pareto)
     
     print("4/4 - Convertendo para PDF...")
     nome_arquivo = "relatorio_tsp.pdf"
@@ -0,0 +1,208 @@
+"""
+Visualização do algoritmo genético desacoplada do laço de evolução.
+O algoritmo publica o estado a cada geração e o renderizador decide quando desenhar:
+- RenderizadorLimitado: mesmo processo, desenha no máximo FPS quadros por segundo (relógio de parede);
+- RenderizadorProcesso: janela pygame em um processo separado, alimentado por uma fila com apenas o estado mais recente;
+Em ambos os casos a evolução roda em velocidade máxima e a janela continua respondendo.
+"""
+import multiprocessing
+import queue
+import time
+from typing import List, Sequence, Tuple
+
+import pygame
+
+from draw_functions import ConvergencePlot, LayeredRenderer
+from instrumentacao import fase
+from motor_ga import EstadoGA
+from parametros import ALTURA_TELA, COR_BRANCO, FPS, LARGURA_TELA, PROPORCAO_MAX_RENDERIZACAO
+from utils import trajeto_para_letras
+
+TITULO_JANELA = "PÓS TECH FIAP - Turma 7IADT/Módulo 02 - Traveling Salesman Problem (TSP) - Algoritmo Genético"
+MODOS_RENDERIZACAO = ("limitado", "processo")
+
+
+
+def criar_camadas(tela: pygame.Surface, posicoes: List[Tuple[int, int]], rotulos: List[str]) -> LayeredRenderer:
+    """
+    Cria o desenho em camadas da janela: fundo com cidades e rótulos (desenhado uma única vez),
+    melhor trajeto e gráfico de fitness persistente; cada quadro atualiza apenas as áreas alteradas.
+    """
+    grafico = ConvergencePlot(y_label="Gráfico de fitness")
+    return LayeredRenderer(tela, posicoes, rotulos, grafico, background_color=COR_BRANCO)
+
+
+
+def imprimir_progresso(geracao: int, geracoes_sem_melhoria: int, melhor_solucao: Tuple[Sequence[int], float, List[int]]) -> None:
+    """
+    Imprime no console (na mesma linha) o progresso da última geração desenhada.
+    """
+    print(f"Geração {geracao}: Fitness {melhor_solucao[1]:5.3f} (Sem melhoria: {geracoes_sem_melhoria}) - Trajeto {trajeto_para_letras(melhor_solucao[0])}, Transportes {melhor_solucao[2]}\r", end="", flush=True)
+
+
+
+def _parada_solicitada() -> bool:
+    """
+    Consome os eventos pendentes da janela; retorna True se o usuário fechou a janela ou pressionou 'q'.
+    """
+    parar = False
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            parar = True
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_q:
+            parar = True
+    return parar
+
+
+
+class RenderizadorLimitado:
+    """
+    Renderizador no mesmo processo, limitado por relógio de parede: gerações publicadas entre dois quadros
+    não são desenhadas (nem impressas), então o custo de desenho deixa de crescer com a velocidade da evolução.
+    Se desenhar um quadro demora mais que o intervalo entre quadros, o próximo quadro é adiado para que o desenho
+    não ocupe mais que PROPORCAO_MAX_RENDERIZACAO do tempo de execução.
+    """
+
+    def __init__(self, posicoes: List[Tuple[int, int]], rotulos: List[str], fps: int = FPS):
+        self.posicoes = posicoes
+        self.rotulos = rotulos
+        self.intervalo = 1 / fps
+        self._proximo_quadro = float('-inf')
+        pygame.init()
+        pygame.display.set_caption(TITULO_JANELA)
+        self.tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+        self.camadas = criar_camadas(self.tela, posicoes, rotulos)
+
+    def publicar(self, estado: EstadoGA) -> bool:
+        """
+        Recebe o estado da geração corrente; desenha apenas se já passou o intervalo de um quadro.
+        Retorna False quando o usuário solicita a parada.
+        """
+        inicio = time.perf_counter()
+        if inicio < self._proximo_quadro:
+            return True
+        with fase("eventos"):
+            parar = _parada_solicitada()
+        if parar:
+            return False
+        self._desenhar(estado)
+        fim = time.perf_counter()
+        duracao = fim - inicio
+        self._proximo_quadro = fim + max(
+            self.intervalo - duracao,
+            duracao * (1 - PROPORCAO_MAX_RENDERIZACAO) / PROPORCAO_MAX_RENDERIZACAO)
+        return True
+
+    def fechar(self, estado: EstadoGA) -> None:
+        """
+        Desenha o estado final (a última geração pode ter sido pulada pelo limite de quadros).
+        """
+        self._desenhar(estado)
+
+    def _desenhar(self, estado: EstadoGA) -> None:
+        melhor_solucao = estado.melhores_solucoes[-1]
+        grafico = self.camadas.plot
+        with fase("grafico"):
+            grafico.extend([solucao[1] for solucao in estado.melhores_solucoes[len(grafico):]])
+        with fase("desenho"):
+            self.camadas.draw_frame(melhor_solucao)
+        with fase("console"):
+            imprimir_progresso(estado.geracao, estado.geracoes_sem_melhoria, melhor_solucao)
+
+
+
+def _executar_janela(
+    fila: multiprocessing.Queue,
+    parar: multiprocessing.Event,
+    posicoes: List[Tuple[int, int]],
+    rotulos: List[str],
+    fps: int) -> None:
+    """
+    Laço do processo de renderização: consome as mensagens da fila, acumula o histórico de fitness no gráfico
+    e desenha no máximo fps quadros por segundo até receber None (fim da execução).
+    """
+    pygame.init()
+    pygame.display.set_caption(TITULO_JANELA)
+    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    relogio = pygame.time.Clock()
+    camadas = criar_camadas(tela, posicoes, rotulos)
+    ultima_mensagem = None
+    encerrar = False
+    while not encerrar:
+        if _parada_solicitada():
+            parar.set()
+        nova_mensagem = False
+        try:
+            while True:
+                mensagem = fila.get_nowait()
+                if mensagem is None:
+                    encerrar = True
+                    break
+                camadas.plot.extend(mensagem[1])
+                ultima_mensagem = mensagem
+                nova_mensagem = True
+        except queue.Empty:
+            pass
+        if nova_mensagem:
+            geracao, _, melhor_solucao, geracoes_sem_melhoria = ultima_mensagem
+            camadas.draw_frame(melhor_solucao)
+            imprimir_progresso(geracao, geracoes_sem_melhoria, melhor_solucao)
+        relogio.tick(fps)
+    pygame.quit()
+
+
+
+class RenderizadorProcesso:
+    """
+    Renderizador em processo separado. O algoritmo nunca espera pela janela:
+    - a fila tem capacidade 1 e, se estiver cheia, a publicação é adiada para a próxima geração;
+    - os valores de fitness das gerações não enviadas são acumulados e seguem na próxima mensagem;
+    - a parada solicitada na janela ('q' ou fechar) é sinalizada por um Event compartilhado;
+    """
+
+    def __init__(self, posicoes: List[Tuple[int, int]], rotulos: List[str], fps: int = FPS):
+        contexto = multiprocessing.get_context("spawn")
+        self._fila = contexto.Queue(maxsize=1)
+        self._parar = contexto.Event()
+        self._fitness_pendentes: List[float] = []
+        self._processo = contexto.Process(
+            target=_executar_janela,
+            args=(self._fila, self._parar, posicoes, rotulos, fps),
+            daemon=True)
+        self._processo.start()
+
+    def publicar(self, estado: EstadoGA) -> bool:
+        """
+        Envia o estado da geração corrente se a fila estiver livre. Retorna False quando o usuário solicita a parada.
+        """
+        # O desenho acontece no processo da janela: aqui só é medido o envio do estado
+        with fase("publicacao"):
+            self._fitness_pendentes.append(estado.melhores_solucoes[-1][1])
+            try:
+                self._fila.put_nowait(self._mensagem(estado))
+                self._fitness_pendentes = []
+            except queue.Full:
+                pass
+        return not self._parar.is_set()
+
+    def fechar(self, estado: EstadoGA) -> None:
+        """
+        Envia o estado final, sinaliza o fim da execução e aguarda o processo de renderização terminar.
+        """
+        if self._processo.is_alive():
+            self._fila.put(self._mensagem(estado))
+            self._fila.put(None)
+        self._processo.join()
+
+    def _mensagem(self, estado: EstadoGA) -> Tuple:
+        return estado.geracao, self._fitness_pendentes, estado.melhores_solucoes[-1], estado.geracoes_sem_melhoria
+
+
+
+def criar_renderizador(modo: str, posicoes: List[Tuple[int, int]], rotulos: List[str]) -> RenderizadorLimitado | RenderizadorProcesso:
+    """
+    Cria o renderizador do modo informado (ver MODOS_RENDERIZACAO).
+    """
+    if modo == "processo":
+        return RenderizadorProcesso(posicoes, rotulos)
+    return RenderizadorLimitado(posicoes, rotulos)
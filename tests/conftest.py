@@ -0,0 +1,28 @@
+"""
+Configuração dos testes: os módulos do projeto ficam na raiz do repositório, sem pacote instalável.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cenario import criar_gerador, gerar_cenario  # noqa: E402
+from custos import construir_tabelas_arestas  # noqa: E402
+
+NUM_CIDADES = 30
+
+
+@pytest.fixture(params=["simetrico", "assimetrico"])
+def cenario(request):
+    """
+    Cenário semeado: sem rotas de avião (simétrico) ou com rotas de avião unidirecionais (assimétrico).
+    """
+    perc_aviao = 0 if request.param == "simetrico" else 30
+    return gerar_cenario(NUM_CIDADES, perc_aviao, 30, criar_gerador(7))
+
+
+@pytest.fixture
+def tabelas(cenario):
+    return construir_tabelas_arestas(cenario.matriz_distancias, cenario.matriz_aviao, cenario.matriz_trem)
@@ -0,0 +1,100 @@
+"""
+Avaliação de fitness: implementação de referência x tabelas por aresta x avaliação vetorizada,
+avaliação incremental das mutações, cache de fitness e avaliação paralela.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from algoritmos_geneticos import (
+    calcular_fitness_populacao,
+    calcular_fitness_prioridade_tempo,
+    calcular_fitness_tabelas,
+    calcular_limites_estimados,
+    calcular_totais_populacao,
+    mutacao_2opt,
+    mutacao_inversao,
+    mutacao_swap,
+    obter_transportes,
+    populacao_inicial_aleatoria,
+    populacao_para_matriz,
+)
+from avaliacao_paralela import AvaliacaoParalela
+from cache_fitness import CacheFitness, avaliar_populacao_com_cache
+from motor_ga import ConfiguracaoGA, EstadoGA, avaliar_geracao, criar_avaliador, reproduzir
+from parametros import CRITERIO_PARADA_MAX_GERACOES, MIN_INDIVIDUOS_POR_PROCESSO
+
+
+def test_simetria_das_tabelas(cenario, tabelas):
+    assert tabelas.simetrica == (int(np.sum(cenario.matriz_aviao)) == 0)
+
+
+def test_fitness_tabelas_e_vetorizado_igual_a_referencia(cenario, tabelas):
+    random.seed(1)
+    limites = calcular_limites_estimados(cenario.matriz_distancias)
+    populacao = populacao_inicial_aleatoria(len(cenario.cidades), 50)
+    vetorizado = calcular_fitness_populacao(tabelas, populacao_para_matriz(populacao), *limites)
+    for individuo, fitness in zip(populacao, vetorizado):
+        _, fitness_referencia, transportes_referencia = calcular_fitness_prioridade_tempo(
+            cenario.matriz_distancias, cenario.matriz_aviao, cenario.matriz_trem, individuo, *limites)
+        _, fitness_tabelas, transportes_tabelas = calcular_fitness_tabelas(tabelas, individuo, *limites)
+        assert fitness_tabelas == fitness_referencia
+        assert fitness == pytest.approx(fitness_referencia, rel=1e-12)
+        assert transportes_tabelas == transportes_referencia == obter_transportes(tabelas, individuo)
+
+
+@pytest.mark.parametrize("mutacao", [mutacao_swap, mutacao_inversao, mutacao_2opt])
+def test_variacao_das_mutacoes_e_exata(tabelas, mutacao):
+    random.seed(2)
+    for individuo in populacao_inicial_aleatoria(len(tabelas.tempo), 200):
+        mutante, delta_tempo, delta_custo = mutacao(individuo, tabelas)
+        assert sorted(mutante) == sorted(individuo)
+        totais = calcular_totais_populacao(tabelas, populacao_para_matriz([individuo, mutante]))
+        assert (delta_tempo, delta_custo) == tuple((totais[1] - totais[0]).tolist())
+
+
+def test_mutantes_avaliados_pela_variacao_iguais_a_avaliacao_completa(cenario):
+    random.seed(3)
+    avaliador = criar_avaliador(cenario)
+    config = ConfiguracaoGA(tam_populacao=100, criterio_parada=CRITERIO_PARADA_MAX_GERACOES, max_geracoes=10, prob_mutacao=0.9)
+    estado = EstadoGA(populacao_inicial_aleatoria(len(cenario.cidades), config.tam_populacao))
+    for _ in range(5):
+        populacao_fitness = avaliar_geracao(estado, avaliador, config)
+        estado.populacao = reproduzir(populacao_fitness, avaliador, config)
+        com_cache = avaliar_populacao_com_cache(avaliador.cache, avaliador.tabelas, estado.populacao, *avaliador.limites, config.peso_tempo)
+        completo = calcular_fitness_populacao(avaliador.tabelas, populacao_para_matriz(estado.populacao), *avaliador.limites, config.peso_tempo)
+        assert np.array_equal(com_cache, completo)
+
+
+def test_chave_canonica_do_cache(tabelas):
+    random.seed(4)
+    cache = CacheFitness(tabelas.simetrica)
+    rota = populacao_inicial_aleatoria(len(tabelas.tempo), 1)[0]
+    chave = cache.forma_canonica(rota)[0]
+    for rotacao in range(len(rota)):
+        assert cache.forma_canonica(rota[rotacao:] + rota[:rotacao])[0] == chave
+    invertida = rota[::-1]
+    assert (cache.forma_canonica(invertida)[0] == chave) == tabelas.simetrica
+
+    cache.armazenar(rota, 10, 20, obter_transportes(tabelas, rota))
+    variantes = [rota[5:] + rota[:5]]
+    if tabelas.simetrica:
+        variantes.append(invertida)
+    for variante in variantes:
+        assert cache.obter(variante) == (10, 20, obter_transportes(tabelas, variante))
+    if not tabelas.simetrica:
+        assert cache.obter(invertida) is None
+
+
+def test_avaliacao_paralela_identica(tabelas, cenario):
+    random.seed(5)
+    limites = calcular_limites_estimados(cenario.matriz_distancias)
+    populacao = populacao_inicial_aleatoria(len(cenario.cidades), 2 * MIN_INDIVIDUOS_POR_PROCESSO + 7)
+    matriz = populacao_para_matriz(populacao)
+    with AvaliacaoParalela(tabelas, 100, 2) as paralela:
+        totais, transportes = paralela.avaliar(matriz)
+        com_pool = avaliar_populacao_com_cache(CacheFitness(tabelas.simetrica), tabelas, populacao, *limites, paralela=paralela)
+    assert np.array_equal(totais, calcular_totais_populacao(tabelas, matriz))
+    assert np.array_equal(transportes, tabelas.transporte_np[matriz, np.roll(matriz, -1, axis=1)])
+    assert np.array_equal(com_pool, calcular_fitness_populacao(tabelas, matriz, *limites))
@@ -0,0 +1,33 @@
+"""
+Operadores de cruzamento: todo filho é uma permutação válida das cidades dos pais.
+"""
+import random
+from array import array
+
+import pytest
+
+from algoritmos_geneticos import edge_recombination_crossover
+from crossover import cycle_crossover, order_crossover, pmx_crossover
+
+TAMANHOS = [2, 3, 10, 51]
+
+
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_erx_gera_permutacoes(n):
+    random.seed(n)
+    for _ in range(50):
+        p1 = array('H', random.sample(range(n), n))
+        p2 = array('H', random.sample(range(n), n))
+        for filho in edge_recombination_crossover(p1, p2):
+            assert isinstance(filho, array) and filho.typecode == 'H'
+            assert sorted(filho) == list(range(n))
+
+
+@pytest.mark.parametrize("operador", [order_crossover, pmx_crossover, cycle_crossover])
+@pytest.mark.parametrize("n", TAMANHOS)
+def test_cruzamento_por_indices_gera_permutacoes(operador, n):
+    random.seed(n)
+    for _ in range(50):
+        p1 = random.sample(range(n), n)
+        p2 = random.sample(range(n), n)
+        assert sorted(operador(p1, p2)) == list(range(n))
@@ -0,0 +1,45 @@
+"""
+Execução do algoritmo genético: retomada exata a partir de um checkpoint.
+"""
+import random
+
+from algoritmos_geneticos import populacao_inicial_aleatoria
+from checkpoint import carregar_checkpoint, salvar_checkpoint
+from motor_ga import ConfiguracaoGA, criar_avaliador, executar_ga
+from parametros import CRITERIO_PARADA_MAX_GERACOES
+
+GERACOES = 40
+GERACAO_INTERRUPCAO = 15
+
+
+CONFIG = ConfiguracaoGA(tam_populacao=60, criterio_parada=CRITERIO_PARADA_MAX_GERACOES, max_geracoes=GERACOES)
+
+
+def _executar(cenario, ao_final_da_geracao=None):
+    random.seed(11)
+    populacao = populacao_inicial_aleatoria(len(cenario.cidades), CONFIG.tam_populacao)
+    return executar_ga(criar_avaliador(cenario), CONFIG, populacao, ao_final_da_geracao)
+
+
+def test_retomada_exata(cenario, tmp_path):
+    caminho = str(tmp_path / "execucao.npz")
+    continua = _executar(cenario)
+
+    def interromper(estado):
+        if estado.geracao < GERACAO_INTERRUPCAO:
+            return True
+        salvar_checkpoint(caminho, cenario, CONFIG, estado)
+        return False
+
+    interrompida = _executar(cenario, interromper)
+    assert interrompida.geracao == GERACAO_INTERRUPCAO
+
+    checkpoint = carregar_checkpoint(caminho)
+    random.setstate(checkpoint.estado_aleatorio)
+    retomada = executar_ga(criar_avaliador(checkpoint.cenario), checkpoint.config, [], estado=checkpoint.estado)
+
+    assert retomada.geracao == continua.geracao == GERACOES
+    assert retomada.melhor_fitness == continua.melhor_fitness
+    assert [s[1] for s in retomada.melhores_solucoes] == [s[1] for s in continua.melhores_solucoes]
+    assert [s[0] for s in retomada.melhores_solucoes] == [s[0] for s in continua.melhores_solucoes]
+    assert retomada.populacao_fitness == continua.populacao_fitness
@@ -0,0 +1,21 @@
+"""
+Instâncias TSPLIB: métricas de distância conferidas pelo comprimento das rotas ótimas publicadas.
+"""
+import os
+
+import pytest
+
+from tsplib import calcular_matriz_tsplib, comprimento_tour, ler_instancia, ler_tour
+
+INSTANCIAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instancias")
+
+
+@pytest.mark.parametrize("nome, tipo_peso, otimo", [("att48", "ATT", 10628), ("burma14", "GEO", 3323), ("ulysses16", "GEO", 6859)])
+def test_comprimento_da_rota_otima(nome, tipo_peso, otimo):
+    instancia = ler_instancia(os.path.join(INSTANCIAS, f"{nome}.tsp"))
+    tour = ler_tour(os.path.join(INSTANCIAS, f"{nome}.opt.tour"))
+    assert instancia.tipo_peso == tipo_peso
+    assert sorted(tour) == list(range(instancia.dimensao))
+    matriz = calcular_matriz_tsplib(instancia)
+    assert (matriz == matriz.T).all()
+    assert comprimento_tour(matriz, tour) == otimo
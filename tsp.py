@@ -2,12 +2,16 @@ import pygame
 from pygame.locals import *
 import random
 import itertools
-from genetic_algorithm import mutate, order_crossover, generate_random_population, calculate_fitness, sort_population, default_problems
-from draw_functions import draw_paths, draw_plot, draw_cities
+from genetic_algorithm import mutate, calculate_fitness, calculate_tour_length, sort_population, default_problems, route_from_indices
+from crossover import get_crossover
+from populacao_inicial import composicao_populacao, gerar_populacao_inicial
+from acervo_solucoes import AcervoSolucoes, impressao_digital, rotas_iniciais_acervo
+from tsplib import calcular_matriz_tsplib, comprimento_tour, ler_instancia, ler_tour, posicoes_tela
+from draw_functions import draw_route, draw_plot, draw_cities
+import os
 import sys
 import numpy as np
 import pygame
-from benchmark_att48 import *
 
 
 # Define constant values
@@ -22,6 +26,12 @@ N_CITIES = 15
 POPULATION_SIZE = 100
 N_GENERATIONS = None
 MUTATION_PROBABILITY = 0.5
+CROSSOVER = "ox"  # "ox" (order), "pmx" (partially mapped) or "cx" (cycle), see crossover.py
+INITIAL_POPULATION = "mista"  # "aleatoria", a single heuristic or "mista", see populacao_inicial.py
+RANDOM_FRACTION = 0.5  # fraction of random tours mixed into heuristic populations
+SOLUTION_ARCHIVE = None  # e.g. "acervo_tsp.json": best tours of previous runs on the same cities, see acervo_solucoes.py;
+                         # only useful with fixed cities (TSPLIB_INSTANCE or default_problems), random cities never repeat
+ARCHIVE_FRACTION = 0.2  # fraction of the initial population seeded from the archive
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -41,19 +51,20 @@ cities_locations = [(random.randint(NODE_RADIUS + PLOT_X_OFFSET, WIDTH - NODE_RA
 # cities_locations = default_problems[15]
 
 
-# Using att48 benchmark
-# WIDTH, HEIGHT = 1500, 800
-# att_cities_locations = np.array(att_48_cities_locations)
-# max_x = max(point[0] for point in att_cities_locations)
-# max_y = max(point[1] for point in att_cities_locations)
-# scale_x = (WIDTH - PLOT_X_OFFSET - NODE_RADIUS) / max_x
-# scale_y = HEIGHT / max_y
-# cities_locations = [(int(point[0] * scale_x + PLOT_X_OFFSET),
-#                      int(point[1] * scale_y)) for point in att_cities_locations]
-# target_solution = [cities_locations[i-1] for i in att_48_cities_order]
-# fitness_target_solution = calculate_fitness(target_solution)
-# print(f"Best Solution: {fitness_target_solution}")
-# ----- Using att48 benchmark
+# Using a TSPLIB instance, e.g. "instancias/att48.tsp" (see tsplib.py):
+# the fitness is the tour length in the instance metric (ATT, GEO, EUC_2D, ...), not in screen pixels;
+# the screen positions are only used for drawing
+TSPLIB_INSTANCE = None
+distance_matrix = None
+if TSPLIB_INSTANCE:
+    WIDTH, HEIGHT = 1500, 800
+    instance = ler_instancia(TSPLIB_INSTANCE)
+    distance_matrix = calcular_matriz_tsplib(instance)
+    cities_locations = posicoes_tela(instance, (PLOT_X_OFFSET + NODE_RADIUS, NODE_RADIUS, WIDTH - NODE_RADIUS, HEIGHT - NODE_RADIUS))
+    optimal_tour_file = TSPLIB_INSTANCE.replace(".tsp", ".opt.tour")
+    if os.path.exists(optimal_tour_file):
+        print(f"Best Solution: {comprimento_tour(distance_matrix, ler_tour(optimal_tour_file))}")
+# ----- Using a TSPLIB instance
 
 
 # Initialize Pygame
@@ -64,9 +75,19 @@ clock = pygame.time.Clock()
 generation_counter = itertools.count(start=1)  # Start the counter at 1
 
 
-# Create Initial Population
-# TODO:- use some heuristic like Nearest Neighbour our Convex Hull to initialize
-population = generate_random_population(cities_locations, POPULATION_SIZE)
+# Create Initial Population (individuals are permutations of city indices)
+# Heuristic tours (nearest neighbour, greedy edge, insertion, convex hull) mixed with random ones
+crossover = get_crossover(CROSSOVER)
+# Tours found by previous runs on the same cities (and metric) seed part of the population
+archive = fingerprint = None
+archived_tours = []
+if SOLUTION_ARCHIVE:
+    archive = AcervoSolucoes(SOLUTION_ARCHIVE)
+    fingerprint = impressao_digital(cities_locations, distance_matrix, objetivo={"fitness": "tour_length"})
+    archived_tours = rotas_iniciais_acervo(archive, fingerprint, POPULATION_SIZE, ARCHIVE_FRACTION)
+    print(f"Solution archive: {len(archived_tours)} tours seeded from previous runs")
+population = archived_tours + gerar_populacao_inicial(
+    cities_locations, POPULATION_SIZE - len(archived_tours), composicao_populacao(INITIAL_POPULATION, RANDOM_FRACTION))
 best_fitness_values = []
 best_solutions = []
 
@@ -85,14 +106,18 @@ while running:
 
     screen.fill(WHITE)
 
-    population_fitness = [calculate_fitness(
-        individual) for individual in population]
+    if distance_matrix is not None:
+        population_fitness = [calculate_tour_length(individual, distance_matrix) for individual in population]
+    else:
+        population_fitness = [calculate_fitness(
+            route_from_indices(individual, cities_locations)) for individual in population]
 
     population, population_fitness = sort_population(
         population,  population_fitness)
 
-    best_fitness = calculate_fitness(population[0])
-    best_solution = population[0]
+    best_fitness = population_fitness[0]
+    ranked_population = list(zip(population, population_fitness))
+    best_solution = route_from_indices(population[0], cities_locations)
 
     best_fitness_values.append(best_fitness)
     best_solutions.append(best_solution)
@@ -100,9 +125,9 @@ while running:
     draw_plot(screen, list(range(len(best_fitness_values))),
               best_fitness_values, y_label="Fitness - Distance (pxls)")
 
-    draw_cities(screen, cities_locations, RED, NODE_RADIUS)
-    draw_paths(screen, best_solution, BLUE, width=3)
-    draw_paths(screen, population[1], rgb_color=(128, 128, 128), width=1)
+    draw_cities(screen, cities_locations)
+    draw_route(screen, best_solution, BLUE, width=3)
+    draw_route(screen, route_from_indices(population[1], cities_locations), rgb_color=(128, 128, 128), width=1)
 
     print(f"Generation {generation}: Best fitness = {round(best_fitness, 2)}")
 
@@ -118,8 +143,7 @@ while running:
         probability = 1 / np.array(population_fitness)
         parent1, parent2 = random.choices(population, weights=probability, k=2)
 
-        # child1 = order_crossover(parent1, parent2)
-        child1 = order_crossover(parent1, parent1)
+        child1 = crossover(parent1, parent2)
 
         child1 = mutate(child1, MUTATION_PROBABILITY)
 
@@ -131,7 +155,11 @@ while running:
     clock.tick(FPS)
 
 
-# TODO: save the best individual in a file if it is better than the one saved.
+# Save the best tours of the last generation in the archive (only the ones that improve it are kept)
+if archive is not None:
+    new_tours = archive.registrar(fingerprint, ranked_population, simetrica=True)
+    archive.salvar()
+    print(f"Solution archive: {new_tours} new tours saved to {SOLUTION_ARCHIVE}")
 
 # exit software
 pygame.quit()
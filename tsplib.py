@@ -0,0 +1,340 @@
+"""
+Leitura de instâncias da TSPLIB (.tsp) e de rotas ótimas (.opt.tour), inclusive compactadas em .gz.
+O arquivo é lido linha a linha (sem carregar o texto inteiro): o cabeçalho define a dimensão e cada seção
+(NODE_COORD_SECTION, EDGE_WEIGHT_SECTION, DISPLAY_DATA_SECTION, TOUR_SECTION) é gravada direto em arrays numpy.
+As distâncias seguem as funções de peso da TSPLIB (EUC_2D, CEIL_2D, ATT, GEO, MAN_2D, MAX_2D ou EXPLICIT),
+calculadas de forma vetorizada em blocos de linhas, de modo que o comprimento de uma rota é comparável
+com o ótimo publicado da instância.
+"""
+import gzip
+import math
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from cenario import Cenario, calcular_qtd_rotas_aviao, calcular_qtd_rotas_trem, gerar_matriz_aviao, gerar_matriz_trem
+from parametros import ALTURA_TELA, LARGURA_TELA, MARGEM, OFFSET_X_GRAFICO
+from utils import indice_para_letra
+
+SECOES_TSPLIB = (
+    "NODE_COORD_SECTION",
+    "EDGE_WEIGHT_SECTION",
+    "DISPLAY_DATA_SECTION",
+    "TOUR_SECTION",
+    "FIXED_EDGES_SECTION",
+    "DEMAND_SECTION",
+    "DEPOT_SECTION",
+)
+TIPOS_PESO_COORDENADAS = ("EUC_2D", "CEIL_2D", "ATT", "GEO", "MAN_2D", "MAX_2D")
+LINHAS_POR_BLOCO = 512 # linhas da matriz de distâncias calculadas por vez (limita a memória temporária)
+
+# Raio da Terra e valor de pi definidos pela TSPLIB para as distâncias GEO
+RAIO_TERRA_GEO = 6378.388
+PI_GEO = 3.141592
+
+
+class InstanciaTSPLIB(NamedTuple):
+    """
+    Instância lida de um arquivo .tsp:
+    - cabecalho: campos do cabeçalho (NAME, TYPE, DIMENSION, EDGE_WEIGHT_TYPE, ...), chaves em maiúsculas;
+    - coordenadas: matriz n x 2 da NODE_COORD_SECTION (None em instâncias EXPLICIT sem coordenadas);
+    - pesos: matriz n x n da EDGE_WEIGHT_SECTION já expandida (None em instâncias com coordenadas);
+    - exibicao: matriz n x 2 da DISPLAY_DATA_SECTION (None se ausente);
+    """
+    cabecalho: Dict[str, str]
+    coordenadas: np.ndarray | None
+    pesos: np.ndarray | None
+    exibicao: np.ndarray | None
+
+    @property
+    def nome(self) -> str:
+        return self.cabecalho.get("NAME", "")
+
+    @property
+    def dimensao(self) -> int:
+        return int(self.cabecalho["DIMENSION"])
+
+    @property
+    def tipo_peso(self) -> str:
+        return self.cabecalho.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+
+
+
+def _abrir(caminho: str):
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", encoding="utf-8")
+    return open(caminho, "r", encoding="utf-8")
+
+
+
+def _tokens(linhas: Iterator[str]) -> Iterator[str]:
+    """
+    Percorre os valores (separados por espaços) das linhas seguintes do arquivo.
+    """
+    for linha in linhas:
+        yield from linha.split()
+
+
+
+def _ler_coordenadas(linhas: Iterator[str], dimensao: int) -> np.ndarray:
+    """
+    Lê dimensao linhas "índice x y" (índices a partir de 1, em qualquer ordem).
+    """
+    coordenadas = np.zeros((dimensao, 2), dtype=np.float64)
+    lidas = 0
+    for linha in linhas:
+        campos = linha.split()
+        if not campos:
+            continue
+        coordenadas[int(campos[0]) - 1] = float(campos[1]), float(campos[2])
+        lidas += 1
+        if lidas == dimensao:
+            break
+    return coordenadas
+
+
+
+def _indices_formato(formato: str, dimensao: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Posições (linha, coluna) preenchidas, na ordem do arquivo, por cada EDGE_WEIGHT_FORMAT.
+    Como a matriz é simétrica, os formatos por coluna equivalem aos formatos por linha do triângulo oposto.
+    """
+    formatos = {
+        "FULL_MATRIX": lambda: np.indices((dimensao, dimensao)).reshape(2, -1),
+        "UPPER_ROW": lambda: np.triu_indices(dimensao, 1),
+        "LOWER_ROW": lambda: np.tril_indices(dimensao, -1),
+        "UPPER_DIAG_ROW": lambda: np.triu_indices(dimensao),
+        "LOWER_DIAG_ROW": lambda: np.tril_indices(dimensao),
+        "UPPER_COL": lambda: np.tril_indices(dimensao, -1),
+        "LOWER_COL": lambda: np.triu_indices(dimensao, 1),
+        "UPPER_DIAG_COL": lambda: np.tril_indices(dimensao),
+        "LOWER_DIAG_COL": lambda: np.triu_indices(dimensao),
+    }
+    if formato not in formatos:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT não suportado: {formato!r} (esperado {', '.join(formatos)})")
+    linhas, colunas = formatos[formato]()
+    return linhas, colunas
+
+
+
+def _ler_pesos(linhas: Iterator[str], dimensao: int, formato: str) -> np.ndarray:
+    """
+    Lê a EDGE_WEIGHT_SECTION no formato informado e devolve a matriz n x n completa (simétrica, exceto em FULL_MATRIX).
+    Os valores são lidos linha a linha para um vetor pré-alocado e distribuídos de uma vez na matriz.
+    """
+    linhas_matriz, colunas_matriz = _indices_formato(formato, dimensao)
+    valores = np.empty(len(linhas_matriz), dtype=np.float64)
+    lidos = 0
+    for linha in linhas:
+        campos = np.array(linha.split(), dtype=np.float64)
+        quantidade = min(len(campos), len(valores) - lidos)
+        valores[lidos:lidos + quantidade] = campos[:quantidade]
+        lidos += quantidade
+        if lidos == len(valores):
+            break
+    if lidos < len(valores):
+        raise ValueError(f"EDGE_WEIGHT_SECTION incompleta: {lidos} de {len(valores)} valores")
+    pesos = np.zeros((dimensao, dimensao), dtype=np.int64)
+    pesos[linhas_matriz, colunas_matriz] = valores
+    if formato != "FULL_MATRIX":
+        pesos[colunas_matriz, linhas_matriz] = valores
+    np.fill_diagonal(pesos, 0)
+    return pesos
+
+
+
+def _ler_tour(linhas: Iterator[str]) -> List[int]:
+    """
+    Lê os índices (a partir de 1) de uma TOUR_SECTION até o terminador -1 e os converte para base 0.
+    """
+    tour: List[int] = []
+    for token in _tokens(linhas):
+        valor = int(token)
+        if valor == -1:
+            break
+        tour.append(valor - 1)
+    return tour
+
+
+
+def _percorrer_arquivo(caminho: str) -> Tuple[Dict[str, str], Dict[str, object]]:
+    """
+    Percorre o arquivo uma única vez, separando o cabeçalho (CHAVE : valor) das seções de dados.
+    """
+    cabecalho: Dict[str, str] = {}
+    secoes: Dict[str, object] = {}
+    with _abrir(caminho) as arquivo:
+        linhas = (linha.strip() for linha in arquivo)
+        for linha in linhas:
+            if not linha:
+                continue
+            palavra = linha.split(":")[0].strip().upper()
+            if palavra == "EOF":
+                break
+            if palavra in SECOES_TSPLIB:
+                dimensao = int(cabecalho.get("DIMENSION", 0))
+                if palavra in ("NODE_COORD_SECTION", "DISPLAY_DATA_SECTION"):
+                    secoes[palavra] = _ler_coordenadas(linhas, dimensao)
+                elif palavra == "EDGE_WEIGHT_SECTION":
+                    secoes[palavra] = _ler_pesos(linhas, dimensao, cabecalho.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+                elif palavra == "TOUR_SECTION":
+                    secoes[palavra] = _ler_tour(linhas)
+                else:
+                    # Seções sem uso no TSP simétrico (arestas fixas, demandas, depósitos): descartadas até o -1
+                    _ler_tour(linhas)
+                continue
+            chave, _, valor = linha.partition(":")
+            cabecalho[chave.strip().upper()] = valor.strip()
+    return cabecalho, secoes
+
+
+
+def ler_instancia(caminho: str) -> InstanciaTSPLIB:
+    """
+    Lê uma instância .tsp (ou .tsp.gz) da TSPLIB. Lança ValueError se faltar a dimensão ou os dados das distâncias.
+    """
+    cabecalho, secoes = _percorrer_arquivo(caminho)
+    if "DIMENSION" not in cabecalho:
+        raise ValueError(f"Instância sem DIMENSION: {caminho}")
+    instancia = InstanciaTSPLIB(
+        cabecalho,
+        secoes.get("NODE_COORD_SECTION"),
+        secoes.get("EDGE_WEIGHT_SECTION"),
+        secoes.get("DISPLAY_DATA_SECTION"))
+    if instancia.tipo_peso == "EXPLICIT" and instancia.pesos is None:
+        raise ValueError(f"Instância EXPLICIT sem EDGE_WEIGHT_SECTION: {caminho}")
+    if instancia.tipo_peso != "EXPLICIT":
+        if instancia.tipo_peso not in TIPOS_PESO_COORDENADAS:
+            raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {instancia.tipo_peso!r} (esperado {', '.join(TIPOS_PESO_COORDENADAS)} ou EXPLICIT)")
+        if instancia.coordenadas is None:
+            raise ValueError(f"Instância {instancia.tipo_peso} sem NODE_COORD_SECTION: {caminho}")
+    return instancia
+
+
+
+def ler_tour(caminho: str) -> List[int]:
+    """
+    Lê a rota de um arquivo .tour / .opt.tour (índices em base 0, na ordem da TOUR_SECTION).
+    """
+    _, secoes = _percorrer_arquivo(caminho)
+    if "TOUR_SECTION" not in secoes:
+        raise ValueError(f"Arquivo sem TOUR_SECTION: {caminho}")
+    return secoes["TOUR_SECTION"]
+
+
+
+def _nint(valores: np.ndarray) -> np.ndarray:
+    """
+    Arredondamento da TSPLIB: (int) (x + 0.5).
+    """
+    return np.floor(valores + 0.5).astype(np.int64)
+
+
+
+def _coordenadas_geo(coordenadas: np.ndarray) -> np.ndarray:
+    """
+    Converte as coordenadas GEO (graus.minutos) em radianos, como na TSPLIB: DDD.MM -> (DDD + MM / 60) * PI / 180.
+    """
+    graus = np.trunc(coordenadas)
+    minutos = coordenadas - graus
+    return PI_GEO * (graus + 5.0 * minutos / 3.0) / 180.0
+
+
+
+def _distancias_bloco(tipo_peso: str, origem: np.ndarray, destino: np.ndarray) -> np.ndarray:
+    """
+    Distâncias (inteiras, pela função de peso da TSPLIB) entre um bloco de cidades de origem e todas as cidades.
+    """
+    if tipo_peso == "GEO":
+        latitude_i, longitude_i = origem[:, None, 0], origem[:, None, 1]
+        latitude_j, longitude_j = destino[None, :, 0], destino[None, :, 1]
+        q1 = np.cos(longitude_i - longitude_j)
+        q2 = np.cos(latitude_i - latitude_j)
+        q3 = np.cos(latitude_i + latitude_j)
+        argumento = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return (RAIO_TERRA_GEO * np.arccos(argumento) + 1.0).astype(np.int64)
+    dx = origem[:, None, 0] - destino[None, :, 0]
+    dy = origem[:, None, 1] - destino[None, :, 1]
+    if tipo_peso == "MAN_2D":
+        return _nint(np.abs(dx) + np.abs(dy))
+    if tipo_peso == "MAX_2D":
+        return np.maximum(_nint(np.abs(dx)), _nint(np.abs(dy)))
+    if tipo_peso == "ATT":
+        r = np.sqrt((dx * dx + dy * dy) / 10.0)
+        t = _nint(r)
+        return np.where(t < r, t + 1, t)
+    euclidiana = np.sqrt(dx * dx + dy * dy)
+    if tipo_peso == "CEIL_2D":
+        return np.ceil(euclidiana).astype(np.int64)
+    return _nint(euclidiana)
+
+
+
+def calcular_matriz_tsplib(instancia: InstanciaTSPLIB) -> np.ndarray:
+    """
+    Matriz n x n (int64) de distâncias da instância pela sua função de peso, calculada em blocos de LINHAS_POR_BLOCO linhas.
+    """
+    if instancia.tipo_peso == "EXPLICIT":
+        return instancia.pesos
+    coordenadas = instancia.coordenadas
+    if instancia.tipo_peso == "GEO":
+        coordenadas = _coordenadas_geo(coordenadas)
+    n = len(coordenadas)
+    matriz = np.empty((n, n), dtype=np.int64)
+    for inicio in range(0, n, LINHAS_POR_BLOCO):
+        matriz[inicio:inicio + LINHAS_POR_BLOCO] = _distancias_bloco(instancia.tipo_peso, coordenadas[inicio:inicio + LINHAS_POR_BLOCO], coordenadas)
+    np.fill_diagonal(matriz, 0)
+    return matriz
+
+
+
+def comprimento_tour(matriz: np.ndarray, tour) -> int:
+    """
+    Comprimento da rota fechada pela matriz de distâncias (ex.: para comparar com o ótimo da instância).
+    """
+    tour = np.asarray(tour, dtype=np.int64)
+    return int(matriz[tour, np.roll(tour, -1)].sum())
+
+
+
+def posicoes_tela(
+    instancia: InstanciaTSPLIB,
+    area: Tuple[int, int, int, int] = (OFFSET_X_GRAFICO + MARGEM, MARGEM, LARGURA_TELA - MARGEM, ALTURA_TELA - MARGEM)) -> List[Tuple[int, int]]:
+    """
+    Posições das cidades para desenho, ajustadas à área (x_min, y_min, x_max, y_max) da tela mantendo a proporção.
+    Usa a DISPLAY_DATA_SECTION, se houver, ou as coordenadas da instância (GEO: longitude no eixo x e latitude
+    no eixo y, com o norte para cima). Instâncias EXPLICIT sem coordenadas são desenhadas em círculo.
+    """
+    n = instancia.dimensao
+    if instancia.exibicao is not None:
+        pontos = instancia.exibicao.copy()
+    elif instancia.coordenadas is not None and instancia.tipo_peso == "GEO":
+        pontos = np.column_stack([instancia.coordenadas[:, 1], -instancia.coordenadas[:, 0]])
+    elif instancia.coordenadas is not None:
+        pontos = instancia.coordenadas.copy()
+    else:
+        angulos = 2 * math.pi * np.arange(n) / max(n, 1)
+        pontos = np.column_stack([np.cos(angulos), np.sin(angulos)])
+    x_min, y_min, x_max, y_max = area
+    minimo = pontos.min(axis=0)
+    extensao = np.maximum(pontos.max(axis=0) - minimo, 1e-9)
+    escala = min((x_max - x_min) / extensao[0], (y_max - y_min) / extensao[1])
+    pontos = (pontos - minimo) * escala + (x_min, y_min)
+    return [(int(round(x)), int(round(y))) for x, y in pontos]
+
+
+
+def gerar_cenario_tsplib(instancia: InstanciaTSPLIB, perc_cnx_aviao: int, perc_cnx_trem: int) -> Cenario:
+    """
+    Cenário multimodal sobre uma instância da TSPLIB: as distâncias entre as cidades são as da função de peso
+    da instância (não as distâncias em pixels das posições de desenho) e as rotas de avião e trem são sorteadas
+    como em cenario.gerar_cenario. Em instâncias EXPLICIT sem coordenadas, as posições servem apenas para desenho.
+    """
+    n = instancia.dimensao
+    posicoes = posicoes_tela(instancia)
+    cidades = {indice_para_letra(i): posicao for i, posicao in enumerate(posicoes)}
+    matriz_distancias = calcular_matriz_tsplib(instancia).astype(np.float64)
+    matriz_aviao = gerar_matriz_aviao(n, calcular_qtd_rotas_aviao(n, perc_cnx_aviao))
+    matriz_trem = gerar_matriz_trem(n, calcular_qtd_rotas_trem(n, perc_cnx_trem))
+    posicoes_geometricas = instancia.coordenadas is not None
+    return Cenario(cidades, matriz_distancias, matriz_aviao, matriz_trem, posicoes_geometricas)
@@ -4,20 +4,27 @@ Biblioteca de funções utilitárias do projeto
 import os
 import platform
 import re
+from typing import List
+
+from parametros import MAX_CIDADES_IMPRESSAO
 
 
 def imprimir_matriz(matriz, largura: int = 8, casas_decimais: int = 0):
     """
     Imprime uma matriz (lista de listas) formatada no console.
-    - matriz: lista de listas (n x n)
+    - matriz: lista de listas ou array NumPy (n x n)
     - largura: largura fixa de cada coluna (inclui sinal/decimal)
     - casas_decimais: casas decimais para números flutuantes
     """
-    if not matriz:
+    if len(matriz) == 0:
         print("Matriz vazia")
         return
 
     n = len(matriz)
+    if n > MAX_CIDADES_IMPRESSAO:
+        print(f"Matriz {n} x {n} omitida (impressão limitada a {MAX_CIDADES_IMPRESSAO} cidades)\n")
+        return
+
     fmt = f"{{:>{largura}.{casas_decimais}f}}"
 
     # Impressão do cabeçalho
@@ -36,6 +43,9 @@ def imprimir_matriz(matriz, largura: int = 8, casas_decimais: int = 0):
 
 
 def indice_para_letra(indice: int) -> str:
+    """
+    Converte o índice inteiro de uma cidade no seu rótulo de exibição (A, B, ..., Z, AA, AB, ...).
+    """
     letras = []
     i = indice
     while True:
@@ -47,6 +57,14 @@ def indice_para_letra(indice: int) -> str:
 
 
 
+def trajeto_para_letras(trajeto) -> List[str]:
+    """
+    Converte um trajeto (sequência de índices inteiros de cidades) em rótulos para exibição.
+    """
+    return [indice_para_letra(cidade) for cidade in trajeto]
+
+
+
 def ler_inteiro_positivo(min: int = 0, max: int = 100) -> int | None:
     
     """
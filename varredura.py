@@ -0,0 +1,285 @@
+"""
+Varredura de parâmetros do fitness ponderado: executa o algoritmo genético (sem interface) para uma lista de pesos
+do tempo, ou para a grade pesos x tamanhos de população x probabilidades de mutação (e sementes), sobre um mesmo cenário.
+- O cenário, as tabelas por aresta e os limites de normalização são calculados uma única vez no processo principal
+  e enviados a cada processo do pool na inicialização (como no modelo de ilhas), nunca por execução;
+- As execuções são distribuídas em um pool de processos; cada uma usa o próprio cache de fitness
+  (o fitness depende do peso do tempo);
+- As melhores soluções de todas as execuções são reunidas em uma tabela de resumo (Markdown) e em um JSON;
+Para ver a frente tempo x custo inteira em uma única execução, ver o modo multiobjetivo (nsga2).
+
+Uso:
+    python varredura.py [--config varredura.json] [--pesos 0 0.25 0.5 0.75 1] [--populacoes 100 200]
+                        [--probs-mutacao 0.3 0.5] [--sementes 1 2] [--processos 4] [--saida resultado_varredura.json]
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from algoritmos_geneticos import criar_individuo
+from cache_fitness import CacheFitness
+from custos import TabelasArestas
+from modo_lote import CONFIGURACAO_PADRAO_LOTE, gerar_cenario_lote, validar_configuracao_lote
+from motor_ga import AvaliadorGA, ConfiguracaoGA, criar_avaliador, executar_ga, otimizar_melhor_solucao
+from nsga2 import calcular_objetivos
+from parametros import BUSCA_LOCAL_VIZINHOS, MAX_POPULACAO, MIN_POPULACAO
+from populacao_inicial import composicao_populacao, gerar_populacao_inicial
+
+# Configuração padrão da varredura. "base" usa as chaves da execução em lote (modo_lote.CONFIGURACAO_PADRAO_LOTE);
+# populacoes / probs_mutacao vazias usam o valor da base. A semente da base fixa o cenário; sementes, as execuções.
+CONFIGURACAO_PADRAO_VARREDURA: Dict[str, Any] = {
+    "base": {"semente": 1},
+    "pesos_tempo": [0.0, 0.25, 0.5, 0.75, 1.0],
+    "populacoes": [],
+    "probs_mutacao": [],
+    "sementes": [1],
+    "processos": None,  # None: um processo por núcleo, limitado ao número de execuções
+}
+
+# Chaves da execução em lote que não se aplicam a execuções independentes em um pool
+CHAVES_LOTE_NAO_SUPORTADAS = ("ilhas", "processos_avaliacao", "checkpoint", "acervo", "pareto", "tempos_fases", "salvar_cenario")
+
+
+
+def carregar_configuracao_varredura(caminho: str | None, sobrescritas: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parte de CONFIGURACAO_PADRAO_VARREDURA, aplica o arquivo JSON informado ("base" é mesclada chave a chave
+    sobre CONFIGURACAO_PADRAO_LOTE) e os valores da linha de comando (None significa "não informado").
+    Lança ValueError na primeira violação.
+    """
+    configuracao = json.loads(json.dumps(CONFIGURACAO_PADRAO_VARREDURA))
+    if caminho:
+        with open(caminho, encoding="utf-8") as arquivo:
+            do_arquivo = json.load(arquivo)
+        desconhecidas = set(do_arquivo) - set(CONFIGURACAO_PADRAO_VARREDURA)
+        if desconhecidas:
+            raise ValueError(f"Chaves desconhecidas no arquivo de configuração: {', '.join(sorted(desconhecidas))}")
+        configuracao["base"].update(do_arquivo.pop("base", {}))
+        configuracao.update(do_arquivo)
+    configuracao.update({chave: valor for chave, valor in sobrescritas.items() if valor is not None})
+
+    desconhecidas = set(configuracao["base"]) - set(CONFIGURACAO_PADRAO_LOTE)
+    if desconhecidas:
+        raise ValueError(f"Chaves desconhecidas em 'base': {', '.join(sorted(desconhecidas))}")
+    configuracao["base"] = {**CONFIGURACAO_PADRAO_LOTE, **configuracao["base"]}
+    validar_configuracao_lote(configuracao["base"])
+    for chave in CHAVES_LOTE_NAO_SUPORTADAS:
+        if configuracao["base"][chave] and configuracao["base"][chave] != CONFIGURACAO_PADRAO_LOTE[chave]:
+            raise ValueError(f"Parâmetro '{chave}' não é suportado na varredura")
+    if not configuracao["pesos_tempo"] or not all(isinstance(peso, (int, float)) and 0 <= peso <= 1 for peso in configuracao["pesos_tempo"]):
+        raise ValueError(f"Parâmetro 'pesos_tempo' inválido: {configuracao['pesos_tempo']!r} (esperada lista de valores entre 0 e 1)")
+    if not all(isinstance(tam, int) and MIN_POPULACAO <= tam <= MAX_POPULACAO for tam in configuracao["populacoes"]):
+        raise ValueError(f"Parâmetro 'populacoes' inválido: {configuracao['populacoes']!r} (esperados inteiros entre {MIN_POPULACAO} e {MAX_POPULACAO})")
+    if not all(isinstance(prob, (int, float)) and 0 <= prob <= 1 for prob in configuracao["probs_mutacao"]):
+        raise ValueError(f"Parâmetro 'probs_mutacao' inválido: {configuracao['probs_mutacao']!r} (esperada lista de valores entre 0 e 1)")
+    if not configuracao["sementes"] or not all(isinstance(semente, int) for semente in configuracao["sementes"]):
+        raise ValueError(f"Parâmetro 'sementes' inválido: {configuracao['sementes']!r} (esperada lista de inteiros)")
+    if configuracao["processos"] is not None and (not isinstance(configuracao["processos"], int) or configuracao["processos"] < 1):
+        raise ValueError(f"Parâmetro 'processos' inválido: {configuracao['processos']!r} (esperado inteiro maior que 0)")
+    return configuracao
+
+
+
+def combinacoes_varredura(configuracao: Dict[str, Any]) -> List[Tuple[float, int, float, int]]:
+    """
+    Execuções da varredura como tuplas (peso_tempo, tam_populacao, prob_mutacao, semente), na ordem da grade.
+    """
+    base = configuracao["base"]
+    return list(itertools.product(
+        configuracao["pesos_tempo"],
+        configuracao["populacoes"] or [base["populacao"]],
+        configuracao["probs_mutacao"] or [base["prob_mutacao"]],
+        configuracao["sementes"]))
+
+
+
+# Dados do cenário em cada processo do pool (recebidos uma única vez, na inicialização do processo)
+_cenario_processo: Dict[str, Any] = {}
+
+
+
+def _inicializar_processo(
+    tabelas: TabelasArestas,
+    limites: Tuple[int, int, int, int],
+    vizinhos: List[List[int]] | None,
+    posicoes: List[Tuple[float, float]],
+    matriz_distancias: List[List[float]],
+    base: Dict[str, Any]) -> None:
+    _cenario_processo.update(
+        tabelas=tabelas, limites=limites, vizinhos=vizinhos, posicoes=posicoes, matriz_distancias=matriz_distancias, base=base)
+
+
+
+def _executar_combinacao(combinacao: Tuple[float, int, float, int]) -> Dict[str, Any]:
+    """
+    Executa o algoritmo genético de uma combinação (peso_tempo, tam_populacao, prob_mutacao, semente) no processo do pool.
+    Retorna a melhor solução com o fitness, o tempo e o custo totais, o comprimento da rota e o tempo de execução.
+    """
+    peso_tempo, tam_populacao, prob_mutacao, semente = combinacao
+    base = _cenario_processo["base"]
+    tabelas = _cenario_processo["tabelas"]
+    random.seed(semente)
+    inicio = time.perf_counter()
+    avaliador = AvaliadorGA(tabelas, _cenario_processo["limites"], CacheFitness(tabelas.simetrica), vizinhos=_cenario_processo["vizinhos"])
+    config = ConfiguracaoGA(
+        tam_populacao=tam_populacao,
+        criterio_parada=base["criterio_parada"],
+        max_geracoes=base["max_geracoes"],
+        max_geracoes_sem_melhoria=base["max_geracoes_sem_melhoria"],
+        peso_tempo=peso_tempo,
+        busca_local=base["busca_local"],
+        busca_local_individuos=base["busca_local_individuos"],
+        busca_local_orcamento=base["busca_local_orcamento"],
+        prob_mutacao=prob_mutacao)
+    composicao = composicao_populacao(base["populacao_inicial"], base["proporcao_aleatoria"])
+    populacao = [criar_individuo(rota) for rota in gerar_populacao_inicial(_cenario_processo["posicoes"], tam_populacao, composicao)]
+    estado = executar_ga(avaliador, config, populacao)
+    otimizar_melhor_solucao(estado, avaliador, config, base["otimizar_final"], _cenario_processo["posicoes"])
+    melhor_trajeto, melhor_fitness, _ = min(estado.melhores_solucoes, key=lambda solucao: solucao[1])
+    tempo_total, custo_total = calcular_objetivos(tabelas, [melhor_trajeto])[0].tolist()
+    distancias = _cenario_processo["matriz_distancias"]
+    return {
+        "peso_tempo": peso_tempo,
+        "populacao": tam_populacao,
+        "prob_mutacao": prob_mutacao,
+        "semente": semente,
+        "melhor_fitness": melhor_fitness,
+        "tempo_total": tempo_total,
+        "custo_total": custo_total,
+        "comprimento_trajeto": sum(distancias[a][b] for a, b in zip(melhor_trajeto, melhor_trajeto[1:] + melhor_trajeto[:1])),
+        "melhor_trajeto": list(melhor_trajeto),
+        "total_geracoes": estado.geracao,
+        "criterio_parada": estado.criterio_atingido,
+        "tempo_execucao_segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+
+def executar_varredura(configuracao: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gera o cenário e as tabelas por aresta uma única vez e distribui as execuções da grade em um pool de processos.
+    Retorna as execuções (na ordem da grade), o resumo por combinação e as cidades do cenário.
+    """
+    base = configuracao["base"]
+    if base["semente"] is not None:
+        random.seed(base["semente"])
+    inicio = time.perf_counter()
+    cenario = gerar_cenario_lote(base)
+    num_vizinhos = BUSCA_LOCAL_VIZINHOS if base["busca_local"] else 0
+    avaliador = criar_avaliador(cenario, num_vizinhos=num_vizinhos, somente_distancia=base["somente_distancia"])
+    posicoes = list(cenario.cidades.values())
+    tempo_cenario = time.perf_counter() - inicio
+
+    combinacoes = combinacoes_varredura(configuracao)
+    processos = configuracao["processos"] or min(len(combinacoes), os.cpu_count() or 1)
+    execucoes: List[Dict[str, Any]] = []
+    initargs = (avaliador.tabelas, avaliador.limites, avaliador.vizinhos, posicoes, cenario.matriz_distancias, base)
+    with multiprocessing.Pool(processos, initializer=_inicializar_processo, initargs=initargs) as pool:
+        for execucao in pool.imap_unordered(_executar_combinacao, combinacoes):
+            execucoes.append(execucao)
+            print(f"[{len(execucoes)}/{len(combinacoes)}] peso {execucao['peso_tempo']:g}, população {execucao['populacao']}, "
+                  f"mutação {execucao['prob_mutacao']:g}, semente {execucao['semente']}: fitness {execucao['melhor_fitness']:.3f} "
+                  f"({execucao['tempo_execucao_segundos']:.1f}s)", flush=True)
+    ordem = {combinacao: i for i, combinacao in enumerate(combinacoes)}
+    execucoes.sort(key=lambda e: ordem[(e["peso_tempo"], e["populacao"], e["prob_mutacao"], e["semente"])])
+    return {
+        "configuracao": configuracao,
+        "processos": processos,
+        "tempo_cenario_segundos": round(tempo_cenario, 3),
+        "tempo_total_segundos": round(time.perf_counter() - inicio, 3),
+        "execucoes": execucoes,
+        "resumo": resumir_varredura(execucoes),
+        "cidades": {nome: {"x": pos[0], "y": pos[1]} for nome, pos in cenario.cidades.items()},
+    }
+
+
+
+def resumir_varredura(execucoes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Resumo por combinação (peso_tempo, populacao, prob_mutacao) sobre as sementes: melhor execução
+    (fitness, tempo e custo totais, comprimento), fitness médio e tempo médio de execução.
+    """
+    grupos: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for execucao in execucoes:
+        grupos.setdefault((execucao["peso_tempo"], execucao["populacao"], execucao["prob_mutacao"]), []).append(execucao)
+    resumo = []
+    for (peso_tempo, tam_populacao, prob_mutacao), grupo in grupos.items():
+        melhor = min(grupo, key=lambda e: e["melhor_fitness"])
+        resumo.append({
+            "peso_tempo": peso_tempo,
+            "populacao": tam_populacao,
+            "prob_mutacao": prob_mutacao,
+            "execucoes": len(grupo),
+            "melhor_fitness": melhor["melhor_fitness"],
+            "fitness_medio": statistics.mean(e["melhor_fitness"] for e in grupo),
+            "tempo_total": melhor["tempo_total"],
+            "custo_total": melhor["custo_total"],
+            "comprimento_trajeto": melhor["comprimento_trajeto"],
+            "geracoes_media": statistics.mean(e["total_geracoes"] for e in grupo),
+            "tempo_execucao_medio": statistics.mean(e["tempo_execucao_segundos"] for e in grupo),
+        })
+    return resumo
+
+
+
+def tabela_markdown(resumo: List[Dict[str, Any]]) -> str:
+    """
+    Tabela de resumo da varredura em Markdown (tempo, custo e comprimento da melhor execução de cada combinação).
+    """
+    linhas = [
+        "| Peso do tempo | População | Prob. mutação | Execuções | Melhor fitness | Fitness médio | Tempo total | Custo total "
+        "| Comprimento | Gerações (média) | Tempo de execução (s) |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in resumo:
+        linhas.append(
+            f"| {r['peso_tempo']:g} | {r['populacao']} | {r['prob_mutacao']:g} | {r['execucoes']} | {r['melhor_fitness']:.3f} "
+            f"| {r['fitness_medio']:.3f} | {r['tempo_total']} | {r['custo_total']} | {r['comprimento_trajeto']:.0f} "
+            f"| {r['geracoes_media']:.0f} | {r['tempo_execucao_medio']:.2f} |")
+    return "\n".join(linhas)
+
+
+
+def ler_argumentos() -> argparse.Namespace:
+    """
+    Lê os argumentos de linha de comando da varredura.
+    """
+    parser = argparse.ArgumentParser(description="Varredura de pesos do tempo (e tamanhos de população / probabilidades de mutação) em um mesmo cenário")
+    parser.add_argument("--config", help="arquivo JSON com as chaves de CONFIGURACAO_PADRAO_VARREDURA")
+    parser.add_argument("--pesos", type=float, nargs="+", help="pesos do tempo no fitness (0 a 1)")
+    parser.add_argument("--populacoes", type=int, nargs="+", help="tamanhos de população (padrão: o da base)")
+    parser.add_argument("--probs-mutacao", type=float, nargs="+", help="probabilidades de mutação (padrão: a da base)")
+    parser.add_argument("--sementes", type=int, nargs="+", help="sementes das execuções de cada combinação")
+    parser.add_argument("--processos", type=int, help="tamanho do pool de processos (padrão: um por núcleo)")
+    parser.add_argument("--saida", default="resultado_varredura.json", help="arquivo JSON com as execuções e o resumo")
+    return parser.parse_args()
+
+
+
+if __name__ == "__main__":
+    argumentos = ler_argumentos()
+    try:
+        configuracao_varredura = carregar_configuracao_varredura(argumentos.config, {
+            "pesos_tempo": argumentos.pesos,
+            "populacoes": argumentos.populacoes,
+            "probs_mutacao": argumentos.probs_mutacao,
+            "sementes": argumentos.sementes,
+            "processos": argumentos.processos,
+        })
+    except (OSError, ValueError) as e:
+        print(f"Configuração inválida: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    resultado_varredura = executar_varredura(configuracao_varredura)
+    print(tabela_markdown(resultado_varredura["resumo"]))
+    with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado_varredura, arquivo, ensure_ascii=False, indent=2)
+    print(f"\n{len(resultado_varredura['execucoes'])} execuções em {resultado_varredura['tempo_total_segundos']:.1f}s "
+          f"({resultado_varredura['processos']} processos); resultados gravados em {argumentos.saida}")